@@ -0,0 +1,43 @@
+__author__ = 'Paul Dapolito'
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import timeit
+
+from benchmarks.parallel_benchmark import generate_problem_set
+from source.build.batch_builder import BatchBuilder
+from source.interpreters.interpreter import EasyTeXInterpreter, html_format
+
+# Usage: python -m benchmarks.batch_benchmark
+
+repetitions = 3
+file_count = 64
+problems_per_file = 200
+job_counts = [1, 2, 4, 8]
+
+
+def main():
+    # Build HTML, so that the benchmark measures the batch pipeline rather than pdflatex, and leave
+    # out the fragment cache, since every file is the same
+    EasyTeXInterpreter.set_fragment_cache(None)
+    directory = tempfile.mkdtemp()
+    try:
+        input_string = generate_problem_set(problems_per_file)
+        for index in range(file_count):
+            with open(os.path.join(directory, "problem_set_{}.txt".format(index)), "w") as input_file:
+                input_file.write(input_string)
+        input_file_names = BatchBuilder.expand_inputs([directory])
+
+        print "{} CPUs, {} files of {} problems".format(multiprocessing.cpu_count(), file_count, problems_per_file)
+        print "{:<8}{:>14}{:>16}".format("jobs", "time", "files/second")
+        for jobs in job_counts:
+            batch_builder = BatchBuilder(jobs, output_format=html_format)
+            time = min(timeit.repeat(lambda: batch_builder.build(input_file_names), number=1, repeat=repetitions))
+            print "{:<8}{:>11.1f} ms{:>16.1f}".format(jobs, 1000 * time, file_count / time)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
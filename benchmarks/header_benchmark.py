@@ -0,0 +1,79 @@
+__author__ = 'Paul Dapolito'
+
+import timeit
+
+from pyparsing import Literal, Optional, ParseException, White, Suppress, restOfLine
+
+from source.parser.grammar import headers
+from source.parser.terminals import tab, space
+from source.parser.header_table import HeaderTable
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+# Usage: python -m benchmarks.header_benchmark
+
+repetitions = 200
+
+
+# The header grammar as it was before HeaderTable: one Optional per field, combined with Each (&)
+def legacy_header_field(keyword, required=False):
+    field_expr = Suppress(White(tab) + Literal(keyword + ":") + White(space)) + restOfLine
+    if required:
+        return field_expr.setResultsName(keyword)
+    return Optional(field_expr.setResultsName(keyword), default=list())
+
+legacy_problem_set_headers = legacy_header_field("author", True) & legacy_header_field("collaborators") & \
+    legacy_header_field("due_date") & legacy_header_field("title") & legacy_header_field("course") & \
+    legacy_header_field("school") & legacy_header_field("packages")
+legacy_document = Literal("problem_set") + Suppress(Literal(":")) + legacy_problem_set_headers
+
+current_document = Literal("problem_set") + Suppress(Literal(":")) + headers
+
+
+def build_header_block(fields):
+    return "problem_set:\n" + "".join(tab + key + ": " + value + "\n" for key, value in fields) + \
+           "\n" + tab + "problem:\n"
+
+
+def parse_with_each(input_string):
+    try:
+        legacy_document.parseString(input_string)
+    except ParseException:
+        pass
+
+
+def parse_with_header_table(input_string):
+    try:
+        HeaderTable("problem_set", current_document.parseString(input_string)["headers"])
+    except (ParseException, ParseDocumentError):
+        pass
+
+
+def main():
+    ordered_fields = [
+        ("author", "Paul Dapolito"),
+        ("collaborators", "Robert, Angela, Daniel"),
+        ("due_date", "September 21, 2015"),
+        ("title", "Basic title"),
+        ("course", "Programming Languages"),
+        ("school", "Staten Island Academy"),
+        ("packages", "amsmath, amssymb, graphicx")
+    ]
+
+    cases = [
+        ("ordered headers", build_header_block(ordered_fields)),
+        ("reversed headers", build_header_block(list(reversed(ordered_fields)))),
+        ("long header values", build_header_block([(key, value * 200) for key, value in ordered_fields])),
+        ("unknown header last", build_header_block(ordered_fields + [("date", "Today")])),
+        ("duplicate header last", build_header_block(ordered_fields + [("title", "Again")])),
+        ("missing author", build_header_block(ordered_fields[1:]))
+    ]
+
+    print "{:<24}{:>16}{:>16}{:>10}".format("case", "Each (ms)", "table (ms)", "speedup")
+    for name, input_string in cases:
+        each_time = timeit.timeit(lambda: parse_with_each(input_string), number=repetitions)
+        table_time = timeit.timeit(lambda: parse_with_header_table(input_string), number=repetitions)
+        print "{:<24}{:>16.3f}{:>16.3f}{:>9.1f}x".format(
+            name, 1000 * each_time / repetitions, 1000 * table_time / repetitions, each_time / table_time)
+
+if __name__ == "__main__":
+    main()
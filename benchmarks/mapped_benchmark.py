@@ -0,0 +1,51 @@
+__author__ = 'Paul Dapolito'
+
+import os
+import subprocess
+import sys
+import tempfile
+
+# Usage: python -m benchmarks.mapped_benchmark
+
+# One generated solution line, repeated to make each problem's solution about solution_size bytes
+solution_line = 12 * " " + "We have $f(x) = x^2 + 1 \\geq 1$ for every $x \\in \\mathbb{R}$, so $f$ has no roots.\n"
+solution_size = 16 * 1024 * 1024
+problem_count = 4
+
+# Each command parses the generated document, then prints the peak resident memory in kilobytes
+commands = [
+    ("whole string, scanner engine",
+     "from source.parser.parser import EasyTeXParser, scanner_engine; "
+     "EasyTeXParser(engine=scanner_engine).parse_document(open(sys.argv[1]).read())"),
+    ("memory-mapped file",
+     "from source.parser.parser import EasyTeXParser, scanner_engine; "
+     "EasyTeXParser(engine=scanner_engine).parse_mapped_document(open(sys.argv[1]))")
+]
+measurement = "import resource, sys; {}; print resource.getrusage(resource.RUSAGE_SELF).ru_maxrss"
+
+
+def write_document(output_file):
+    output_file.write("problem_set:\n    author: Paul Dapolito\n\n")
+    for problem in range(problem_count):
+        output_file.write("    problem:\n        statement:\n            Show that $f$ has no roots.\n")
+        output_file.write("        solution:\n")
+        output_file.write(solution_line * (solution_size // len(solution_line)))
+        output_file.write("\n")
+
+
+def main():
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as output_file:
+        write_document(output_file)
+
+    try:
+        print "{:<32}{:>20}".format("parsing a {} MB document".format(os.path.getsize(output_file.name) >> 20),
+                                    "peak memory (MB)")
+        for name, command in commands:
+            peak_memory = subprocess.check_output([sys.executable, "-c", measurement.format(command),
+                                                   output_file.name])
+            print "{:<32}{:>20.1f}".format(name, int(peak_memory) / 1024.0)
+    finally:
+        os.remove(output_file.name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+__author__ = 'Paul Dapolito'
+
+import multiprocessing
+import timeit
+
+from source.parser import parser
+from source.parser.parser import EasyTeXParser, scanner_engine
+
+# Usage: python -m benchmarks.parallel_benchmark
+
+repetitions = 3
+problem_counts = [1000, 5000, 10000, 50000]
+worker_counts = [1, 2, 4, 8]
+
+problem = "    problem:\n        label: {0}\n        statement:\n            Find $\\int_0^{{{0}}} x^2 \\, dx$.\n" \
+          "        solution:\n            We have $\\int_0^{{{0}}} x^2 \\, dx = \\frac{{{0}^3}}{{3}}$.\n" \
+          "            This follows from the power rule. QED.\n\n"
+
+
+def generate_problem_set(problem_count):
+    return "problem_set:\n    author: Paul Dapolito\n\n" + "".join(problem.format(index)
+                                                                     for index in range(problem_count))
+
+
+def main():
+    # Time every document in parallel, however small, to show where parallel parsing pays off
+    parser.parallel_block_threshold = 0
+    easytex_parser = EasyTeXParser(engine=scanner_engine)
+
+    print "{} CPUs".format(multiprocessing.cpu_count())
+    print "{:<12}".format("problems") + "".join("{:>16}".format("{} worker(s)".format(workers))
+                                                for workers in worker_counts) + "{:>12}".format("speedup")
+    for problem_count in problem_counts:
+        input_string = generate_problem_set(problem_count)
+
+        times = list()
+        for workers in worker_counts:
+            times.append(min(timeit.repeat(lambda: easytex_parser.parse_parallel_document(input_string, workers),
+                                           number=1, repeat=repetitions)))
+
+        print "{:<12}".format(problem_count) + "".join("{:>13.1f} ms".format(1000 * time) for time in times) + \
+              "{:>11.1f}x".format(times[0] / min(times))
+
+if __name__ == "__main__":
+    main()
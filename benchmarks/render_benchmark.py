@@ -0,0 +1,45 @@
+__author__ = 'Paul Dapolito'
+
+import multiprocessing
+import os
+import timeit
+
+from benchmarks.parallel_benchmark import generate_problem_set
+from source.parser.parser import EasyTeXParser, scanner_engine
+from source.interpreters import problem_set_interpreter
+from source.interpreters.interpreter import EasyTeXInterpreter
+
+# Usage: python -m benchmarks.render_benchmark
+
+repetitions = 3
+problem_counts = [500, 2000, 10000, 50000]
+process_counts = [1, 2, 4, 8]
+
+
+def render(problem_set, processes):
+    with open(os.devnull, "w") as output_file:
+        EasyTeXInterpreter.interpret_document_to(problem_set, output_file, processes)
+
+
+def main():
+    # Render every problem set in parallel, however small, and leave out the fragment cache, so
+    # that every run renders every problem
+    problem_set_interpreter.parallel_problem_threshold = 0
+    EasyTeXInterpreter.set_fragment_cache(None)
+    parser = EasyTeXParser(engine=scanner_engine)
+
+    print "{} CPUs".format(multiprocessing.cpu_count())
+    print "{:<12}".format("problems") + "".join("{:>16}".format("{} process(es)".format(processes))
+                                                for processes in process_counts) + "{:>12}".format("speedup")
+    for problem_count in problem_counts:
+        problem_set = parser.parse_document(generate_problem_set(problem_count))
+
+        times = list()
+        for processes in process_counts:
+            times.append(min(timeit.repeat(lambda: render(problem_set, processes), number=1, repeat=repetitions)))
+
+        print "{:<12}".format(problem_count) + "".join("{:>13.1f} ms".format(1000 * time) for time in times) + \
+              "{:>11.1f}x".format(times[0] / min(times))
+
+if __name__ == "__main__":
+    main()
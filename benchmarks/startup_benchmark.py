@@ -0,0 +1,42 @@
+__author__ = 'Paul Dapolito'
+
+import subprocess
+import sys
+import timeit
+
+# Usage: python -m benchmarks.startup_benchmark
+
+repetitions = 15
+
+# Target for a cold `python easytex.py` from launch to the start of parsing, in milliseconds
+target_startup_time = 40
+
+# Each command does what easytex.py does before it starts parsing, in a fresh interpreter
+commands = [
+    ("interpreter only", "pass"),
+    ("easytex.py, scanner engine",
+     "import easytex; from source.parser.parser import EasyTeXParser, scanner_engine; "
+     "EasyTeXParser(engine=scanner_engine)"),
+    ("easytex.py, pyparsing engine",
+     "import easytex; from source.parser.parser import EasyTeXParser; "
+     "EasyTeXParser().load_grammar()")
+]
+
+
+def time_command(command):
+    # Best of several runs, to leave out noise from the rest of the machine
+    return 1000 * min(timeit.repeat(lambda: subprocess.check_call([sys.executable, "-c", command]),
+                                    number=1, repeat=repetitions))
+
+
+def main():
+    print "{:<32}{:>12}".format("launch to start of parsing", "time (ms)")
+    for name, command in commands:
+        print "{:<32}{:>12.1f}".format(name, time_command(command))
+
+    cli_time = time_command(commands[1][1])
+    status = "met" if cli_time <= target_startup_time else "MISSED"
+    print "Target for easytex.py: {} ms ({}: {:.1f} ms)".format(target_startup_time, status, cli_time)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+__author__ = 'Paul Dapolito'
+
+import timeit
+
+from source.parser.grammar import text, ParseException
+from source.parser.parser import EasyTeXParser
+from source.errors.parser.parse_text_error import ParseTextError
+
+# Usage: python -m benchmarks.text_benchmark
+
+repetitions = 5
+
+# One line of a typical solution, repeated up to each block size
+solution_line = "Since $f(x) = x^2 + 1$, we have $f'(x) = 2x \\geq 0$ for all $x \\in [0, \\infty)$. QED.\n"
+block_sizes = [("64 KB", 64 * 1024), ("1 MB", 1024 * 1024), ("8 MB", 8 * 1024 * 1024)]
+
+
+def parse_with_pyparsing(input_string):
+    try:
+        text.parseString(input_string)
+    except ParseException:
+        pass
+
+
+def parse_with_validator(input_string):
+    try:
+        EasyTeXParser.parse_text(input_string)
+    except ParseTextError:
+        pass
+
+
+def main():
+    print "{:<24}{:>16}{:>16}{:>10}".format("solution block", "pyparsing (ms)", "table (ms)", "speedup")
+    for name, size in block_sizes:
+        valid_block = (solution_line * (size // len(solution_line) + 1))[:size]
+        invalid_block = valid_block[:-1] + "%"
+
+        for case, input_string in [(name + ", valid", valid_block), (name + ", invalid at end", invalid_block)]:
+            pyparsing_time = min(timeit.repeat(lambda: parse_with_pyparsing(input_string), number=1,
+                                               repeat=repetitions))
+            table_time = min(timeit.repeat(lambda: parse_with_validator(input_string), number=1,
+                                           repeat=repetitions))
+            print "{:<24}{:>16.3f}{:>16.3f}{:>9.1f}x".format(
+                case, 1000 * pyparsing_time, 1000 * table_time, pyparsing_time / table_time)
+
+if __name__ == "__main__":
+    main()
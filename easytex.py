@@ -1,80 +1,162 @@
 __author__ = 'Paul Dapolito'
 
+import argparse
 import sys
-import os
-import subprocess
-import shlex
-import shutil
-import time
-from multiprocessing import Process
-from commands import getstatusoutput
 
-from source.parser.parser import EasyTeXParser
-from source.interpreters.interpreter import EasyTeXInterpreter
-
-
-# PD 1/11/2015 - TODO: Do not let this poll forever
-def open_pdf(file_name):
-    print "Opening PDF"
-    while not os.path.exists(file_name):
-        time.sleep(1)
-
-    os.system("open '{}'".format(file_name))
-    return
-
-
-# Usage: python easytex.py input_file_name
+from source.interpreters.interpreter import latex_format, output_formats
+from source.build.builder import EasyTeXBuilder
+from source.build.pdf_compiler import default_timeout, default_cpu_timeout, default_memory_limit
+from source.build.format_cache import FormatCache
+from source.build.multi_pass_compiler import default_max_passes
+from source.interpreters.fragment_cache import FragmentCache
+
+
+# Parses problem or section numbers like "3,7"
+def problem_numbers(argument):
+    try:
+        numbers = [int(number) for number in argument.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected comma-separated numbers, such as 3,7")
+    return numbers
+
+
+def parse_arguments():
+    argument_parser = argparse.ArgumentParser(description="Typeset an EasyTeX problem set or memorandum.")
+    argument_parser.add_argument("input_file_name", nargs="+",
+                                 help="EasyTeX input file; with --batch, any number of files, directories, or "
+                                      "glob patterns")
+    argument_parser.add_argument("--format", choices=output_formats, default=latex_format,
+                                 help="write LaTeX and a PDF (default), or a standalone HTML preview "
+                                      "without running pdflatex")
+    argument_parser.add_argument("--split", action="store_true",
+                                 help="write one LaTeX file per problem or section, rewriting only the ones "
+                                      "that changed")
+    argument_parser.add_argument("--only", type=problem_numbers, metavar="NUMBERS",
+                                 help="compile only these comma-separated problem or section numbers, "
+                                      "such as 3,7 (implies --split)")
+    argument_parser.add_argument("--timeout", type=float, default=default_timeout, metavar="SECONDS",
+                                 help="stop pdflatex if it runs for longer than this (default: %(default)s)")
+    argument_parser.add_argument("--cpu-timeout", type=float, default=default_cpu_timeout, metavar="SECONDS",
+                                 help="stop pdflatex if it uses more CPU time than this, or 0 for no limit "
+                                      "(default: %(default)s)")
+    argument_parser.add_argument("--memory-limit", type=int, default=default_memory_limit//(1024*1024),
+                                 metavar="MB", help="limit pdflatex's address space to this many megabytes, or 0 "
+                                                    "for no limit (default: %(default)s)")
+    argument_parser.add_argument("--watch", action="store_true",
+                                 help="keep running, and build again whenever the input file changes")
+    argument_parser.add_argument("--batch", action="store_true",
+                                 help="build many input files at once, then summarize the results")
+    argument_parser.add_argument("--jobs", type=int, metavar="N",
+                                 help="with --batch, build this many files at once (default: one per CPU)")
+    argument_parser.add_argument("--compile-jobs", type=int, metavar="N",
+                                 help="with --batch, run at most this many pdflatex processes at once "
+                                      "(default: --jobs)")
+    argument_parser.add_argument("--max-passes", type=int, default=default_max_passes, metavar="N",
+                                 help="run pdflatex at most N times to settle cross-references (default: %(default)s)")
+    argument_parser.add_argument("--no-latex-check", dest="check_latex", action="store_false",
+                                 help="run pdflatex without first checking the LaTeX for unbalanced braces, math, "
+                                      "and environments")
+    argument_parser.add_argument("--no-format-cache", dest="format_cache", action="store_false",
+                                 help="load the class and packages on every pdflatex run, instead of starting "
+                                      "from a cached precompiled format")
+    arguments = argument_parser.parse_args()
+
+    if arguments.only is not None:
+        arguments.split = True
+    if arguments.split and arguments.format != latex_format:
+        argument_parser.error("--split and --only only apply to LaTeX output")
+    if arguments.batch and arguments.watch:
+        argument_parser.error("--batch and --watch cannot be used together")
+
+    return arguments
+
+
+def watch(builder, input_file_name):
+    # Imported here, since only watch mode needs inotify and its ctypes bindings
+    from source.build.file_watcher import FileWatcher
+
+    watcher = FileWatcher(input_file_name)
+    print "Watching {} for changes{}. Press Ctrl-C to stop.".format(
+        input_file_name, "" if watcher.uses_inotify() else " (polling)")
+
+    try:
+        succeeded = builder.build(input_file_name)
+        while True:
+            # The viewer is opened once; most viewers reload the PDF by themselves after that
+            if succeeded:
+                builder.open_viewer = False
+
+            # Changes made while a build runs are waiting here, and start a single rebuild
+            watcher.wait_for_changes()
+            print
+            succeeded = builder.build(input_file_name)
+    except KeyboardInterrupt:
+        print "Stopped watching."
+    finally:
+        watcher.close()
+
+
+# Returns the resource limits for pdflatex, as EasyTeXBuilder's arguments
+def resource_limits(arguments):
+    return dict(timeout=arguments.timeout, cpu_timeout=arguments.cpu_timeout or None,
+                memory_limit=arguments.memory_limit*1024*1024 or None)
+
+
+# Returns the cache of precompiled formats to build with, or None
+def format_cache(arguments):
+    if arguments.format != latex_format or not arguments.format_cache:
+        return None
+    return FormatCache()
+
+
+def report_batch_result(result):
+    input_file_name, succeeded, status, errors, timings, elapsed = result
+    print "{}: {} ({:.0f} ms)".format(input_file_name, status, 1000*elapsed)
+
+
+def batch(arguments):
+    # Imported here, since only batch builds need multiprocessing
+    from source.build.batch_builder import BatchBuilder
+
+    input_file_names = BatchBuilder.expand_inputs(arguments.input_file_name)
+    if not input_file_names:
+        print "No input files found."
+        sys.exit(1)
+
+    batch_builder = BatchBuilder(arguments.jobs, arguments.compile_jobs, output_format=arguments.format,
+                                 split=arguments.split, only=arguments.only, format_cache=format_cache(arguments),
+                                 max_passes=arguments.max_passes, check_latex=arguments.check_latex,
+                                 **resource_limits(arguments))
+    print "Building {} file(s), {} at a time.".format(len(input_file_names), batch_builder.jobs)
+    results = batch_builder.build(input_file_names, report_batch_result)
+
+    print
+    print BatchBuilder.summary(results)
+    if not all(result[1] for result in results):
+        sys.exit(1)
+
+
+# Usage: python easytex.py [--format {latex,html}] [--split] [--only NUMBERS] [--timeout SECONDS]
+#                          [--cpu-timeout SECONDS] [--memory-limit MB] [--watch] [--batch] [--jobs N]
+#                          [--compile-jobs N] [--max-passes N] [--no-latex-check] [--no-format-cache]
+#                          input_file_name
 def main():
+    arguments = parse_arguments()
+    if arguments.batch:
+        batch(arguments)
+        return
+
     # Rejoin command-line arguments
-    input_file_name = " ".join(sys.argv[1:])
-
-    # Open and read input file
-    input_file = open(input_file_name, 'r')
-    input_text = input_file.read()
-
-    # Parse input text
-    print "Parsing input file."
-    parsed_document = EasyTeXParser().parse_document(input_text)
-
-    # Interpret parsed document
-    print "Interpreting input file."
-    output_latex_text = EasyTeXInterpreter.interpret_document(parsed_document)
-
-    # Strip extension from input file name
-    stripped_file_name = os.path.splitext(input_file_name)[0]
-
-    # Write TeX file
-    print "Writing LaTeX (.tex) file."
-    output_file_name = stripped_file_name + ".tex"
-    output_tex_file = open(output_file_name, "w+")
-    output_tex_file.write(output_latex_text)
-
-    # Check for pdflatex, output and open PDF file if it exists
-    print "Attempting to generate PDF."
-    sys.path.append("/usr/texbin")
-    status, result = getstatusoutput("pdflatex -v")
-    if status == 0:
-        # Point to the correct output directory
-        output_directory = os.path.dirname(os.path.realpath(input_file_name))
-
-        # Add hmcpset class file to output directory
-        hmcpset_path = "source/include/hmcpset.cls"
-        shutil.copy(hmcpset_path, output_directory)
-
-        # Execute bash command, hiding output using DEVNULL
-        print "Executing pdflatex."
-        bash_command = "pdflatex -output-directory='{}' '{}'".format(output_directory, output_file_name)
-        split_bash_command = shlex.split(bash_command)
-        DEVNULL = open(os.devnull, 'wb')
-        subprocess.Popen(split_bash_command, stdout=DEVNULL)
-
-        # Open PDF File
-        pdf_file_name = stripped_file_name + ".pdf"
-        open_pdf_thread = Process(target=open_pdf, args=(pdf_file_name,))
-        open_pdf_thread.start()
-
-    else:
-        print "Could not generate PDF! Please check that the pdflatex command-line tool is installed."
+    input_file_name = " ".join(arguments.input_file_name)
+
+    builder = EasyTeXBuilder(arguments.format, arguments.split, arguments.only, incremental=arguments.watch,
+                             format_cache=format_cache(arguments), max_passes=arguments.max_passes,
+                             check_latex=arguments.check_latex,
+                             fragment_cache=FragmentCache() if arguments.watch else None, **resource_limits(arguments))
+    if arguments.watch:
+        watch(builder, input_file_name)
+    elif not builder.build(input_file_name):
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,8 +2,8 @@
 
 echo "Running EasyTeX!"
 
-# Usage: ./easytex easytex_file_name
+# Usage: ./easytex [--format {latex,html}] [--split] [--only NUMBERS] [--watch] [--batch] easytex_file_name
 source /usr/local/EasyTeX/venv/bin/activate
-python easytex.py $1
+python easytex.py "$@"
 
 echo "EasyTeX completed computation!"
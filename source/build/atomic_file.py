@@ -0,0 +1,93 @@
+__author__ = 'Paul Dapolito'
+
+import hashlib
+import os
+import tempfile
+
+# Size of the blocks files are read and copied in
+block_size = 64*1024
+
+
+# Output file that is written to a temporary file in the same directory and renamed over file_name
+# when closed, so that readers (such as pdflatex, or a viewer) never see a partly written file. An
+# AtomicFile is a stream for the interpreters' write_* methods, and is used as a context manager:
+#
+#     with AtomicFile(file_name) as output_file:
+#         EasyTeXInterpreter.interpret_document_to(document, output_file)
+#
+# The file is left alone, keeping its modification time, when it already holds exactly what was
+# written, and the temporary file is removed if writing fails. changed records which happened.
+class AtomicFile(object):
+    def __init__(self, file_name, skip_unchanged=True):
+        self.file_name = file_name
+        self.skip_unchanged = skip_unchanged
+        self.changed = None
+        self.digest = hashlib.sha1()
+        self.temporary_file = None
+        self.temporary_path = None
+
+    def __enter__(self):
+        directory, name = os.path.split(self.file_name)
+        descriptor, self.temporary_path = tempfile.mkstemp(prefix="." + name + ".", suffix=".tmp",
+                                                           dir=directory or os.curdir)
+        self.temporary_file = os.fdopen(descriptor, "wb")
+        return self
+
+    def write(self, text):
+        self.digest.update(text)
+        self.temporary_file.write(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.temporary_file.close()
+        if exception_type is not None:
+            os.remove(self.temporary_path)
+            return False
+
+        if self.skip_unchanged and self.file_digest(self.file_name) == self.hexdigest():
+            os.remove(self.temporary_path)
+            self.changed = False
+            return False
+
+        # mkstemp only lets the owner read temporary files; give the output the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(self.temporary_path, 0666 & ~umask)
+
+        os.rename(self.temporary_path, self.file_name)
+        self.changed = True
+        return False
+
+    # Returns the SHA-1 of the file's contents, or None if it cannot be read
+    @staticmethod
+    def file_digest(file_name):
+        digest = hashlib.sha1()
+        try:
+            with open(file_name, "rb") as input_file:
+                for block in iter(lambda: input_file.read(block_size), ""):
+                    digest.update(block)
+        except IOError:
+            return None
+
+        return digest.hexdigest()
+
+    # Writes text to file_name atomically. Returns whether the file changed.
+    @classmethod
+    def write_text(cls, file_name, text):
+        with cls(file_name) as output_file:
+            output_file.write(text)
+        return output_file.changed
+
+    # Copies source_file_name to file_name atomically. Returns whether the copy changed.
+    @classmethod
+    def copy(cls, source_file_name, file_name):
+        with open(source_file_name, "rb") as input_file, cls(file_name) as output_file:
+            for block in iter(lambda: input_file.read(block_size), ""):
+                output_file.write(block)
+        return output_file.changed
@@ -0,0 +1,110 @@
+__author__ = 'Paul Dapolito'
+
+import glob
+import multiprocessing
+import os
+import time
+
+from source.build.builder import EasyTeXBuilder, failed_status
+from source.interpreters.fragment_cache import FragmentCache
+
+# Extension of EasyTeX input files, for inputs given as directories
+input_extension = ".txt"
+
+# Builder of each batch worker process, made by start_batch_worker
+worker_builder = None
+
+
+def start_batch_worker(builder_options, compile_slots):
+    global worker_builder
+    worker_builder = EasyTeXBuilder(compile_slots=compile_slots, open_viewer=False, verbose=False,
+                                    fragment_cache=FragmentCache(), **builder_options)
+
+
+# Builds one input in a batch worker process. Returns (input file name, succeeded, status, errors,
+# timings, seconds taken). Unexpected errors are returned as failures too, since exceptions raised
+# in a worker would have to be pickled back to the parent.
+def batch_build_task(input_file_name):
+    start_time = time.time()
+    try:
+        succeeded = worker_builder.build(input_file_name)
+    except Exception as error:
+        return input_file_name, False, failed_status, ["Unexpected error: {!r}".format(error)], dict(), \
+            time.time() - start_time
+
+    return input_file_name, succeeded, worker_builder.status, worker_builder.errors, worker_builder.timings, \
+        time.time() - start_time
+
+
+# Builds many inputs at once in a pool of worker processes. Each worker parses, interprets, and
+# compiles one input at a time with its own warm EasyTeXBuilder; at most compile_jobs pdflatex runs
+# happen at once across the pool, and each input is compiled in its own scratch directory, so inputs
+# in the same directory do not share .aux or .log files.
+class BatchBuilder(object):
+    def __init__(self, jobs=None, compile_jobs=None, **builder_options):
+        self.jobs = jobs or multiprocessing.cpu_count()
+        self.compile_jobs = compile_jobs or self.jobs
+        self.builder_options = builder_options
+
+    # Expands directories (to the inputs in them) and glob patterns, keeping the order they were
+    # given in and leaving out repeats
+    @staticmethod
+    def expand_inputs(input_patterns):
+        input_file_names = list()
+        for input_pattern in input_patterns:
+            if os.path.isdir(input_pattern):
+                matches = sorted(glob.glob(os.path.join(input_pattern, "*" + input_extension)))
+            elif glob.has_magic(input_pattern):
+                matches = sorted(glob.glob(input_pattern))
+            else:
+                matches = [input_pattern]
+
+            for match in matches:
+                if match not in input_file_names:
+                    input_file_names.append(match)
+
+        return input_file_names
+
+    # Builds every input, calling report (if given) with each result as it finishes. Returns the
+    # results, as returned by batch_build_task, in input order.
+    def build(self, input_file_names, report=None):
+        compile_slots = multiprocessing.Semaphore(self.compile_jobs)
+        pool = multiprocessing.Pool(min(self.jobs, len(input_file_names)) or 1, start_batch_worker,
+                                    (self.builder_options, compile_slots))
+        results = dict()
+        try:
+            for result in pool.imap_unordered(batch_build_task, input_file_names):
+                results[result[0]] = result
+                if report is not None:
+                    report(result)
+        finally:
+            pool.close()
+            pool.join()
+
+        return [results[input_file_name] for input_file_name in input_file_names]
+
+    # Returns a table of each input's status and timings, followed by the errors of failed builds
+    @staticmethod
+    def summary(results):
+        name_width = max([len("file")] + [len(result[0]) for result in results])
+        steps = ["parse", "check", "interpret", "format", "wait", "compile"]
+
+        lines = ["{:<{}}  {:<12}".format("file", name_width, "status") +
+                 "".join("{:>12}".format(step) for step in steps + ["passes", "total"])]
+        for input_file_name, succeeded, status, errors, timings, elapsed in results:
+            lines.append("{:<{}}  {:<12}".format(input_file_name, name_width, status) +
+                         "".join("{:>12}".format("{:.0f} ms".format(1000*timings[step]) if step in timings else "-")
+                                 for step in steps) +
+                         "{:>12}".format(len(timings["passes"]) if "passes" in timings else "-") +
+                         "{:>12}".format("{:.0f} ms".format(1000*elapsed)))
+
+        failures = [result for result in results if not result[1]]
+        for input_file_name, succeeded, status, errors, timings, elapsed in failures:
+            lines.append("")
+            lines.append(input_file_name + ":")
+            lines.extend("    " + error for error in errors)
+
+        succeeded_count = len(results) - len(failures)
+        lines.append("")
+        lines.append("{} of {} file(s) built successfully.".format(succeeded_count, len(results)))
+        return "\n".join(lines)
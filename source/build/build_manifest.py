@@ -0,0 +1,60 @@
+__author__ = 'Paul Dapolito'
+
+import hashlib
+import json
+import os
+
+from source.build.atomic_file import AtomicFile
+
+manifest_suffix = ".easytex-build.json"
+
+
+# Record of the inputs of the last pdflatex run for a document, kept next to its output: hashes of
+# the generated .tex file(s), the class file, and the packages list. A build whose inputs all match
+# the manifest, and whose PDF exists and is newer than its .tex, can skip pdflatex entirely; a PDF
+# older than the .tex was left by an earlier build, or by a pdflatex run that failed.
+class BuildManifest(object):
+    def __init__(self, manifest_file_name):
+        self.manifest_file_name = manifest_file_name
+        self.inputs = self.load()
+
+    @staticmethod
+    def manifest_file_name_for(stripped_file_name):
+        return stripped_file_name + manifest_suffix
+
+    # Returns the recorded inputs, or an empty dictionary if there is no readable manifest
+    def load(self):
+        try:
+            with open(self.manifest_file_name) as manifest_file:
+                inputs = json.load(manifest_file)
+        except (IOError, ValueError):
+            return dict()
+
+        return inputs if isinstance(inputs, dict) else dict()
+
+    @staticmethod
+    def build_inputs(tex_file_names, class_file_name, packages):
+        tex_digest = hashlib.sha1()
+        for tex_file_name in tex_file_names:
+            tex_digest.update("{}\0{}\0".format(os.path.basename(tex_file_name),
+                                                AtomicFile.file_digest(tex_file_name)))
+
+        return {
+            "tex": tex_digest.hexdigest(),
+            "class": AtomicFile.file_digest(class_file_name),
+            "packages": hashlib.sha1("\0".join(packages)).hexdigest()
+        }
+
+    def is_up_to_date(self, inputs, tex_file_name, pdf_file_name):
+        if inputs != self.inputs:
+            return False
+
+        try:
+            return os.path.getmtime(pdf_file_name) >= os.path.getmtime(tex_file_name)
+        except OSError:
+            return False
+
+    def record(self, inputs):
+        self.inputs = inputs
+        manifest_text = json.dumps(inputs, indent=4, separators=(",", ": "), sort_keys=True) + "\n"
+        AtomicFile.write_text(self.manifest_file_name, manifest_text)
@@ -0,0 +1,330 @@
+__author__ = 'Paul Dapolito'
+
+import errno
+import hashlib
+import os
+import re
+import subprocess
+import stat
+import sys
+import tempfile
+import time
+
+from source.parser.parser import EasyTeXParser, scanner_engine, ir_errors
+from source.parser.incremental import EasyTeXParseSession
+from source.parser.latex_validator import LaTeXValidator
+from source.interpreters.interpreter import EasyTeXInterpreter, latex_format, html_format, output_extensions
+from source.interpreters.split_interpreter import SplitInterpreter
+from source.build.atomic_file import AtomicFile
+from source.build.build_manifest import BuildManifest
+from source.build.pdf_compiler import PDFCompiler, default_timeout, default_cpu_timeout, default_memory_limit, \
+    default_pdflatex_path
+from source.build.multi_pass_compiler import MultiPassCompiler, default_max_passes
+from source.build.toolchain import ToolchainCache
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+from source.errors.interpreters.interpret_document_error import InterpretDocumentError
+from source.errors.build.compile_error import CompileError
+
+# Class file that problem sets and memorandums are typeset with
+hmcpset_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "include", "hmcpset.cls")
+
+# Characters allowed in build directory names
+unsafe_name_pattern = re.compile(r"[^A-Za-z0-9_-]")
+
+# Memory-backed directory that build directories go in, when there is one
+shared_memory_directory = "/dev/shm"
+
+# Build statuses
+built_status = "built"
+up_to_date_status = "up to date"
+no_pdflatex_status = "no pdflatex"
+failed_status = "failed"
+
+
+# Returns this user's directory for build directories, making it if needed: in /dev/shm where it
+# exists, so that pdflatex's auxiliary files never touch the disk, or else in the temporary directory.
+# The directory is private to the user, since /dev/shm and /tmp are shared.
+def default_build_directory():
+    parent_directory = shared_memory_directory
+    if not os.path.isdir(parent_directory) or not os.access(parent_directory, os.W_OK | os.X_OK):
+        parent_directory = tempfile.gettempdir()
+
+    build_directory = os.path.join(parent_directory, "easytex-{}".format(os.getuid()))
+    try:
+        os.mkdir(build_directory, 0700)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    status = os.lstat(build_directory)
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid():
+        raise OSError(errno.EPERM, "Build directory is not owned by this user", build_directory)
+    return build_directory
+
+
+# Opens a PDF in the desktop's viewer, without waiting for the viewer to exit
+def open_pdf(file_name):
+    print "Opening PDF"
+    viewer = "open" if sys.platform == "darwin" else "xdg-open"
+    try:
+        subprocess.Popen([viewer, file_name])
+    except OSError:
+        print "Could not open PDF! Please open {} yourself.".format(file_name)
+
+
+# Runs the whole pipeline for an input file: parse, interpret, write, and compile. A builder keeps
+# its parser between builds, so a long-running process (such as --watch) rebuilds warm; with
+# incremental, only the problems and sections that changed since the last build are parsed again.
+#
+# pdflatex runs in a scratch directory of each input's own, inside build_directory (by default,
+# default_build_directory()), where its .aux and .log files stay between builds; it finds
+# hmcpset.cls through TEXINPUTS, and only the finished PDF is published next to the input.
+# compile_slots, if set, is a semaphore (such as a multiprocessing.Semaphore shared by a pool of
+# builders) held while pdflatex runs. With a format_cache, pdflatex starts from a precompiled format
+# of the document's class and packages. pdflatex is run up to max_passes times, until cross-references
+# settle, each run limited to timeout seconds, cpu_timeout seconds of CPU time, and memory_limit bytes
+# of address space. pdflatex is found, and its version read, through toolchain_cache (by default, a
+# ToolchainCache in the user's cache directory). With check_latex, LaTeX output is first checked for
+# unbalanced braces, math, and environments, and not compiled if any are found. With a fragment_cache
+# (worth having only in a long-running process, such as --watch or a batch worker), rendered problems
+# and sections are kept between builds. After each build, status (for compile failures, the reason
+# pdflatex failed), timings (seconds per step, and a list of seconds per pdflatex pass under "passes"),
+# messages, and errors (the messages that explain a failure) describe it; messages are also printed
+# when verbose.
+class EasyTeXBuilder(object):
+    def __init__(self, output_format=latex_format, split=False, only=None, timeout=default_timeout,
+                 incremental=False, open_viewer=True, build_directory=None, compile_slots=None, verbose=True,
+                 format_cache=None, max_passes=default_max_passes, cpu_timeout=default_cpu_timeout,
+                 memory_limit=default_memory_limit, toolchain_cache=None, check_latex=True, fragment_cache=None):
+        self.output_format = output_format
+        self.split = split
+        self.only = only
+        self.timeout = timeout
+        self.open_viewer = open_viewer
+        self.build_directory = build_directory or default_build_directory()
+        self.compile_slots = compile_slots
+        self.verbose = verbose
+        self.format_cache = format_cache
+        self.max_passes = max_passes
+        self.cpu_timeout = cpu_timeout
+        self.memory_limit = memory_limit
+        self.toolchain_cache = toolchain_cache or ToolchainCache()
+        self.check_latex = check_latex
+        self.fragment_cache = fragment_cache
+
+        self.parser = EasyTeXParser(engine=scanner_engine)
+        self.session = EasyTeXParseSession(self.parser) if incremental else None
+
+        self.status = None
+        self.timings = dict()
+        self.messages = list()
+        self.errors = list()
+
+    def log(self, message):
+        self.messages.append(message)
+        if self.verbose:
+            print message
+
+    def log_error(self, message):
+        self.errors.append(message)
+        self.log(message)
+
+    # Returns the directory inside build_directory for input_file_name, named after the input and a
+    # hash of its full path, so that inputs with the same name in different directories do not clash
+    def job_directory(self, input_file_name):
+        real_path = os.path.realpath(input_file_name)
+        stem = unsafe_name_pattern.sub("_", os.path.splitext(os.path.basename(real_path))[0])
+        return os.path.join(self.build_directory, stem + "-" + hashlib.sha1(real_path).hexdigest()[:8])
+
+    # Returns the parsed document and a list of ParseDocumentErrors. Documents are parsed in one
+    # pass; only one that fails to parse is parsed again with recovery, to find every error rather
+    # than just the first.
+    def parse(self, input_text):
+        try:
+            if self.session is not None:
+                return self.session.parse_document(input_text), list()
+            return self.parser.parse_document(input_text), list()
+        except (ParseDocumentError,) + ir_errors as error:
+            document, errors = self.parser.parse_document_with_recovery(input_text)
+            return document, errors or [error]
+
+    # Builds input_file_name. Returns whether the build succeeded.
+    def build(self, input_file_name):
+        self.status = None
+        self.timings = dict()
+        self.messages = list()
+        self.errors = list()
+
+        succeeded, self.status = self.run_build(input_file_name)
+        return succeeded
+
+    # Runs one build, recording the time each step takes. Returns whether it succeeded, and its status.
+    def run_build(self, input_file_name):
+        # Open and read input file
+        try:
+            with open(input_file_name, 'r') as input_file:
+                input_text = input_file.read()
+        except IOError as error:
+            self.log_error("Could not read input file: {}".format(error.strerror))
+            return False, failed_status
+
+        # Parse input text
+        self.log("Parsing input file.")
+        start_time = time.time()
+        parsed_document, parse_errors = self.parse(input_text)
+        self.timings["parse"] = time.time() - start_time
+
+        # Report every malformed block at once
+        if parse_errors:
+            for parse_error in parse_errors:
+                self.log_error(parse_error.error_message)
+            self.log_error("Could not parse input file: found {} error(s).".format(len(parse_errors)))
+            return False, failed_status
+
+        # Strip extension from input file name
+        stripped_file_name = os.path.splitext(input_file_name)[0]
+
+        # Find structural LaTeX errors in a fraction of the time a failed pdflatex run takes
+        if self.check_latex and self.output_format == latex_format:
+            start_time = time.time()
+            latex_errors = LaTeXValidator.document_errors(parsed_document, input_text)
+            self.timings["check"] = time.time() - start_time
+            if latex_errors:
+                for latex_error in latex_errors:
+                    self.log_error(latex_error.error_message)
+                self.log_error("Could not typeset input file: found {} LaTeX error(s).".format(len(latex_errors)))
+                return False, failed_status
+
+        # HTML previews are complete once written; math is rendered by the browser
+        start_time = time.time()
+        EasyTeXInterpreter.set_fragment_cache(self.fragment_cache)
+        if self.output_format == html_format:
+            self.log("Interpreting input file and writing HTML (.html) preview.")
+            output_file_name = stripped_file_name + output_extensions[html_format]
+            with AtomicFile(output_file_name) as output_html_file:
+                EasyTeXInterpreter.interpret_document_to(parsed_document, output_html_file,
+                                                         output_format=html_format)
+            self.timings["interpret"] = time.time() - start_time
+            self.log("Wrote {}".format(output_file_name))
+            return True, built_status
+
+        output_file_name = stripped_file_name + output_extensions[latex_format]
+        if self.split:
+            # Write a master TeX file and one file per problem or section, leaving unchanged ones alone
+            self.log("Interpreting input file and writing split LaTeX (.tex) files.")
+            try:
+                written_files = EasyTeXInterpreter.interpret_split_document(parsed_document, output_file_name,
+                                                                            self.only, input_file_name)
+            except InterpretDocumentError as interpret_error:
+                self.log_error(interpret_error.error_message)
+                return False, failed_status
+            self.log("Wrote {} changed file(s).".format(len(written_files)))
+            tex_file_names = SplitInterpreter.split_file_names(output_file_name)
+        else:
+            # Interpret parsed document straight into the TeX file, which replaces the old one (if it
+            # changed at all) only once it is complete
+            self.log("Interpreting input file and writing LaTeX (.tex) file.")
+            with AtomicFile(output_file_name) as output_tex_file:
+                EasyTeXInterpreter.interpret_document_to(parsed_document, output_tex_file)
+            tex_file_names = [output_file_name]
+        self.timings["interpret"] = time.time() - start_time
+
+        # Skip pdflatex when the last build had the same inputs and its PDF is still there
+        pdf_file_name = stripped_file_name + ".pdf"
+        output_directory = self.job_directory(input_file_name)
+        manifest = BuildManifest(BuildManifest.manifest_file_name_for(
+            os.path.join(output_directory, os.path.basename(stripped_file_name))))
+        packages = [package.name for package in parsed_document.packages or []]
+        build_inputs = BuildManifest.build_inputs(tex_file_names, hmcpset_path, packages)
+        if manifest.is_up_to_date(build_inputs, output_file_name, pdf_file_name):
+            self.log("PDF is up to date.")
+            return True, up_to_date_status
+
+        # Check for pdflatex, output and open PDF file if it exists
+        self.log("Attempting to generate PDF.")
+        toolchain = self.toolchain_cache.probe()
+        if toolchain is None:
+            self.log("Could not generate PDF! Please check that the pdflatex command-line tool is installed.")
+            return True, no_pdflatex_status
+
+        # Reuse the input's scratch directory from earlier builds, if there is one
+        try:
+            os.makedirs(output_directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+        format_file_name = self.precompiled_format(parsed_document, toolchain)
+
+        # Run pdflatex from the input directory, which split files' \input paths are relative to, and
+        # wait for it to finish
+        self.log("Executing pdflatex.")
+        input_directory = os.path.dirname(os.path.realpath(input_file_name))
+        try:
+            pdf_file_name, settled = self.compile(os.path.realpath(output_file_name), output_directory,
+                                                  input_directory, format_file_name, toolchain.pdflatex_path)
+        except CompileError as compile_error:
+            self.log_error(compile_error.error_message)
+            self.log_error("Could not generate PDF!")
+            return False, compile_error.reason or failed_status
+
+        self.log("Ran pdflatex {} time(s).".format(len(self.timings["passes"])))
+        if not settled:
+            self.log("Cross-references may be out of date: they were still changing after {} pdflatex runs."
+                     .format(self.max_passes))
+
+        # Publish the PDF next to the input in one step, so viewers never see a partial file
+        published_file_name = stripped_file_name + ".pdf"
+        try:
+            os.rename(pdf_file_name, published_file_name)
+        except OSError:
+            # On another file system, such as /dev/shm, where the scratch copy would otherwise stay in memory
+            AtomicFile.copy(pdf_file_name, published_file_name)
+            os.remove(pdf_file_name)
+        pdf_file_name = published_file_name
+
+        # Only a successful build is recorded, so a failed one is retried next time
+        manifest.record(build_inputs)
+        if self.open_viewer:
+            open_pdf(pdf_file_name)
+        return True, built_status
+
+    # Returns the cached format for the document's preamble, dumping it if needed, or None if there is
+    # no format cache or the format cannot be dumped (the document is then compiled without one). The
+    # format is dumped by, and keyed by the version of, toolchain's pdflatex.
+    def precompiled_format(self, document, toolchain):
+        if self.format_cache is None:
+            return None
+
+        start_time = time.time()
+        try:
+            return self.format_cache.format_for(EasyTeXInterpreter.interpret_preamble(document), hmcpset_path,
+                                                toolchain.pdflatex_version, self.timeout, self.cpu_timeout,
+                                                self.memory_limit, self.compile_slots, toolchain.pdflatex_path)
+        except CompileError as compile_error:
+            self.log("Could not precompile the preamble, so compiling without it: " + compile_error.error_message)
+            return None
+        finally:
+            self.timings["format"] = time.time() - start_time
+
+    # Runs pdflatex until cross-references settle, holding one of the compile slots if there are any,
+    # and records the time taken. Returns the PDF's file name and whether cross-references settled.
+    def compile(self, tex_file_name, output_directory, working_directory, format_file_name=None,
+                pdflatex_path=default_pdflatex_path):
+        if self.compile_slots is not None:
+            start_time = time.time()
+            self.compile_slots.acquire()
+            self.timings["wait"] = time.time() - start_time
+
+        start_time = time.time()
+        try:
+            pdf_file_name, self.timings["passes"], settled = MultiPassCompiler.compile(
+                tex_file_name, output_directory, self.timeout, working_directory,
+                PDFCompiler.class_environment(hmcpset_path), format_file_name, self.max_passes, self.cpu_timeout,
+                self.memory_limit, pdflatex_path)
+            return pdf_file_name, settled
+        finally:
+            self.timings["compile"] = time.time() - start_time
+            if self.compile_slots is not None:
+                self.compile_slots.release()
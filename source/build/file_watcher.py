@@ -0,0 +1,143 @@
+__author__ = 'Paul Dapolito'
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+
+# Seconds between checks of the file when inotify is not available
+default_poll_interval = 0.5
+
+# Seconds without further changes before a burst of changes (such as an editor writing a temporary
+# file and renaming it over the original) counts as finished
+default_debounce_interval = 0.1
+
+# inotify constants, from <sys/inotify.h>
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+inotify_mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# struct inotify_event: watch descriptor, mask, cookie, and the length of the name that follows
+inotify_event = struct.Struct("iIII")
+
+
+# Returns libc's inotify_init1 and inotify_add_watch, or None where there is no inotify
+def load_inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        inotify_init1, inotify_add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+
+    inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return inotify_init1, inotify_add_watch
+
+
+# Waits for changes to a single file. The file's directory is watched with inotify where it is
+# available, so that a file replaced by rename (as most editors save) is still seen; elsewhere the
+# file's modification time, size, and inode are polled every poll_interval seconds.
+class FileWatcher(object):
+    def __init__(self, file_name, poll_interval=default_poll_interval, use_inotify=True):
+        self.file_name = os.path.abspath(file_name)
+        self.poll_interval = poll_interval
+        self.signature = self.file_signature(self.file_name)
+        self.inotify_descriptor = self.watch_directory() if use_inotify else None
+
+    @staticmethod
+    def file_signature(file_name):
+        try:
+            status = os.stat(file_name)
+        except OSError:
+            return None
+
+        return status.st_mtime, status.st_size, status.st_ino
+
+    # Returns an inotify descriptor watching the file's directory, or None
+    def watch_directory(self):
+        inotify = load_inotify()
+        if inotify is None:
+            return None
+
+        inotify_init1, inotify_add_watch = inotify
+        descriptor = inotify_init1(IN_CLOEXEC)
+        if descriptor < 0:
+            return None
+
+        directory = os.path.dirname(self.file_name)
+        if isinstance(directory, unicode):
+            directory = directory.encode("utf-8")
+        if inotify_add_watch(descriptor, directory, inotify_mask) < 0:
+            os.close(descriptor)
+            return None
+
+        return descriptor
+
+    def uses_inotify(self):
+        return self.inotify_descriptor is not None
+
+    # Blocks until the file changes, or until timeout seconds have passed (None waits forever).
+    # Returns whether the file changed.
+    def wait_for_change(self, timeout=None):
+        if self.inotify_descriptor is not None:
+            return self.wait_for_event(timeout)
+
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            signature = self.file_signature(self.file_name)
+            if signature != self.signature:
+                self.signature = signature
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(self.poll_interval, remaining))
+            else:
+                time.sleep(self.poll_interval)
+
+    def wait_for_event(self, timeout):
+        name = os.path.basename(self.file_name)
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - time.time())
+            try:
+                readable, writable, exceptional = select.select([self.inotify_descriptor], [], [], remaining)
+            except select.error as error:
+                if error.args[0] == errno.EINTR:
+                    continue
+                raise
+            if not readable:
+                return False
+
+            events = os.read(self.inotify_descriptor, 64*1024)
+            changed = False
+            offset = 0
+            while offset < len(events):
+                watch, mask, cookie, name_length = inotify_event.unpack_from(events, offset)
+                offset += inotify_event.size
+                event_name = events[offset:offset + name_length].rstrip("\0")
+                offset += name_length
+                changed = changed or event_name == name
+
+            if changed:
+                self.signature = self.file_signature(self.file_name)
+                return True
+
+    # Waits for the next change, then for the burst of changes it starts to finish
+    def wait_for_changes(self, debounce_interval=default_debounce_interval):
+        self.wait_for_change()
+        while self.wait_for_change(debounce_interval):
+            pass
+
+    def close(self):
+        if self.inotify_descriptor is not None:
+            os.close(self.inotify_descriptor)
+            self.inotify_descriptor = None
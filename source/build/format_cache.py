@@ -0,0 +1,169 @@
+__author__ = 'Paul Dapolito'
+
+import errno
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+
+from source.build.atomic_file import AtomicFile
+from source.build.pdf_compiler import PDFCompiler, default_timeout, default_cpu_timeout, default_memory_limit, \
+    default_pdflatex_path
+
+# Directory that formats are cached in by default
+default_format_directory = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                                        "easytex", "formats")
+
+# Number of formats kept; the least recently used are removed beyond this
+default_max_formats = 16
+
+format_suffix = ".fmt"
+lock_suffix = ".lock"
+
+# Ends a format's preamble. Once the format is loaded, the document's own \documentclass is
+# skipped, and its \usepackage lines are no-ops, since those packages are already loaded.
+dump_commands = "\\renewcommand{\\documentclass}[2][]{}\n\\dump\n"
+
+
+# Runs pdflatex -ini to dump a preamble into a format named after the preamble's file
+class FormatCompiler(PDFCompiler):
+    @staticmethod
+    def pdflatex_command(tex_file_name, output_directory, format_name=None, draft=False,
+                         pdflatex_path=default_pdflatex_path):
+        job_name = os.path.splitext(os.path.basename(tex_file_name))[0]
+        return [pdflatex_path, "-ini", "-interaction=nonstopmode", "-halt-on-error", "-jobname=" + job_name,
+                "-output-directory=" + output_directory, "&pdflatex", tex_file_name]
+
+    @classmethod
+    def output_file_name(cls, tex_file_name, output_directory):
+        return os.path.join(output_directory, os.path.splitext(os.path.basename(tex_file_name))[0] + format_suffix)
+
+
+# On-disk cache of precompiled pdflatex formats, each holding a document class with its packages
+# already loaded, keyed by a hash of the preamble, the class file, and the pdflatex version. Starting
+# pdflatex from a format skips loading the class and packages on every run; a changed class file or
+# package list gives a new key, and so a new format. Formats are dumped in a temporary directory and
+# renamed into place, so parallel builds only ever load whole formats; builds that need a format that
+# another build is dumping wait for it, rather than dumping it again.
+class FormatCache(object):
+    compiler = FormatCompiler
+
+    def __init__(self, directory=default_format_directory, max_formats=default_max_formats):
+        self.directory = directory
+        self.max_formats = max_formats
+
+        try:
+            os.makedirs(directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+    @staticmethod
+    def format_key(preamble, class_file_name, pdflatex_version):
+        return hashlib.sha1("{}\0{}\0".format(pdflatex_version, AtomicFile.file_digest(class_file_name)) +
+                            preamble).hexdigest()
+
+    def format_file_name(self, key):
+        return os.path.join(self.directory, "easytex-" + key[:16] + format_suffix)
+
+    # Opens and locks the lock file of a format, first waiting for any build that is dumping the same
+    # format. Returns the open lock file.
+    @staticmethod
+    def lock_format(format_file_name):
+        lock_file_name = format_file_name + lock_suffix
+        while True:
+            lock_file = open(lock_file_name, "a")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # The build that held the lock removes its file when it is done, so a lock on a file
+                # that is no longer there is worthless
+                if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_file_name)):
+                    return lock_file
+            except OSError:
+                pass
+            lock_file.close()
+
+    # Removes and unlocks the lock file of a format
+    @staticmethod
+    def unlock_format(format_file_name, lock_file):
+        try:
+            os.remove(format_file_name + lock_suffix)
+        except OSError:
+            pass
+        lock_file.close()
+
+    # Returns the format for preamble, dumping it first if it is not cached. The dump runs the pdflatex
+    # at pdflatex_path (whose version is pdflatex_version), limited like PDFCompiler.compile by timeout,
+    # cpu_timeout, and memory_limit (None for no limit). compile_slots, if set, is a semaphore held
+    # while the format is dumped, as it is while documents are compiled. Raises CompileError if the
+    # format cannot be dumped.
+    def format_for(self, preamble, class_file_name, pdflatex_version, timeout=default_timeout,
+                   cpu_timeout=default_cpu_timeout, memory_limit=default_memory_limit, compile_slots=None,
+                   pdflatex_path=default_pdflatex_path):
+        format_file_name = self.format_file_name(self.format_key(preamble, class_file_name, pdflatex_version))
+        if os.path.exists(format_file_name):
+            os.utime(format_file_name, None)
+            return format_file_name
+
+        lock_file = self.lock_format(format_file_name)
+        try:
+            # Dumped by another build while this one waited
+            if os.path.exists(format_file_name):
+                return format_file_name
+
+            if compile_slots is not None:
+                compile_slots.acquire()
+            try:
+                self.dump(preamble, class_file_name, format_file_name, timeout, cpu_timeout, memory_limit,
+                          pdflatex_path)
+            finally:
+                if compile_slots is not None:
+                    compile_slots.release()
+        finally:
+            self.unlock_format(format_file_name, lock_file)
+
+        self.evict()
+        return format_file_name
+
+    # Dumps preamble into format_file_name
+    def dump(self, preamble, class_file_name, format_file_name, timeout, cpu_timeout, memory_limit, pdflatex_path):
+        dump_directory = tempfile.mkdtemp(dir=self.directory)
+        try:
+            format_name = os.path.splitext(os.path.basename(format_file_name))[0]
+            preamble_file_name = os.path.join(dump_directory, format_name + ".tex")
+            with open(preamble_file_name, "w") as preamble_file:
+                preamble_file.write(preamble + dump_commands)
+
+            dumped_file_name = self.compiler.compile(preamble_file_name, dump_directory, timeout,
+                                                     environment=self.compiler.class_environment(class_file_name),
+                                                     cpu_timeout=cpu_timeout, memory_limit=memory_limit,
+                                                     pdflatex_path=pdflatex_path)
+            os.rename(dumped_file_name, format_file_name)
+        finally:
+            shutil.rmtree(dump_directory, ignore_errors=True)
+
+    # Removes the least recently used formats until at most max_formats are left
+    def evict(self):
+        formats = list()
+        for name in os.listdir(self.directory):
+            if name.endswith(format_suffix):
+                try:
+                    formats.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+                except OSError:
+                    # Removed by another build
+                    pass
+
+        for modified, name in sorted(formats, reverse=True)[self.max_formats:]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(format_suffix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,64 @@
+__author__ = 'Paul Dapolito'
+
+import os
+import re
+import time
+
+from source.build.atomic_file import AtomicFile
+from source.build.pdf_compiler import PDFCompiler, default_timeout, default_cpu_timeout, default_memory_limit, \
+    default_pdflatex_path
+
+# Most pdflatex runs made for one build
+default_max_passes = 4
+
+# Log messages that ask for another run, such as "Label(s) may have changed. Rerun to get
+# cross-references right." or a package's "Please rerun LaTeX."
+rerun_pattern = re.compile(r"Rerun to get|Please rerun|Rerun LaTeX")
+
+
+# Runs pdflatex as many times as a document needs for its cross-references to settle, and no more.
+# A pass is repeated only when it changed the .aux file or its log asks for a rerun. When there is no
+# .aux file from an earlier build, the first pass is a draft (writing no PDF), since its page
+# references are bound to be wrong; otherwise the old .aux is usually still right, and one pass does.
+class MultiPassCompiler(object):
+    compiler = PDFCompiler
+
+    # Compiles tex_file_name, with the same options as PDFCompiler.compile, in at most max_passes
+    # runs. Returns the PDF's file name, the seconds each pass took, and whether the .aux file
+    # settled; raises CompileError if any pass fails.
+    @classmethod
+    def compile(cls, tex_file_name, output_directory, timeout=default_timeout, working_directory=None,
+                environment=None, format_file_name=None, max_passes=default_max_passes,
+                cpu_timeout=default_cpu_timeout, memory_limit=default_memory_limit,
+                pdflatex_path=default_pdflatex_path):
+        stem = os.path.splitext(os.path.basename(tex_file_name))[0]
+        aux_file_name = os.path.join(output_directory, stem + ".aux")
+        log_file_name = os.path.join(output_directory, stem + ".log")
+
+        pass_timings = list()
+        aux_digest = AtomicFile.file_digest(aux_file_name)
+        draft = aux_digest is None and max_passes > 1
+        while True:
+            start_time = time.time()
+            pdf_file_name = cls.compiler.compile(tex_file_name, output_directory, timeout, working_directory,
+                                                 environment, format_file_name, draft, cpu_timeout, memory_limit,
+                                                 pdflatex_path)
+            pass_timings.append(time.time() - start_time)
+
+            previous_digest, aux_digest = aux_digest, AtomicFile.file_digest(aux_file_name)
+            settled = aux_digest == previous_digest and not cls.log_asks_for_rerun(log_file_name)
+            if draft:
+                # A draft pass is always followed by one that writes the PDF
+                draft = False
+            elif settled or len(pass_timings) >= max_passes:
+                return pdf_file_name, pass_timings, settled
+
+    # Returns whether a pdflatex log asks for another run
+    @staticmethod
+    def log_asks_for_rerun(log_file_name):
+        try:
+            with open(log_file_name) as log_file:
+                # pdflatex wraps long log lines, sometimes in the middle of a message
+                return rerun_pattern.search(log_file.read().replace("\n", "")) is not None
+        except IOError:
+            return False
@@ -0,0 +1,236 @@
+__author__ = 'Paul Dapolito'
+
+import os
+import resource
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+
+from source.errors.build.compile_error import CompileError
+
+# Longest a pdflatex run may take, in seconds, before it is killed
+default_timeout = 120
+
+# Most CPU time, in seconds, and address space, in bytes, that a pdflatex run may use
+default_cpu_timeout = 60
+default_memory_limit = 2048*1024*1024
+
+# pdflatex as found on PATH, for callers that have not looked it up themselves
+default_pdflatex_path = "pdflatex"
+
+# Seconds a timed-out pdflatex is given to exit after SIGTERM, before it is sent SIGKILL
+kill_grace_period = 1
+
+# Messages that pdflatex (through kpathsea) and the C library print when memory runs out
+memory_error_messages = ["memory exhausted", "Cannot allocate memory", "out of memory"]
+
+# Reasons that a pdflatex run failed, for CompileError.reason
+not_run_reason = "not run"
+failed_reason = "failed"
+no_output_reason = "no output"
+timed_out_reason = "timed out"
+cpu_limit_reason = "cpu limit"
+memory_limit_reason = "memory limit"
+crashed_reason = "crashed"
+
+# Lines in pdflatex's log that start an error message
+log_error_prefix = "! "
+
+
+# Runs pdflatex and waits for it to exit, rather than polling for a PDF to appear. pdflatex runs in
+# nonstop mode, reading from /dev/null, so that an error ends the run instead of waiting for someone
+# to answer the prompt. Each run is a process group of its own, limited in the CPU time and address
+# space it may use, and the whole group is killed if it runs for too long.
+class PDFCompiler(object):
+    # format_name, if given, is a precompiled format for pdflatex to start from instead of its own;
+    # with draft, pdflatex writes its .aux and .log files but no PDF. pdflatex_path is the program run.
+    @staticmethod
+    def pdflatex_command(tex_file_name, output_directory, format_name=None, draft=False,
+                         pdflatex_path=default_pdflatex_path):
+        format_options = ["-fmt=" + format_name] if format_name is not None else []
+        draft_options = ["-draftmode"] if draft else []
+        return [pdflatex_path, "-interaction=nonstopmode", "-halt-on-error"] + format_options + draft_options + \
+            ["-output-directory=" + output_directory, tex_file_name]
+
+    # Returns this process's environment, with class_file_name's directory first in TEXINPUTS so that
+    # pdflatex finds the class without it being copied next to the document. The empty entry that
+    # TEXINPUTS ends with stands for pdflatex's own search path.
+    @staticmethod
+    def class_environment(class_file_name):
+        environment = dict(os.environ)
+        class_directory = os.path.dirname(os.path.abspath(class_file_name))
+        environment["TEXINPUTS"] = class_directory + os.pathsep + environment.get("TEXINPUTS", "")
+        return environment
+
+    @classmethod
+    def output_file_name(cls, tex_file_name, output_directory):
+        return os.path.join(output_directory, os.path.splitext(os.path.basename(tex_file_name))[0] + ".pdf")
+
+    # Compiles tex_file_name into output_directory. pdflatex (the program at pdflatex_path) is run from
+    # working_directory, which defaults to output_directory, with environment (by default, this
+    # process's environment), and starts from the format in format_file_name if one is given. Returns
+    # the PDF's file name once pdflatex has exited successfully and written it (or None for a draft
+    # run, which writes no PDF); raises CompileError if pdflatex cannot be run, fails, writes no PDF,
+    # runs for longer than timeout seconds, or goes over its cpu_timeout (in seconds) or memory_limit
+    # (in bytes). None means no limit.
+    @classmethod
+    def compile(cls, tex_file_name, output_directory, timeout=default_timeout, working_directory=None,
+                environment=None, format_file_name=None, draft=False, cpu_timeout=default_cpu_timeout,
+                memory_limit=default_memory_limit, pdflatex_path=default_pdflatex_path):
+        stem = os.path.splitext(os.path.basename(tex_file_name))[0]
+        output_file_name = cls.output_file_name(tex_file_name, output_directory)
+        log_file_name = os.path.join(output_directory, stem + ".log")
+
+        if format_file_name is not None:
+            # pdflatex looks formats up by name, so the format's directory goes first in TEXFORMATS
+            environment = dict(environment if environment is not None else os.environ)
+            environment["TEXFORMATS"] = os.path.dirname(os.path.abspath(format_file_name)) + os.pathsep + \
+                environment.get("TEXFORMATS", "")
+            command = cls.pdflatex_command(tex_file_name, output_directory,
+                                           os.path.splitext(os.path.basename(format_file_name))[0], draft,
+                                           pdflatex_path)
+        else:
+            command = cls.pdflatex_command(tex_file_name, output_directory, draft=draft, pdflatex_path=pdflatex_path)
+
+        # A PDF left from an earlier run keeps its modification time. Since some file systems keep
+        # modification times to the second, one from the second the run started in counts as new.
+        start_time = int(time.time())
+        previous_modification_time = cls.modification_time(output_file_name)
+        start_cpu_time = cls.children_cpu_time()
+        with open(os.devnull, "r+b") as devnull, tempfile.TemporaryFile() as error_output:
+            try:
+                process = subprocess.Popen(command, stdin=devnull, stdout=devnull, stderr=error_output,
+                                           cwd=working_directory or output_directory, env=environment,
+                                           preexec_fn=cls.limit_child(cpu_timeout, memory_limit))
+            except OSError as error:
+                raise CompileError("Could not run pdflatex: {}".format(error.strerror), reason=not_run_reason)
+
+            status, timed_out = cls.wait(process, timeout)
+            cpu_time = cls.children_cpu_time() - start_cpu_time
+            error_output.seek(0)
+            error_text = error_output.read()
+
+        if timed_out:
+            raise CompileError("pdflatex did not finish within {} seconds.".format(timeout), status, True,
+                               timed_out_reason)
+        elif status == -signal.SIGXCPU or \
+                (status == -signal.SIGKILL and cpu_timeout is not None and cpu_time >= cpu_timeout):
+            raise CompileError("pdflatex used more than {} seconds of CPU time.".format(cpu_timeout), status,
+                               reason=cpu_limit_reason)
+        elif status < 0:
+            raise CompileError("pdflatex was killed by signal {}.".format(-status), status, reason=crashed_reason)
+        elif status != 0 and memory_limit is not None and \
+                any(message in error_text for message in memory_error_messages):
+            raise CompileError("pdflatex ran out of memory (limit: {} MB).".format(memory_limit//(1024*1024)),
+                               status, reason=memory_limit_reason)
+        elif status != 0:
+            error_message = "pdflatex failed with exit status {}".format(status)
+            first_error = cls.first_log_error(log_file_name)
+            if first_error is not None:
+                error_message += ": " + first_error
+            raise CompileError(error_message, status, reason=failed_reason)
+        elif draft:
+            return None
+        elif not cls.wrote_file(output_file_name, previous_modification_time, start_time):
+            raise CompileError("pdflatex did not write {}; see {}".format(os.path.basename(output_file_name),
+                                                                          log_file_name), status,
+                               reason=no_output_reason)
+
+        return output_file_name
+
+    # Returns the function that the child process runs before pdflatex: it starts a new process group,
+    # so that everything pdflatex starts can be killed with it, and sets its resource limits. Past
+    # cpu_timeout, the child is sent SIGXCPU, and one second later SIGKILL.
+    @staticmethod
+    def limit_child(cpu_timeout, memory_limit):
+        def set_limit(limit, soft_limit, hard_limit):
+            current_hard_limit = resource.getrlimit(limit)[1]
+            if current_hard_limit != resource.RLIM_INFINITY:
+                soft_limit = min(soft_limit, current_hard_limit)
+                hard_limit = min(hard_limit, current_hard_limit)
+            resource.setrlimit(limit, (soft_limit, hard_limit))
+
+        def limit():
+            os.setsid()
+            if cpu_timeout is not None:
+                seconds = max(1, int(cpu_timeout + 0.5))
+                set_limit(resource.RLIMIT_CPU, seconds, seconds + 1)
+            if memory_limit is not None:
+                set_limit(resource.RLIMIT_AS, memory_limit, memory_limit)
+
+        return limit
+
+    # Returns the CPU time, in seconds, used by the child processes of this process that have been
+    # waited for. The kernel only sends SIGKILL for the CPU limit once a child has used it up; any other
+    # SIGKILL comes from somewhere else.
+    @staticmethod
+    def children_cpu_time():
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+    # Sends a signal to every process in process_group, which may have exited already
+    @staticmethod
+    def kill_group(process_group, signal_number):
+        try:
+            os.killpg(process_group, signal_number)
+        except OSError:
+            pass
+
+    # Waits for process, the leader of its own process group, to exit. Once timeout seconds have
+    # passed, the group is sent SIGTERM, and then SIGKILL if the process has not exited after
+    # kill_grace_period. Returns its exit status and whether it was killed.
+    @classmethod
+    def wait(cls, process, timeout):
+        timed_out = threading.Event()
+        exited = threading.Event()
+
+        def kill():
+            timed_out.set()
+            cls.kill_group(process.pid, signal.SIGTERM)
+            if not exited.wait(kill_grace_period):
+                cls.kill_group(process.pid, signal.SIGKILL)
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            status = process.wait()
+        finally:
+            exited.set()
+            timer.cancel()
+            timer.join()
+
+        # Processes that pdflatex started may have outlived it
+        if timed_out.is_set():
+            cls.kill_group(process.pid, signal.SIGKILL)
+        return status, timed_out.is_set()
+
+    # Returns the modification time of file_name, or None if it does not exist
+    @staticmethod
+    def modification_time(file_name):
+        try:
+            return os.path.getmtime(file_name)
+        except OSError:
+            return None
+
+    # Returns whether file_name was written since a run that started at start_time, when it had
+    # previous_modification_time (None if it did not exist)
+    @classmethod
+    def wrote_file(cls, file_name, previous_modification_time, start_time):
+        modification_time = cls.modification_time(file_name)
+        return modification_time is not None and \
+            (modification_time != previous_modification_time or modification_time >= start_time)
+
+    # Returns the first error message in a pdflatex log, or None
+    @staticmethod
+    def first_log_error(log_file_name):
+        try:
+            with open(log_file_name) as log_file:
+                for line in log_file:
+                    if line.startswith(log_error_prefix):
+                        return line[len(log_error_prefix):].strip()
+        except IOError:
+            pass
+
+        return None
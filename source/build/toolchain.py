@@ -0,0 +1,129 @@
+__author__ = 'Paul Dapolito'
+
+import errno
+import hashlib
+import json
+import os
+import subprocess
+import time
+
+from source.build.atomic_file import AtomicFile
+
+# File that toolchain probes are cached in by default
+default_toolchain_cache_file_name = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                                                 "easytex", "toolchain.json")
+
+# Number of probes kept, one per PATH and set of binaries; the oldest are removed beyond this
+default_max_probes = 8
+
+# Programs that the toolchain is made of
+toolchain_programs = ["pdflatex"]
+
+
+# The TeX programs that builds run: where pdflatex is, which builds run it from, and the first line
+# of pdflatex -v (which names the pdfTeX and TeX Live versions)
+class Toolchain(object):
+    def __init__(self, pdflatex_path, pdflatex_version):
+        self.pdflatex_path = pdflatex_path
+        self.pdflatex_version = pdflatex_version
+
+    # Returns the full path of the program that running name would start, as the shell would find
+    # it on search_path, or None
+    @staticmethod
+    def find_program(name, search_path):
+        for directory in search_path.split(os.pathsep):
+            program_path = os.path.join(directory or os.curdir, name)
+            if os.path.isfile(program_path) and os.access(program_path, os.X_OK):
+                return os.path.abspath(program_path)
+
+        return None
+
+
+# On-disk cache of toolchain probes. Finding the programs on PATH and reading their modification
+# times is cheap, and keys the cache; only when the key is new (PATH changed, or a TeX install was
+# upgraded) is pdflatex -v run to read its version. So warm builds start no process before pdflatex.
+class ToolchainCache(object):
+    def __init__(self, cache_file_name=default_toolchain_cache_file_name, max_probes=default_max_probes):
+        self.cache_file_name = cache_file_name
+        self.max_probes = max_probes
+
+    # Returns the key for search_path and the programs found on it, and the programs' paths by name
+    @staticmethod
+    def probe_key(search_path):
+        program_paths = dict()
+        key_parts = [search_path]
+        for name in toolchain_programs:
+            program_path = Toolchain.find_program(name, search_path)
+            program_paths[name] = program_path
+            if program_path is not None:
+                real_path = os.path.realpath(program_path)
+                key_parts.append("{}\0{}\0{!r}".format(name, real_path, os.path.getmtime(real_path)))
+
+        return hashlib.sha1("\0\0".join(key_parts)).hexdigest(), program_paths
+
+    # Returns the Toolchain on search_path (by default, PATH), or None if there is no pdflatex on it
+    def probe(self, search_path=None):
+        if search_path is None:
+            search_path = os.environ.get("PATH", os.defpath)
+
+        key, program_paths = self.probe_key(search_path)
+        if program_paths["pdflatex"] is None:
+            return None
+
+        probes = self.load()
+        if key in probes:
+            toolchain = probes[key]["toolchain"]
+            return Toolchain(toolchain["pdflatex_path"], toolchain["pdflatex_version"])
+
+        pdflatex_version = self.pdflatex_version(program_paths["pdflatex"])
+        if pdflatex_version is None:
+            return None
+
+        toolchain = Toolchain(program_paths["pdflatex"], pdflatex_version)
+        probes[key] = {"probed": time.time(), "toolchain": vars(toolchain)}
+        self.record(probes)
+        return toolchain
+
+    # Returns the first line of pdflatex -v, or None if it cannot be run
+    @staticmethod
+    def pdflatex_version(pdflatex_path):
+        with open(os.devnull, "r+b") as devnull:
+            try:
+                process = subprocess.Popen([pdflatex_path, "-v"], stdin=devnull, stdout=subprocess.PIPE,
+                                           stderr=devnull)
+            except OSError:
+                return None
+            output = process.communicate()[0]
+
+        if process.returncode != 0:
+            return None
+        return (output.splitlines() or [""])[0].strip()
+
+    # Returns the cached probes by key, leaving out any that cannot be read
+    def load(self):
+        try:
+            with open(self.cache_file_name) as cache_file:
+                probes = json.load(cache_file)
+        except (IOError, ValueError):
+            return dict()
+
+        if not isinstance(probes, dict):
+            return dict()
+        return dict((key, probe) for key, probe in probes.items()
+                    if isinstance(probe, dict) and isinstance(probe.get("probed"), (int, float)) and
+                    isinstance(probe.get("toolchain"), dict) and
+                    set(probe["toolchain"]) == set(["pdflatex_path", "pdflatex_version"]))
+
+    # Writes probes to the cache, keeping the max_probes most recent
+    def record(self, probes):
+        kept_keys = sorted(probes, key=lambda key: probes[key]["probed"], reverse=True)[:self.max_probes]
+        probes = dict((key, probes[key]) for key in kept_keys)
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_file_name))
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+        cache_text = json.dumps(probes, indent=4, separators=(",", ": "), sort_keys=True) + "\n"
+        AtomicFile.write_text(self.cache_file_name, cache_text)
@@ -0,0 +1,14 @@
+__author__ = 'Paul Dapolito'
+
+
+class CompileError(Exception):
+    def __init__(self, error_message, status=None, timed_out=False, reason=None):
+        self.error_message = error_message
+        # Exit status of pdflatex, or None if it could not be run
+        self.status = status
+        self.timed_out = timed_out
+        # Kind of failure, such as "timed out" or "memory limit" (see source.build.pdf_compiler)
+        self.reason = reason
+
+    def __str__(self):
+        return repr(self.error_message)
\ No newline at end of file
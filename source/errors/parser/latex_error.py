@@ -0,0 +1,11 @@
+__author__ = 'Paul Dapolito'
+
+
+class LaTeXError(Exception):
+    def __init__(self, error_message, line_number=None, column=None):
+        self.error_message = error_message
+        self.line_number = line_number
+        self.column = column
+
+    def __str__(self):
+        return repr(self.error_message)
@@ -2,8 +2,10 @@ __author__ = 'Paul Dapolito'
 
 
 class ParseDocumentError(Exception):
-    def __init__(self, error_message):
+    def __init__(self, error_message, line_number=None, column=None):
         self.error_message = error_message
+        self.line_number = line_number
+        self.column = column
 
     def __str__(self):
         return repr(self.error_message)
\ No newline at end of file
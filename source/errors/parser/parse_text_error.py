@@ -2,8 +2,10 @@ __author__ = 'Paul Dapolito'
 
 
 class ParseTextError(Exception):
-    def __init__(self, error_message):
+    def __init__(self, error_message, invalid_characters=None):
         self.error_message = error_message
+        # (offset, character) pairs for every character that is not a terminal
+        self.invalid_characters = invalid_characters
 
     def __str__(self):
         return repr(self.error_message)
\ No newline at end of file
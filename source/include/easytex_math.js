@@ -0,0 +1,207 @@
+// EasyTeX preview math renderer
+//
+// Renders the TeX source in every element with the "math" class as HTML. This covers the math that
+// problem sets and memorandums mostly use: letters and numbers, superscripts and subscripts, groups,
+// \frac, \sqrt, \text, \mathbb and friends, and a table of symbols. Anything else is shown as its TeX
+// source, so a preview never hides what was written.
+(function () {
+    "use strict";
+
+    var symbols = {
+        alpha: "α", beta: "β", gamma: "γ", delta: "δ", epsilon: "ϵ",
+        varepsilon: "ε", zeta: "ζ", eta: "η", theta: "θ", vartheta: "ϑ",
+        iota: "ι", kappa: "κ", lambda: "λ", mu: "μ", nu: "ν", xi: "ξ",
+        pi: "π", varpi: "ϖ", rho: "ρ", varrho: "ϱ", sigma: "σ", varsigma: "ς",
+        tau: "τ", upsilon: "υ", phi: "ϕ", varphi: "φ", chi: "χ", psi: "ψ",
+        omega: "ω", Gamma: "Γ", Delta: "Δ", Theta: "Θ", Lambda: "Λ", Xi: "Ξ",
+        Pi: "Π", Sigma: "Σ", Upsilon: "Υ", Phi: "Φ", Psi: "Ψ", Omega: "Ω",
+        leq: "≤", le: "≤", geq: "≥", ge: "≥", neq: "≠", ne: "≠",
+        approx: "≈", equiv: "≡", sim: "∼", cong: "≅", propto: "∝",
+        "in": "∈", notin: "∉", ni: "∋", subset: "⊂", subseteq: "⊆",
+        supset: "⊃", supseteq: "⊇", cup: "∪", cap: "∩", setminus: "∖",
+        emptyset: "∅", varnothing: "∅", forall: "∀", exists: "∃", neg: "¬",
+        lnot: "¬", wedge: "∧", land: "∧", vee: "∨", lor: "∨",
+        to: "→", rightarrow: "→", leftarrow: "←", leftrightarrow: "↔",
+        Rightarrow: "⇒", Leftarrow: "⇐", Leftrightarrow: "⇔", implies: "⟹",
+        iff: "⟺", mapsto: "↦", infty: "∞", partial: "∂", nabla: "∇",
+        pm: "±", mp: "∓", times: "×", div: "÷", cdot: "⋅", circ: "∘",
+        star: "⋆", ast: "∗", oplus: "⊕", otimes: "⊗", mid: "∣",
+        sum: "∑", prod: "∏", int: "∫", oint: "∮", bigcup: "⋃", bigcap: "⋂",
+        ldots: "…", dots: "…", cdots: "⋯", vdots: "⋮", ddots: "⋱",
+        langle: "⟨", rangle: "⟩", lceil: "⌈", rceil: "⌉", lfloor: "⌊",
+        rfloor: "⌋", prime: "′", ell: "ℓ", hbar: "ℏ", aleph: "ℵ",
+        "{": "{", "}": "}", "$": "$", "%": "%", "&": "&", "#": "#", "_": "_", "|": "‖",
+        ",": " ", ";": " ", ":": " ", "!": "", " ": " ",
+        quad: " ", qquad: "  ", left: "", right: "", displaystyle: "", limits: ""
+    };
+
+    // Operator names, which are set upright
+    var operators = ["lim", "log", "ln", "exp", "sin", "cos", "tan", "sec", "csc", "cot", "max", "min",
+                     "sup", "inf", "det", "gcd", "deg", "dim", "ker", "mod", "arg", "Pr"];
+
+    var blackboard = {C: "ℂ", H: "ℍ", N: "ℕ", P: "ℙ", Q: "ℚ", R: "ℝ",
+                      Z: "ℤ"};
+
+    function escapeHTML(text) {
+        return text.replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+    }
+
+    function tokenize(source) {
+        var tokens = [];
+        var pattern = /\\([A-Za-z]+|.)|([{}^_])|(\s+)|(.)/g;
+        var match;
+        while ((match = pattern.exec(source)) !== null) {
+            if (match[1] !== undefined) {
+                tokens.push({type: "command", value: match[1]});
+            } else if (match[2] !== undefined) {
+                tokens.push({type: match[2], value: match[2]});
+            } else if (match[3] !== undefined) {
+                tokens.push({type: "space", value: " "});
+            } else {
+                tokens.push({type: "character", value: match[4]});
+            }
+        }
+        return tokens;
+    }
+
+    function Parser(tokens) {
+        this.tokens = tokens;
+        this.position = 0;
+    }
+
+    Parser.prototype.next = function () {
+        return this.tokens[this.position++];
+    };
+
+    Parser.prototype.peek = function () {
+        return this.tokens[this.position];
+    };
+
+    // Parses tokens up to the closing brace (or the end) into HTML
+    Parser.prototype.parseGroup = function () {
+        var html = "";
+        while (this.peek() !== undefined && this.peek().type !== "}") {
+            html += this.parseAtom();
+        }
+        this.next();
+        return html;
+    };
+
+    // Skips spaces, which math mode ignores outside of text
+    Parser.prototype.skipSpaces = function () {
+        while (this.peek() !== undefined && this.peek().type === "space") {
+            this.next();
+        }
+    };
+
+    // Parses a single argument: a braced group or one token
+    Parser.prototype.parseArgument = function () {
+        var token;
+        this.skipSpaces();
+        token = this.peek();
+        if (token === undefined) {
+            return "";
+        } else if (token.type === "{") {
+            this.next();
+            return this.parseGroup();
+        }
+        return this.parseAtom();
+    };
+
+    // Reads a braced argument as plain text, for \text and \mathbb
+    Parser.prototype.parseTextArgument = function () {
+        var text = "";
+        var depth = 0;
+        var token;
+        this.skipSpaces();
+        token = this.next();
+        if (token === undefined || token.type !== "{") {
+            return token === undefined ? "" : token.value;
+        }
+        while ((token = this.next()) !== undefined) {
+            if (token.type === "{") {
+                depth += 1;
+            } else if (token.type === "}") {
+                if (depth === 0) {
+                    break;
+                }
+                depth -= 1;
+            }
+            if (token.type !== "command") {
+                text += token.value;
+            } else {
+                text += symbols.hasOwnProperty(token.value) ? symbols[token.value] : "\\" + token.value;
+            }
+        }
+        return text;
+    };
+
+    Parser.prototype.parseAtom = function () {
+        var token = this.next();
+        var name;
+
+        if (token.type === "{") {
+            return "<span class=\"group\">" + this.parseGroup() + "</span>";
+        } else if (token.type === "^") {
+            return "<sup>" + this.parseArgument() + "</sup>";
+        } else if (token.type === "_") {
+            return "<sub>" + this.parseArgument() + "</sub>";
+        } else if (token.type === "}" || token.type === "space") {
+            return "";
+        } else if (token.type === "character") {
+            if (/[A-Za-z]/.test(token.value)) {
+                return "<i>" + token.value + "</i>";
+            } else if (/[=<>+\-*]/.test(token.value)) {
+                return "<span class=\"operator\">" + escapeHTML(token.value.replace("-", "−")) + "</span>";
+            }
+            return escapeHTML(token.value);
+        }
+
+        name = token.value;
+        if (name === "frac" || name === "dfrac" || name === "tfrac") {
+            return "<span class=\"fraction\"><span class=\"numerator\">" + this.parseArgument() +
+                "</span><span class=\"denominator\">" + this.parseArgument() + "</span></span>";
+        } else if (name === "sqrt") {
+            return "√<span class=\"radicand\">" + this.parseArgument() + "</span>";
+        } else if (name === "text" || name === "textrm" || name === "mathrm" || name === "operatorname") {
+            return "<span class=\"text\">" + escapeHTML(this.parseTextArgument()) + "</span>";
+        } else if (name === "textbf" || name === "mathbf") {
+            return "<b>" + escapeHTML(this.parseTextArgument()) + "</b>";
+        } else if (name === "mathcal" || name === "mathit" || name === "textit") {
+            return "<i>" + escapeHTML(this.parseTextArgument()) + "</i>";
+        } else if (name === "mathbb") {
+            return escapeHTML(this.parseTextArgument().replace(/[A-Z]/g, function (letter) {
+                return blackboard.hasOwnProperty(letter) ? blackboard[letter] : letter;
+            }));
+        } else if (operators.indexOf(name) !== -1) {
+            return "<span class=\"text\">" + name + "</span>";
+        } else if (symbols.hasOwnProperty(name)) {
+            return escapeHTML(symbols[name]);
+        }
+        return "<span class=\"unknown\">\\" + escapeHTML(name) + "</span>";
+    };
+
+    function render(source) {
+        var parser = new Parser(tokenize(source));
+        var html = "";
+        while (parser.peek() !== undefined) {
+            html += parser.parseAtom();
+        }
+        return html;
+    }
+
+    function renderAll() {
+        var elements = document.querySelectorAll(".math");
+        var index;
+        for (index = 0; index < elements.length; index += 1) {
+            elements[index].title = elements[index].textContent;
+            elements[index].innerHTML = render(elements[index].textContent);
+        }
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", renderAll);
+    } else {
+        renderAll();
+    }
+}());
@@ -0,0 +1,80 @@
+__author__ = 'Paul Dapolito'
+
+import hashlib
+from collections import OrderedDict
+from StringIO import StringIO
+
+# Default limit on the total length of the cached fragments, in characters
+default_max_size = 16*1024*1024
+
+
+# Least recently used cache of rendered LaTeX fragments, such as a problem or section, keyed by a
+# hash of the text that the fragment is rendered from. Re-rendering a document after editing one
+# problem only renders that problem again; every other fragment is written from the cache. The
+# cache holds at most max_size characters of fragments, and a max_size of 0 disables it.
+class FragmentCache(object):
+    def __init__(self, max_size=default_max_size):
+        self.max_size = max_size
+        self.fragments = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    # Parts are the strings (or None) that the fragment is rendered from, starting with its kind
+    @staticmethod
+    def fragment_key(parts):
+        key = hashlib.sha1()
+        for part in parts:
+            if part is None:
+                key.update("-")
+                continue
+            if isinstance(part, unicode):
+                part = part.encode("utf-8")
+            key.update("{}:".format(len(part)))
+            key.update(part)
+
+        return key.digest()
+
+    # Writes the fragment rendered from parts to stream. render(output) writes the fragment to output,
+    # and is only called on a miss. Fragments that could not fit in the cache are rendered straight
+    # to stream.
+    def write_fragment(self, parts, render, stream):
+        if sum(len(part) for part in parts if part is not None) > self.max_size:
+            render(stream)
+            return
+
+        key = self.fragment_key(parts)
+        fragment = self.fragments.pop(key, None)
+        if fragment is None:
+            self.misses += 1
+            output = StringIO()
+            render(output)
+            fragment = output.getvalue()
+            self.size += len(fragment)
+        else:
+            self.hits += 1
+
+        # Most recently used fragments are kept at the end
+        self.fragments[key] = fragment
+        self.evict()
+        stream.write(fragment)
+
+    # Changes max_size, removing fragments as needed
+    def resize(self, max_size):
+        self.max_size = max_size
+        self.evict()
+
+    def evict(self):
+        while self.size > self.max_size:
+            key, fragment = self.fragments.popitem(last=False)
+            self.size -= len(fragment)
+
+    def clear(self):
+        self.fragments.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def statistics(self):
+        return {"hits": self.hits, "misses": self.misses, "fragments": len(self.fragments), "size": self.size}
+
@@ -0,0 +1,190 @@
+__author__ = 'Paul Dapolito'
+
+import cgi
+import os
+import re
+from StringIO import StringIO
+
+
+# Basic elements
+newline = "\n"
+tab = "    "
+
+# Math renderer and style sheet inlined into every preview, so that it is a single standalone file
+include_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "include")
+math_script_path = os.path.join(include_path, "easytex_math.js")
+style_sheet_path = os.path.join(include_path, "easytex_preview.css")
+
+# Escaped dollar signs, display math ($$...$$ or \[...\]), and inline math ($...$ or \(...\)) in text.
+# \[ and \( are not math after another backslash, as in the line break \\[2pt].
+math_pattern = re.compile(r"(\\\$)|\$\$(.+?)\$\$|(?<!\\)\\\[(.+?)\\\]|(?<!\\)\\\((.+?)\\\)|\$((?:\\.|[^\\$])+)\$", re.S)
+
+# Text-mode commands with an HTML equivalent, and LaTeX line breaks
+text_commands = {"textbf": "b", "textit": "i", "emph": "em", "underline": "u"}
+text_command_pattern = re.compile(r"\\(textbf|textit|emph|underline)\{([^{}]*)\}")
+line_break_pattern = re.compile(r"[ ]*\\\\[ ]*$", re.M)
+
+
+# Renders the IR to a standalone HTML preview, without pdflatex. Text is escaped and kept line for
+# line; math is left as TeX in "math" elements for the renderer in include/easytex_math.js.
+class HTMLInterpreter(object):
+    # FragmentCache for rendered problems and sections, or None to render every one
+    fragment_cache = None
+
+    # (math script, style sheet), read on first use
+    resources = None
+
+    @classmethod
+    def load_resources(cls):
+        if cls.resources is None:
+            with open(math_script_path) as math_script, open(style_sheet_path) as style_sheet:
+                cls.resources = (math_script.read(), style_sheet.read())
+
+        return cls.resources
+
+    @staticmethod
+    def escape(text):
+        return cgi.escape(text, quote=True)
+
+    # Escapes text, keeping its math in "math" elements
+    @classmethod
+    def html_text(cls, text):
+        html = list()
+        position = 0
+        for match in math_pattern.finditer(text):
+            html.append(cls.html_plain_text(text[position:match.start()]))
+            if match.group(1):
+                html.append("$")
+            elif match.group(2) is not None or match.group(3) is not None:
+                display_math = match.group(2) if match.group(2) is not None else match.group(3)
+                html.append("<span class=\"math display\">" + cls.escape(display_math) + "</span>")
+            else:
+                inline_math = match.group(4) if match.group(4) is not None else match.group(5)
+                html.append("<span class=\"math inline\">" + cls.escape(inline_math) + "</span>")
+            position = match.end()
+        html.append(cls.html_plain_text(text[position:]))
+
+        return "".join(html)
+
+    @classmethod
+    def html_plain_text(cls, text):
+        text = line_break_pattern.sub("", cls.escape(text))
+        return text_command_pattern.sub(lambda match: "<{0}>{1}</{0}>".format(text_commands[match.group(1)],
+                                                                            match.group(2)), text)
+
+    @classmethod
+    def write_head(cls, title, stream):
+        math_script, style_sheet = cls.load_resources()
+        stream.write("<!DOCTYPE html>" + newline + "<html>" + newline + "<head>" + newline)
+        stream.write(tab + "<meta charset=\"utf-8\">" + newline)
+        stream.write(tab + "<title>" + cls.escape(title) + "</title>" + newline)
+        stream.write(tab + "<style>" + newline + style_sheet + tab + "</style>" + newline)
+        stream.write("</head>" + newline + "<body>" + newline)
+
+    @classmethod
+    def write_tail(cls, stream):
+        math_script, style_sheet = cls.load_resources()
+        stream.write("<script>" + newline + math_script + "</script>" + newline)
+        stream.write("</body>" + newline + "</html>" + newline)
+
+    @classmethod
+    def write_header(cls, lines, stream):
+        # Lines are (class, text) pairs; None text is left out
+        stream.write("<header>" + newline)
+        for line_class, line_text in lines:
+            if line_text is None:
+                continue
+            tag = "h1" if line_class == "title" else "p"
+            stream.write(tab + "<{0} class=\"{1}\">{2}</{0}>".format(tag, line_class, cls.html_text(line_text)) +
+                         newline)
+        stream.write("</header>" + newline)
+
+    @staticmethod
+    def names(people):
+        if not people:
+            return None
+        return "Worked with " + ", ".join(person.name for person in people)
+
+    @classmethod
+    def interpret_problem_set(cls, problem_set):
+        output = StringIO()
+        cls.write_problem_set(problem_set, output)
+        return output.getvalue()
+
+    @classmethod
+    def write_problem_set(cls, problem_set, stream):
+        title = problem_set.title.text if problem_set.title is not None else None
+        course_and_school = ", ".join(field.text for field in [problem_set.course, problem_set.school]
+                                      if field is not None) or None
+        due_date = "Due " + problem_set.due_date.date_string if problem_set.due_date is not None else None
+
+        cls.write_head(title or problem_set.author.name, stream)
+        cls.write_header([("title", title), ("author", problem_set.author.name), ("class", course_and_school),
+                          ("due-date", due_date), ("collaborators", cls.names(problem_set.collaborators))], stream)
+
+        for number, problem in enumerate(problem_set.problems, 1):
+            cls.write_problem(problem, number, stream)
+
+        cls.write_tail(stream)
+
+    # Writes the problem to stream from the fragment cache, rendering it on a miss. Problems without
+    # a label are named by their number.
+    @classmethod
+    def write_problem(cls, problem, number, stream):
+        name = problem.label.text if problem.label is not None else str(number)
+        if cls.fragment_cache is None:
+            cls.render_problem(problem, name, stream)
+            return
+
+        parts = ("html problem", name, problem.statement.text, problem.solution.text)
+        cls.fragment_cache.write_fragment(parts, lambda output: cls.render_problem(problem, name, output), stream)
+
+    @classmethod
+    def render_problem(cls, problem, name, stream):
+        stream.write("<section class=\"problem\">" + newline)
+        stream.write(tab + "<h2>Problem " + cls.html_text(name) + "</h2>" + newline)
+        stream.write(tab + "<div class=\"statement text-block\">" + cls.html_text(problem.statement.text) +
+                     "</div>" + newline)
+        stream.write(tab + "<h3>Solution</h3>" + newline)
+        stream.write(tab + "<div class=\"solution text-block\">" + cls.html_text(problem.solution.text.rstrip()) +
+                     "</div>" + newline)
+        stream.write("</section>" + newline)
+
+    @classmethod
+    def interpret_memorandum(cls, memorandum):
+        output = StringIO()
+        cls.write_memorandum(memorandum, output)
+        return output.getvalue()
+
+    @classmethod
+    def write_memorandum(cls, memorandum, stream):
+        subtitle = memorandum.subtitle.text if memorandum.subtitle is not None else None
+        date = memorandum.date.date_string if memorandum.date is not None else None
+
+        cls.write_head(memorandum.title.text, stream)
+        cls.write_header([("title", memorandum.title.text), ("subtitle", subtitle),
+                          ("author", memorandum.author.name),
+                          ("collaborators", cls.names(memorandum.collaborators)), ("date", date)], stream)
+
+        for section in memorandum.sections:
+            cls.write_section(section, stream)
+
+        cls.write_tail(stream)
+
+    # Writes the section to stream from the fragment cache, rendering it on a miss
+    @classmethod
+    def write_section(cls, section, stream):
+        if cls.fragment_cache is None:
+            cls.render_section(section, stream)
+            return
+
+        parts = ("html section", section.title.text, section.content.text)
+        cls.fragment_cache.write_fragment(parts, lambda output: cls.render_section(section, output), stream)
+
+    @classmethod
+    def render_section(cls, section, stream):
+        stream.write("<section class=\"section\">" + newline)
+        stream.write(tab + "<h2>" + cls.html_text(section.title.text) + "</h2>" + newline)
+        stream.write(tab + "<div class=\"content text-block\">" + cls.html_text(section.content.text) +
+                     "</div>" + newline)
+        stream.write("</section>" + newline)
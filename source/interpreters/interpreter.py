@@ -1,20 +1,87 @@
 __author__ = 'Paul Dapolito'
 
+from StringIO import StringIO
+
 from source.ir.problem_sets.problem_set import ProblemSet
 from source.ir.memorandums.memorandum import Memorandum
 
 from problem_set_interpreter import ProblemSetInterpreter
 from memorandum_interpreter import MemorandumInterpreter
+from split_interpreter import SplitInterpreter
 
 from source.errors.interpreters.interpret_document_error import InterpretDocumentError
 
+# Output formats: LaTeX for pdflatex, or a standalone HTML preview
+latex_format = "latex"
+html_format = "html"
+output_formats = [latex_format, html_format]
+output_extensions = {latex_format: ".tex", html_format: ".html"}
+
 
 class EasyTeXInterpreter(object):
+    # Sets the FragmentCache used for problems and sections. None renders every fragment.
+    @staticmethod
+    def set_fragment_cache(fragment_cache):
+        ProblemSetInterpreter.fragment_cache = fragment_cache
+        MemorandumInterpreter.fragment_cache = fragment_cache
+
+    @staticmethod
+    def fragment_cache():
+        return ProblemSetInterpreter.fragment_cache
+
+    # Returns the problem set and memorandum interpreters for output_format. The HTML interpreter,
+    # and the modules it needs, are only imported for HTML previews.
+    @classmethod
+    def format_interpreters(cls, output_format):
+        if output_format == latex_format:
+            return ProblemSetInterpreter, MemorandumInterpreter
+
+        from html_interpreter import HTMLInterpreter
+        HTMLInterpreter.fragment_cache = cls.fragment_cache()
+        return HTMLInterpreter, HTMLInterpreter
+
+    @classmethod
+    def interpret_document(cls, document, processes=1, output_format=latex_format):
+        output = StringIO()
+        cls.interpret_document_to(document, output, processes, output_format)
+        return output.getvalue()
+
+    # Writes document to stream (any object with write and writelines), such as an open .tex file,
+    # one problem or section at a time, as LaTeX or as an HTML preview. Large problem sets are
+    # rendered to LaTeX by a pool of worker processes when more than one process (or None, for one
+    # per CPU) is asked for; other documents are always rendered serially.
     @classmethod
-    def interpret_document(cls, document):
+    def interpret_document_to(cls, document, stream, processes=1, output_format=latex_format):
+        if output_format not in output_formats:
+            raise InterpretDocumentError("Could not interpret document: unknown output format '{}'!"
+                                         .format(output_format))
+
+        problem_set_interpreter, memorandum_interpreter = cls.format_interpreters(output_format)
+        if type(document) is ProblemSet:
+            if output_format == latex_format:
+                problem_set_interpreter.write_problem_set(document, stream, processes)
+            else:
+                problem_set_interpreter.write_problem_set(document, stream)
+        elif type(document) is Memorandum:
+            memorandum_interpreter.write_memorandum(document, stream)
+        else:
+            raise InterpretDocumentError("Could not interpret document: no memorandum or problem set found!")
+
+    # Writes the LaTeX for document as a master file plus one fragment file per problem or section,
+    # rewriting only the files whose LaTeX changed. With only, a list of 1-based problem or section
+    # numbers, the master pulls in just those. source_file_name, the EasyTeX input, lets fragments be
+    # removed once it is gone. Returns the names of the files that were written.
+    @staticmethod
+    def interpret_split_document(document, master_file_name, only=None, source_file_name=None):
+        return SplitInterpreter.write_split_document(document, master_file_name, only, source_file_name)
+
+    # Returns the LaTeX preamble of document (its class and packages), which is the same for every
+    # document of its kind with the same packages
+    @staticmethod
+    def interpret_preamble(document):
         if type(document) is ProblemSet:
-            return ProblemSetInterpreter.interpret_problem_set(document)
+            return ProblemSetInterpreter.interpret_preamble(document)
         elif type(document) is Memorandum:
-            return MemorandumInterpreter.interpret_memorandum(document)
+            return MemorandumInterpreter.interpret_preamble(document)
         else:
             raise InterpretDocumentError("Could not interpret document: no memorandum or problem set found!")
@@ -1,13 +1,39 @@
 __author__ = 'Paul Dapolito'
 
+from StringIO import StringIO
+
+
 # Basic elements
 newline = "\n"
 tab = "    "
 
 
 class MemorandumInterpreter(object):
+    # FragmentCache for rendered sections, or None to render every section
+    fragment_cache = None
+
     @classmethod
     def interpret_memorandum(cls, memorandum):
+        output = StringIO()
+        cls.write_memorandum(memorandum, output)
+        return output.getvalue()
+
+    # Writes the memorandum to stream (any object with write and writelines), one section at a time
+    @classmethod
+    def write_memorandum(cls, memorandum, stream):
+        cls.write_memorandum_header(memorandum, stream)
+
+        # Write sections
+        for section in memorandum.sections:
+            stream.write(newline)
+            cls.write_section(section, stream)
+
+        cls.write_memorandum_footer(stream)
+
+    # Returns the class and packages of the memorandum, which are the same for every memorandum with
+    # the same packages
+    @classmethod
+    def interpret_preamble(cls, memorandum):
         # Memorandum headers
         document_class = "\documentclass[letterpaper, boxed]{hmcpset}"
         document_class += newline
@@ -24,6 +50,20 @@ class MemorandumInterpreter(object):
         else:
             packages = None
 
+        preamble_as_list = [
+            document_class,
+            package_spec,
+            newline,
+            packages
+        ]
+        return "".join(elem for elem in preamble_as_list if elem is not None)
+
+    # Writes everything before the first section: the preamble, the opening of the document, and the
+    # title block
+    @classmethod
+    def write_memorandum_header(cls, memorandum, stream):
+        preamble = cls.interpret_preamble(memorandum)
+
         begin_document = "\\begin{document}"
         begin_document += newline
 
@@ -69,19 +109,9 @@ class MemorandumInterpreter(object):
         end_center = tab + "\\end{center}"
         end_center += newline
 
-        # Accumulate sections
-        sections = ""
-        for section in memorandum.sections:
-            sections += newline + cls.interpret_section(section)
-
-        end_document = "\\end{document}"
-
-        # Accumulate and filter document
+        # Accumulate and filter document headers
         document_as_list = [
-            document_class,
-            package_spec,
-            newline,
-            packages,
+            preamble,
             begin_document,
             newline,
             begin_center,
@@ -90,19 +120,35 @@ class MemorandumInterpreter(object):
             author,
             collaborators,
             date,
-            end_center,
-            sections,
-            newline,
-            end_document,
-            newline
+            end_center
         ]
         filtered_document = [elem for elem in document_as_list if elem is not None]
-        accumulated_document = "".join(filtered_document)
+        stream.write("".join(filtered_document))
 
-        return accumulated_document
+    @classmethod
+    def write_memorandum_footer(cls, stream):
+        end_document = "\\end{document}"
+        stream.write(newline + end_document + newline)
 
     @classmethod
     def interpret_section(cls, section):
+        output = StringIO()
+        cls.write_section(section, output)
+        return output.getvalue()
+
+    # Writes the section to stream from the fragment cache, rendering it on a miss
+    @classmethod
+    def write_section(cls, section, stream):
+        if cls.fragment_cache is None:
+            cls.render_section(section, stream)
+            return
+
+        parts = ("section", section.title.text, section.content.text)
+        cls.fragment_cache.write_fragment(parts, lambda output: cls.render_section(section, output), stream)
+
+    # Renders the section to stream, a line at a time, without joining its content
+    @classmethod
+    def render_section(cls, section, stream):
         section_header = tab + "\large \\begin{flushleft}"
         section_header += newline
 
@@ -115,20 +161,8 @@ class MemorandumInterpreter(object):
         normal_size = tab + "\\normalsize"
         normal_size += newline
 
-        ## Add tabs to each line of content
-        content_text = section.content.text
-        split_content = content_text.split("\n")
-        content_lines_with_tabs = [2*tab + line for line in split_content]
-        content = "\n".join(content_lines_with_tabs)
-
-        section_as_list = [
-            section_header,
-            section_title,
-            end_flush_left,
-            normal_size,
-            content,
-            newline
-        ]
-        accumulated_section = "".join(section_as_list)
+        stream.write("".join([section_header, section_title, end_flush_left, normal_size]))
 
-        return accumulated_section
+        ## Add tabs to each line of content
+        split_content = section.content.text.split("\n")
+        stream.writelines(2*tab + line + newline for line in split_content)
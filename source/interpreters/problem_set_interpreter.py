@@ -1,13 +1,72 @@
 __author__ = 'Paul Dapolito'
 
+from StringIO import StringIO
+
+
+from source.ir.problem_sets.label import Label
+from source.ir.problem_sets.statement import Statement
+from source.ir.problem_sets.solution import Solution
+from source.ir.problem_sets.problem import Problem
+
 # Basic elements
 newline = "\n"
 tab = "    "
+problem_separator = newline + tab + "\pagebreak" + 2*newline
+
+# Problem sets with fewer problems than this are rendered serially, even when more processes are
+# asked for, since starting worker processes costs more than parallel rendering saves
+parallel_problem_threshold = 20000
+
+# Number of problems rendered by each worker task
+problems_per_task = 250
+
+
+# Renders a list of (label, statement, solution) texts from write_problems_in_parallel in a
+# worker process, joined like write_problem_set joins them. Problems are sent as texts rather
+# than as IR, so that problems read from a memory-mapped file can be sent too.
+def render_problems_task(problems):
+    output = StringIO()
+    for index, (label, statement, solution) in enumerate(problems):
+        if index:
+            output.write(problem_separator)
+        label = Label(label) if label is not None else None
+        ProblemSetInterpreter.render_problem(Problem(label, Statement(statement), Solution(solution)), output)
+
+    return output.getvalue()
 
 
 class ProblemSetInterpreter(object):
+    # FragmentCache for rendered problems, or None to render every problem
+    fragment_cache = None
+
+    @classmethod
+    def interpret_problem_set(cls, problem_set, processes=1):
+        output = StringIO()
+        cls.write_problem_set(problem_set, output, processes)
+        return output.getvalue()
+
+    # Writes the problem set to stream (any object with write and writelines), one problem at a time.
+    # With more than one process (or None, for one per CPU), large problem sets are rendered by
+    # write_problems_in_parallel instead.
+    @classmethod
+    def write_problem_set(cls, problem_set, stream, processes=1):
+        cls.write_problem_set_header(problem_set, stream)
+
+        # Write problems
+        if processes != 1 and len(problem_set.problems) >= parallel_problem_threshold:
+            cls.write_problems_in_parallel(problem_set.problems, stream, processes)
+        else:
+            cls.write_problem(problem_set.problems[0], stream)
+            for problem in problem_set.problems[1:]:
+                stream.write(problem_separator)
+                cls.write_problem(problem, stream)
+
+        cls.write_problem_set_footer(stream)
+
+    # Returns the class and packages of the problem set, which are the same for every problem set with
+    # the same packages
     @classmethod
-    def interpret_problem_set(cls, problem_set):
+    def interpret_preamble(cls, problem_set):
         # Problem set headers
         document_class = "\documentclass[11pt,letterpaper,boxed]{hmcpset}"
         package_spec = "\usepackage[margin=0.9in]{geometry}"
@@ -22,6 +81,21 @@ class ProblemSetInterpreter(object):
         else:
             packages = None
 
+        preamble_as_list = [
+            document_class,
+            newline,
+            package_spec,
+            2*newline,
+            packages
+        ]
+        return "".join(elem for elem in preamble_as_list if elem is not None)
+
+    # Writes everything before the first problem: the preamble, the opening of the document, and the
+    # collaborators
+    @classmethod
+    def write_problem_set_header(cls, problem_set, stream):
+        preamble = cls.interpret_preamble(problem_set)
+
         # Author
         author = "\\name{" + problem_set.author.name + "}"
         author += newline
@@ -67,21 +141,9 @@ class ProblemSetInterpreter(object):
         else:
             collaborators = None
 
-        # Accumulate problems
-        problems = ""
-        problems += cls.interpret_problem(problem_set.problems[0])
-        for problem in problem_set.problems[1:]:
-            problems += newline + tab + "\pagebreak" + 2*newline + cls.interpret_problem(problem)
-
-        end_document = "\\end{document}"
-
-        # Accumulate and filter document
+        # Accumulate and filter document headers
         document_as_list = [
-            document_class,
-            newline,
-            package_spec,
-            2*newline,
-            packages,
+            preamble,
             author,
             course_and_school,
             title,
@@ -89,56 +151,81 @@ class ProblemSetInterpreter(object):
             newline,
             begin_document,
             2*newline,
-            collaborators,
-            problems,
-            newline,
-            end_document,
-            newline
+            collaborators
         ]
         filtered_document = [elem for elem in document_as_list if elem is not None]
-        accumulated_document = "".join(filtered_document)
+        stream.write("".join(filtered_document))
 
-        return accumulated_document
+    @classmethod
+    def write_problem_set_footer(cls, stream):
+        end_document = "\\end{document}"
+        stream.write(newline + end_document + newline)
+
+    # Renders problems in a pool of worker processes, problems_per_task at a time, and writes each
+    # task's LaTeX to stream in order as soon as it and every task before it are done. The output is
+    # the same as rendering serially; the fragment cache is not used.
+    @classmethod
+    def write_problems_in_parallel(cls, problems, stream, processes=None):
+        import multiprocessing
+
+        tasks = list()
+        for start in range(0, len(problems), problems_per_task):
+            tasks.append([(problem.label.text if problem.label is not None else None, problem.statement.text,
+                           problem.solution.text) for problem in problems[start:start + problems_per_task]])
+
+        pool = multiprocessing.Pool(processes)
+        try:
+            for index, rendered_problems in enumerate(pool.imap(render_problems_task, tasks)):
+                if index:
+                    stream.write(problem_separator)
+                stream.write(rendered_problems)
+        finally:
+            pool.close()
+            pool.join()
 
     @classmethod
     def interpret_problem(cls, problem):
+        output = StringIO()
+        cls.write_problem(problem, output)
+        return output.getvalue()
+
+    # Writes the problem to stream from the fragment cache, rendering it on a miss
+    @classmethod
+    def write_problem(cls, problem, stream):
+        if cls.fragment_cache is None:
+            cls.render_problem(problem, stream)
+            return
+
+        label = problem.label.text if problem.label is not None else None
+        parts = ("problem", label, problem.statement.text, problem.solution.text)
+        cls.fragment_cache.write_fragment(parts, lambda output: cls.render_problem(problem, output), stream)
+
+    # Renders the problem to stream, a line at a time, without joining its statement or solution
+    @classmethod
+    def render_problem(cls, problem, stream):
         # Assemble problem statement
         ## Check for label
         if problem.label is not None:
             problem_opening_tag = "\\begin{problem}[" + problem.label.text + "]"
         else:
             problem_opening_tag = "\\begin{problem}"
+        stream.write(tab + problem_opening_tag + newline)
+
         ## Add tabs to each line of statement
-        statement_text = problem.statement.text
-        split_statement = statement_text.split("\n")
-        statement_lines_with_tabs = [2*tab + line for line in split_statement]
-        statement = "\n".join(statement_lines_with_tabs)
+        split_statement = problem.statement.text.split("\n")
+        stream.writelines(2*tab + line + newline for line in split_statement)
         problem_closing_tag = "\\end{problem}"
+        stream.write(tab + problem_closing_tag + 2*newline)
 
         # Assemble problem solution
         solution_opening_tag = "\\begin{solution}"
-        solution_text = problem.solution.text
-        ## Add tabs to each line of solution
-        split_solution = solution_text.split("\n")
-        solution_lines_with_tabs = [2*tab + line for line in split_solution if line != ""]
-        solution = "\n".join(solution_lines_with_tabs)
-        solution_closing_tag = "\\end{solution}"
-
-        # Assemble problem as list and then accumulate
-        problem_as_list = [
-            tab, problem_opening_tag,
-            newline,
-            statement,
-            newline,
-            tab, problem_closing_tag,
-            2*newline,
-            tab, solution_opening_tag,
-            newline,
-            solution,
-            newline,
-            tab, solution_closing_tag,
-            newline
-        ]
-        accumulated_problem = "".join(problem_as_list)
+        stream.write(tab + solution_opening_tag + newline)
 
-        return accumulated_problem
+        ## Add tabs to each nonempty line of solution
+        split_solution = [line for line in problem.solution.text.split("\n") if line != ""]
+        if split_solution:
+            stream.writelines(2*tab + line + newline for line in split_solution)
+        else:
+            stream.write(newline)
+        solution_closing_tag = "\\end{solution}"
+        stream.write(tab + solution_closing_tag + newline)
@@ -0,0 +1,164 @@
+__author__ = 'Paul Dapolito'
+
+import errno
+import glob
+import json
+import os
+import re
+from StringIO import StringIO
+
+from source.ir.problem_sets.problem_set import ProblemSet
+from source.ir.memorandums.memorandum import Memorandum
+
+from problem_set_interpreter import ProblemSetInterpreter, problem_separator
+from memorandum_interpreter import MemorandumInterpreter
+
+from source.build.atomic_file import AtomicFile
+from source.errors.interpreters.interpret_document_error import InterpretDocumentError
+
+# Basic elements
+newline = "\n"
+tab = "    "
+
+# Characters allowed in fragment directory names, which TeX reads unquoted
+unsafe_name_pattern = re.compile(r"[^A-Za-z0-9_-]")
+
+# Ends the name of the hidden file next to each master file that records its fragments
+manifest_suffix = ".easytex-split.json"
+
+
+# Writes a document as a master .tex file that \input's one fragment file per problem or section,
+# kept in a directory next to the master. Files are written atomically, and only when their LaTeX
+# changes, so unchanged problems keep their modification times. With only (a list of 1-based problem or section
+# numbers), the master inputs just those fragments, like \includeonly, and pdflatex typesets just
+# those; every fragment is still written, so a later full build is up to date. \include itself is
+# not used, since it would start a page before the first problem and between sections.
+#
+# Each master's fragments, and the input they were written from, are recorded in a manifest next to
+# it. Fragments that a master no longer inputs, and those of masters whose input is gone (because it
+# was renamed or removed), are removed by what their manifests record.
+class SplitInterpreter(object):
+    @staticmethod
+    def fragment_directory_name(master_file_name):
+        stem = os.path.splitext(os.path.basename(master_file_name))[0]
+        return unsafe_name_pattern.sub("_", stem) + "_parts"
+
+    # Writes the master file and fragments for document, read from source_file_name if given, and
+    # removes stale fragments. Returns the names of the files that were written.
+    @classmethod
+    def write_split_document(cls, document, master_file_name, only=None, source_file_name=None):
+        if type(document) is ProblemSet:
+            prefix, fragments = "problem", document.problems
+            write_fragment = ProblemSetInterpreter.write_problem
+        elif type(document) is Memorandum:
+            prefix, fragments = "section", document.sections
+            write_fragment = MemorandumInterpreter.write_section
+        else:
+            raise InterpretDocumentError("Could not interpret document: no memorandum or problem set found!")
+
+        if only is not None:
+            for number in only:
+                if not 1 <= number <= len(fragments):
+                    raise InterpretDocumentError("Could not interpret document: no {} {} to compile, "
+                                                 "found {} {}(s)!".format(prefix, number, len(fragments), prefix))
+
+        directory_name = cls.fragment_directory_name(master_file_name)
+        directory_path = os.path.join(os.path.dirname(master_file_name), directory_name)
+        if not os.path.isdir(directory_path):
+            os.makedirs(directory_path)
+
+        # Fragment names as TeX sees them, relative to the master file's directory
+        names = [directory_name + "/" + prefix + "_" + str(number) for number in range(1, len(fragments) + 1)]
+
+        written_files = list()
+        for name, fragment in zip(names, fragments):
+            output = StringIO()
+            write_fragment(fragment, output)
+            file_name = os.path.join(os.path.dirname(master_file_name), name + ".tex")
+            if AtomicFile.write_text(file_name, output.getvalue()):
+                written_files.append(file_name)
+
+        cls.remove_stale_fragments(master_file_name, [name + ".tex" for name in names], source_file_name)
+
+        output = StringIO()
+        if type(document) is ProblemSet:
+            cls.write_problem_set_master(document, names, only, output)
+        else:
+            cls.write_memorandum_master(document, names, only, output)
+        if AtomicFile.write_text(master_file_name, output.getvalue()):
+            written_files.append(master_file_name)
+
+        return written_files
+
+    # Returns the master file and its fragment files, as written by write_split_document
+    @classmethod
+    def split_file_names(cls, master_file_name):
+        directory_path = os.path.join(os.path.dirname(master_file_name), cls.fragment_directory_name(master_file_name))
+        return [master_file_name] + sorted(glob.glob(os.path.join(directory_path, "*.tex")))
+
+    @staticmethod
+    def manifest_file_name(master_file_name):
+        stem = os.path.splitext(os.path.basename(master_file_name))[0]
+        return os.path.join(os.path.dirname(master_file_name), "." + stem + manifest_suffix)
+
+    # Returns a manifest's (source file name, fragment names), or None if it cannot be read
+    @staticmethod
+    def load_manifest(manifest_file_name):
+        try:
+            with open(manifest_file_name) as manifest_file:
+                manifest = json.load(manifest_file)
+            return manifest["source"], list(manifest["fragments"])
+        except (IOError, ValueError, KeyError, TypeError):
+            return None
+
+    # Removes the fragments of master_file_name's manifest that are not in fragment_names (names
+    # relative to its directory), and every fragment of the other masters in its directory whose
+    # source file is gone, then records fragment_names and source_file_name in its manifest
+    @classmethod
+    def remove_stale_fragments(cls, master_file_name, fragment_names, source_file_name=None):
+        directory = os.path.dirname(master_file_name)
+        own_manifest_file_name = cls.manifest_file_name(master_file_name)
+
+        for manifest_file_name in glob.glob(os.path.join(directory, ".*" + manifest_suffix)):
+            manifest = cls.load_manifest(manifest_file_name)
+            if manifest is None:
+                continue
+
+            recorded_source_file_name, recorded_names = manifest
+            if manifest_file_name == own_manifest_file_name:
+                stale_names = [name for name in recorded_names if name not in fragment_names]
+            elif recorded_source_file_name is not None and not os.path.exists(recorded_source_file_name):
+                stale_names = recorded_names
+                os.remove(manifest_file_name)
+            else:
+                continue
+
+            for name in stale_names:
+                try:
+                    os.remove(os.path.join(directory, name))
+                    # Removes the fragment directory once it is empty
+                    os.rmdir(os.path.dirname(os.path.join(directory, name)))
+                except OSError as error:
+                    if error.errno not in (errno.ENOENT, errno.ENOTEMPTY, errno.EEXIST):
+                        raise
+
+        if source_file_name is not None:
+            source_file_name = os.path.realpath(source_file_name)
+        manifest_text = json.dumps({"source": source_file_name, "fragments": fragment_names}, indent=4,
+                                   separators=(",", ": "), sort_keys=True) + "\n"
+        AtomicFile.write_text(own_manifest_file_name, manifest_text)
+
+    @staticmethod
+    def write_problem_set_master(problem_set, names, only, stream):
+        ProblemSetInterpreter.write_problem_set_header(problem_set, stream)
+        selected_names = [name for number, name in enumerate(names, 1) if only is None or number in only]
+        stream.write(problem_separator.join(tab + "\\input{" + name + "}" + newline for name in selected_names))
+        ProblemSetInterpreter.write_problem_set_footer(stream)
+
+    @staticmethod
+    def write_memorandum_master(memorandum, names, only, stream):
+        MemorandumInterpreter.write_memorandum_header(memorandum, stream)
+        for number, name in enumerate(names, 1):
+            if only is None or number in only:
+                stream.write(newline + tab + "\\input{" + name + "}" + newline)
+        MemorandumInterpreter.write_memorandum_footer(stream)
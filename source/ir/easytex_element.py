@@ -6,6 +6,9 @@ from abc import ABCMeta, abstractmethod
 class EasyTeXElement(object):
     __metaclass__ = ABCMeta
 
+    # SourceSpan of the input this element was parsed from, if known. Spans are not compared by __eq__.
+    span = None
+
     @abstractmethod
     def __eq__(self, other):
         pass
\ No newline at end of file
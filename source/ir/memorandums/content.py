@@ -1,15 +1,21 @@
 __author__ = 'Paul Dapolito'
 
 from source.ir.easytex_element import EasyTeXElement
+from source.ir.span_text import SpanText
 from source.errors.ir.memorandums.content_error import ContentError
 
 
 class Content(EasyTeXElement):
     def __init__(self, text):
-        self.text = text
+        # A string, or a SpanText that is only read when .text is used
+        self.source_text = text
 
-        if self.text == "":
+        if not self.source_text:
             raise ContentError("EasyTeX content cannot be empty!")
 
+    @property
+    def text(self):
+        return SpanText.read_text(self.source_text)
+
     def __eq__(self, other):
         return self.text == other.text
@@ -0,0 +1,49 @@
+__author__ = 'Paul Dapolito'
+
+
+# Where an IR node came from in the input: from (line_number, column) up to, but not including,
+# (end_line_number, end_column). Lines and columns count from 1, like parser error messages.
+class SourceSpan(object):
+    def __init__(self, line_number, column, end_line_number, end_column):
+        self.line_number = line_number
+        self.column = column
+        self.end_line_number = end_line_number
+        self.end_column = end_column
+
+    def __eq__(self, other):
+        return self.start() == other.start() and self.end() == other.end()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def start(self):
+        return self.line_number, self.column
+
+    def end(self):
+        return self.end_line_number, self.end_column
+
+    # Returns the same span, moved down (or up, for negative line_delta) by line_delta lines
+    def shifted(self, line_delta):
+        return SourceSpan(self.line_number + line_delta, self.column, self.end_line_number + line_delta,
+                          self.end_column)
+
+    # Span of one line, from its first non-space character to its end
+    @staticmethod
+    def of_line(line_number, line):
+        return SourceSpan.of_lines(line_number, line, line_number, line)
+
+    # Span from the first non-space character of one line to the end of another
+    @staticmethod
+    def of_lines(line_number, line, end_line_number, end_line):
+        return SourceSpan(line_number, len(line) - len(line.lstrip(" ")) + 1, end_line_number, len(end_line) + 1)
+
+    # Smallest span covering every given span, or None if none of them is known
+    @staticmethod
+    def cover(spans):
+        spans = [span for span in spans if span is not None]
+        if not spans:
+            return None
+
+        start = min(span.start() for span in spans)
+        end = max(span.end() for span in spans)
+        return SourceSpan(start[0], start[1], end[0], end[1])
@@ -0,0 +1,27 @@
+__author__ = 'Paul Dapolito'
+
+
+# Statement, solution, or content text that is still in its source buffer (such as a memory-mapped
+# file), as the offsets [start, end) of its lines. The text is only copied out when read() is called:
+# blank lines are dropped and leftmost whitespace is stripped from every line, exactly like the
+# parser does for text it copies, and suffix is added to the end.
+class SpanText(object):
+    def __init__(self, buffer, start, end, suffix=""):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.suffix = suffix
+
+    def __len__(self):
+        return self.end - self.start
+
+    def read(self):
+        lines = self.buffer[self.start:self.end].split("\n")
+        return "\n".join(line.lstrip() for line in lines if line.strip()) + self.suffix
+
+    # Returns text itself if it is already a string, and reads it otherwise
+    @staticmethod
+    def read_text(text):
+        if isinstance(text, SpanText):
+            return text.read()
+        return text
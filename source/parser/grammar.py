@@ -0,0 +1,72 @@
+__author__ = 'Paul Dapolito'
+
+from pyparsing import Group, Literal, OneOrMore, Optional, ParseException, Regex, Suppress, White, Word, \
+    ZeroOrMore, line, lineno, restOfLine
+
+from source.parser.terminals import space, newline, tab, terminals
+
+# Built on first use by EasyTeXParser.load_grammar, so that importing the parser (or parsing with
+# the scanner engine) never pays for importing pyparsing and building the grammar
+
+# Text
+text = ZeroOrMore(Word(terminals)).leaveWhitespace()
+
+# Grammar
+## Header Fields
+# Every header line is read once as "key: value", in any order; HeaderTable checks the keys afterwards
+def header_field_position(string, location, tokens):
+    return [(tokens["key"], tokens["value"], lineno(location, string), line(location, string))]
+
+header_field_expr = Suppress(White(tab)) + Regex(r"(?!(?:problem|section):)(?P<key>\w+):[ ]+(?P<value>.*)").leaveWhitespace()
+header_field = header_field_expr.setParseAction(header_field_position)
+headers = Group(ZeroOrMore(header_field)).setResultsName("headers")
+
+## Section Title [Optional]
+section_title_expr = Suppress(White(2*tab) + Literal("title:") + White(space)) + restOfLine
+optional_section_title = Optional(section_title_expr.setResultsName("title"), default=list())
+
+## Label [Optional]
+label_expr = Suppress(White(2*tab) + Literal("label:") + White(space)) + restOfLine
+optional_label = Optional(label_expr.setResultsName("label"), default=list())
+
+## Statement
+statement_ignored = Suppress(White(2*tab) + Literal("statement:") + White(newline))
+statement_lines = Group(OneOrMore(Regex(ur'(            .+)').leaveWhitespace() + Suppress(White(newline))))
+statement_expr = statement_ignored + statement_lines
+statement = statement_expr.setResultsName("statement")
+
+## Solution
+solution_ignored = Suppress(White(2*tab) + Literal("solution:") + White(newline))
+solution_lines = Group(OneOrMore(Regex(ur'(            .+)').leaveWhitespace() + Suppress(White(newline))))
+solution_expr = solution_ignored + solution_lines
+solution = solution_expr.setResultsName("solution")
+
+## Problem
+problem_ignored = Suppress(White(tab) + Literal("problem:"))
+problem = problem_ignored + Group(optional_label + statement + solution)
+problems_expr = Group(OneOrMore(problem))
+problems = problems_expr.setResultsName("problems")
+
+## Content
+content_ignored = Suppress(White(2*tab) + Literal("content:") + White(newline))
+content_lines = Group(OneOrMore(Regex(ur'(            .+)').leaveWhitespace() + Suppress(White(newline))))
+content_expr = content_ignored + content_lines
+content = content_expr.setResultsName("content")
+
+## Section
+section = Group(Suppress(White(tab) + Literal("section:")) + optional_section_title + content)
+sections_expr = Group(OneOrMore(section))
+sections = sections_expr.setResultsName("sections")
+
+## Problem Set
+problem_set_identifier = Literal("problem_set")
+problem_set_ignored = Suppress(Literal(":"))
+problem_set = problem_set_identifier + problem_set_ignored + headers + problems
+
+## Memorandum
+memorandum_identifier = Literal("memorandum")
+memorandum_ignored = Suppress(Literal(":"))
+memorandum = memorandum_identifier + memorandum_ignored + headers + sections
+
+## Document
+document = problem_set | memorandum
@@ -0,0 +1,44 @@
+__author__ = 'Paul Dapolito'
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+from source.parser.terminals import space
+
+# Header fields known to each document type, and the subset of those that are required
+known_fields = {
+    "problem_set": ("author", "collaborators", "due_date", "title", "course", "school", "packages"),
+    "memorandum": ("author", "collaborators", "date", "title", "subtitle", "packages")
+}
+required_fields = {
+    "problem_set": ("author",),
+    "memorandum": ("author", "title")
+}
+
+
+# Keyed table of a document's header fields, read once from its header block. Fields may come in
+# any order; unknown and duplicate fields are reported with their position. Like pyparsing's
+# Optional(..., default=list()), every known field maps to [value], or to [] when it was left out.
+# The (line number, line) that each given field was read from is kept in positions.
+class HeaderTable(dict):
+    def __init__(self, document_type, header_fields):
+        super(HeaderTable, self).__init__((field, list()) for field in known_fields[document_type])
+        self.positions = dict()
+
+        # Header fields are (key, value, line number, line) tuples
+        for key, value, line_number, line in header_fields:
+            if key not in self:
+                raise self.field_error("unknown header field '{}'".format(key), line_number, line)
+            elif self[key]:
+                raise self.field_error("duplicate header field '{}'".format(key), line_number, line)
+            self[key] = [value]
+            self.positions[key] = (line_number, line)
+
+        for field in required_fields[document_type]:
+            if not self[field]:
+                raise ParseDocumentError("Error parsing document: missing required header field '{}'".format(field))
+
+    @staticmethod
+    def field_error(message, line_number, line):
+        column = len(line) - len(line.lstrip(space)) + 1
+        return ParseDocumentError("Error parsing document: {} at line {}, column {}: '{}'".format(
+            message, line_number, column, line), line_number, column)
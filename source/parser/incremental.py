@@ -0,0 +1,86 @@
+__author__ = 'Paul Dapolito'
+
+import copy
+import hashlib
+
+from source.parser.parser import EasyTeXParser, scanner_engine
+from source.parser.scanner import EasyTeXScanner, newline
+
+from source.ir.easytex_element import EasyTeXElement
+
+
+# Parser session that keeps the previous parse. Each new text is split into its top-level
+# problem and section blocks, and only blocks whose text changed are parsed again; the others
+# reuse their cached Problem or Section. After each parse, changed_blocks holds the indices
+# (into the document's problems or sections) of the blocks that were parsed again. Reused blocks
+# are copied with their source spans moved to the lines they are on now, so documents returned
+# earlier keep their own spans.
+class EasyTeXParseSession(object):
+    def __init__(self, parser=None):
+        if parser is None:
+            parser = EasyTeXParser(engine=scanner_engine)
+
+        self.parser = parser
+        self.scanner = EasyTeXScanner()
+        self.block_cache = dict()
+        self.changed_blocks = list()
+
+    @staticmethod
+    def hash_block(lines):
+        block_text = newline.join(lines)
+        if isinstance(block_text, unicode):
+            block_text = block_text.encode("utf-8")
+
+        return hashlib.sha1(block_text).hexdigest()
+
+    # Returns a copy of a block with its spans, and those of the elements in it, moved down by
+    # line_delta lines. The block itself is left alone, since it is also in the previous document.
+    @staticmethod
+    def moved_block(block, line_delta):
+        moved_block = copy.copy(block)
+        for name, element in vars(block).items():
+            if isinstance(element, EasyTeXElement) and element.span is not None:
+                moved_element = copy.copy(element)
+                moved_element.span = element.span.shifted(line_delta)
+                setattr(moved_block, name, moved_element)
+
+        if block.span is not None:
+            moved_block.span = block.span.shifted(line_delta)
+        return moved_block
+
+    def parse_document(self, input_string):
+        blocks = self.scanner.split_blocks(input_string.split(newline))
+        header_lines = blocks[0][1]
+        first_block_line = blocks[1][1][0] if len(blocks) > 1 else None
+
+        # Headers are cheap, so they are always scanned again
+        document_type, header_fields = self.scanner.scan_header_block(header_lines, first_block_line)
+        if document_type == "problem_set":
+            document = self.parser.parse_problem_set_headers(header_fields)
+            block_type, parse_block, document_blocks = "problem", self.parser.parse_problem, document.problems
+        else:
+            document = self.parser.parse_memorandum_headers(header_fields)
+            block_type, parse_block, document_blocks = "section", self.parser.parse_section, document.sections
+
+        # Only the blocks in the latest parse are kept, so the cache never outgrows the document
+        block_cache = dict()
+        changed_blocks = list()
+        for index, (first_line_number, lines) in enumerate(blocks[1:]):
+            # Cached blocks are (block, first line number) pairs. A block repeated within the same
+            # document is parsed again, since each copy has its own span.
+            block_hash = self.hash_block(lines)
+            if block_hash in self.block_cache and block_hash not in block_cache:
+                block, cached_line_number = self.block_cache[block_hash]
+                if first_line_number != cached_line_number:
+                    block = self.moved_block(block, first_line_number - cached_line_number)
+            else:
+                block = parse_block(self.scanner.scan_block(block_type, lines, first_line_number))
+                changed_blocks.append(index)
+
+            block_cache[block_hash] = (block, first_line_number)
+            document_blocks.append(block)
+
+        self.parser.set_document_span(document)
+        self.block_cache = block_cache
+        self.changed_blocks = changed_blocks
+        return document
@@ -0,0 +1,198 @@
+__author__ = 'Paul Dapolito'
+
+import re
+
+from source.ir.problem_sets.problem_set import ProblemSet
+from source.ir.memorandums.memorandum import Memorandum
+from source.errors.parser.latex_error import LaTeXError
+
+# Text-mode commands, whose braced argument is text again even inside math (so $ starts inline math
+# there), and commands whose first argument is a URL, read as is (so % starts no comment there)
+text_commands = ["text", "textrm", "textit", "textbf", "textsf", "texttt", "textup", "textsl", "textsc",
+                 "textnormal", "emph", "mbox", "hbox", "fbox", "intertext", "shortintertext"]
+url_commands = ["url", "href"]
+
+# Everything in LaTeX text that opens or closes something: environments, \verb, text-mode and URL
+# arguments, math delimiters, other escapes (such as \$ and \{, which open nothing), comments,
+# braces, and line ends
+token_pattern = re.compile(r"\\(begin|end)[ ]*\{([^{}\n]*)\}|\\verb\*?|\\(" + "|".join(text_commands + url_commands) +
+                           r")(?![A-Za-z])[ ]*\{|\\[\[\]()]|\\.|\$\$|[${}%\n]")
+
+# Environments whose contents are not LaTeX, and so are not checked
+verbatim_environments = ["verbatim", "verbatim*", "lstlisting", "comment"]
+
+# Names of math delimiters, by opening delimiter, and the opening delimiter of each closing one
+math_names = {"$": "'$'", "$$": "'$$'", "\\(": "'\\('", "\\[": "'\\['"}
+math_openings = {"\\)": "\\(", "\\]": "\\["}
+
+
+# Checks the LaTeX in statements, solutions, and contents for the structural mistakes that would
+# otherwise only be found by a failed pdflatex run: unbalanced braces, math delimiters ($, $$, \(,
+# \[), and \begin/\end pairs. Each text is scanned once, token by token, so checking is linear in
+# the size of the document. Comments, escaped characters, \verb, URLs, and verbatim environments are
+# skipped, as TeX would, and math may start again inside the argument of a text-mode command.
+class LaTeXValidator(object):
+    # Returns a (message, line index, column index) for every structural error in text, in order
+    @staticmethod
+    def text_errors(text):
+        errors = list()
+        braces = list()
+        environments = list()
+        math = None
+
+        line_index = 0
+        line_start = 0
+        position = 0
+        while True:
+            token = token_pattern.search(text, position)
+            if token is None:
+                break
+            value = token.group(0)
+            column = token.start() - line_start
+            position = token.end()
+
+            if value == "\n":
+                line_index += 1
+                line_start = position
+            elif value == "%":
+                # Comments run to the end of the line
+                line_end = text.find("\n", position)
+                position = len(text) if line_end == -1 else line_end
+            elif value == "{":
+                # Braces are kept with whether they end a text-mode argument inside math, and that math
+                braces.append((line_index, column, False, None))
+            elif value == "}":
+                if not braces:
+                    errors.append(("'}' without a matching '{'", line_index, column))
+                    continue
+
+                brace_line_index, brace_column, ends_text, outer_math = braces.pop()
+                if ends_text:
+                    if math is not None:
+                        errors.append(("{} without a matching end".format(math_names[math[0]]), math[1], math[2]))
+                    math = outer_math
+            elif token.group(3) in url_commands:
+                # A URL runs to the next closing brace
+                brace_column = column + len(value) - 1
+                end = text.find("}", position)
+                if end == -1:
+                    errors.append(("'{' without a matching '}'", line_index, brace_column))
+                    break
+                if text.find("\n", position, end) != -1:
+                    line_index += text.count("\n", position, end)
+                    line_start = text.rfind("\n", 0, end) + 1
+                position = end + 1
+            elif token.group(3) is not None:
+                # Text inside math, where math can start again until the argument ends
+                braces.append((line_index, column + len(value) - 1, math is not None, math))
+                math = None
+            elif value.startswith("\\verb"):
+                # \verb's argument runs from the character after it to the next copy of that character
+                line_end = text.find("\n", position)
+                line_end = len(text) if line_end == -1 else line_end
+                end = text.find(text[position], position + 1, line_end) if position < line_end else -1
+                if end == -1:
+                    errors.append(("\\verb without an end", line_index, column))
+                    position = line_end
+                else:
+                    position = end + 1
+            elif token.group(1) == "begin" and token.group(2) in verbatim_environments:
+                end_command = "\\end{" + token.group(2) + "}"
+                end = text.find(end_command, position)
+                if end == -1:
+                    errors.append(("\\begin{" + token.group(2) + "} without a matching \\end", line_index, column))
+                    break
+                line_index += text.count("\n", position, end)
+                line_start = text.rfind("\n", 0, end) + 1 if text.find("\n", position, end) != -1 else line_start
+                position = end + len(end_command)
+            elif token.group(1) == "begin":
+                environments.append((token.group(2), line_index, column))
+            elif token.group(1) == "end":
+                name = token.group(2)
+                if name not in [environment[0] for environment in environments]:
+                    errors.append(("\\end{" + name + "} without a matching \\begin", line_index, column))
+                    continue
+
+                # Environments opened after the one being ended were never ended themselves
+                while environments[-1][0] != name:
+                    unended_name, unended_line_index, unended_column = environments.pop()
+                    errors.append(("\\begin{" + unended_name + "} without a matching \\end", unended_line_index,
+                                   unended_column))
+                environments.pop()
+            elif value in math_names:
+                if math is None:
+                    math = (value, line_index, column)
+                elif math[0] == value:
+                    math = None
+                elif math[0] == "$" and value == "$$":
+                    # Inline math that ends where more inline math starts, as in $a$$b$
+                    math = ("$", line_index, column + 1)
+                else:
+                    errors.append(("{} inside math opened by {}".format(math_names[value], math_names[math[0]]),
+                                   line_index, column))
+            elif value in math_openings:
+                if math is not None and math[0] == math_openings[value]:
+                    math = None
+                else:
+                    errors.append(("'{}' without a matching {}".format(value, math_names[math_openings[value]]),
+                                   line_index, column))
+
+        if math is not None:
+            errors.append(("{} without a matching end".format(math_names[math[0]]), math[1], math[2]))
+        for name, environment_line_index, environment_column in environments:
+            errors.append(("\\begin{" + name + "} without a matching \\end", environment_line_index,
+                           environment_column))
+        for brace_line_index, brace_column, ends_text, outer_math in braces:
+            errors.append(("'{' without a matching '}'", brace_line_index, brace_column))
+
+        errors.sort(key=lambda error: (error[1], error[2]))
+        return errors
+
+    # Returns the source (line number, line) of each line of element's text, or None where they are
+    # not known. Text lines are the non-blank lines of the element's span, with their indentation
+    # stripped.
+    @staticmethod
+    def source_lines(element, input_lines):
+        span = element.span
+        if span is None or input_lines is None or span.end_line_number > len(input_lines):
+            return None
+
+        return [(line_number, input_lines[line_number - 1])
+                for line_number in range(span.line_number, span.end_line_number + 1)
+                if input_lines[line_number - 1].strip()]
+
+    # Returns a LaTeXError for every structural error in element's text. Errors are reported at their
+    # line and column in input_lines (the document's source) when the element's span is known.
+    @classmethod
+    def element_errors(cls, element, kind, input_lines=None):
+        source_lines = cls.source_lines(element, input_lines)
+        errors = list()
+        for message, line_index, column in cls.text_errors(element.text):
+            if source_lines and line_index < len(source_lines):
+                line_number, line = source_lines[line_index]
+                source_column = len(line) - len(line.lstrip()) + column + 1
+                errors.append(LaTeXError("Error checking LaTeX: {} in the {} at line {}, column {}: '{}'".format(
+                    message, kind, line_number, source_column, line), line_number, source_column))
+            elif element.span is not None:
+                errors.append(LaTeXError("Error checking LaTeX: {} in the {} at line {}".format(
+                    message, kind, element.span.line_number), element.span.line_number))
+            else:
+                errors.append(LaTeXError("Error checking LaTeX: {} in a {}".format(message, kind)))
+
+        return errors
+
+    # Returns a LaTeXError for every structural error in the document's statements, solutions, and
+    # contents, in document order. input_text is the document's source, for line numbers.
+    @classmethod
+    def document_errors(cls, document, input_text=None):
+        input_lines = input_text.split("\n") if input_text is not None else None
+        errors = list()
+        if type(document) is ProblemSet:
+            for problem in document.problems:
+                errors.extend(cls.element_errors(problem.statement, "statement", input_lines))
+                errors.extend(cls.element_errors(problem.solution, "solution", input_lines))
+        elif type(document) is Memorandum:
+            for section in document.sections:
+                errors.extend(cls.element_errors(section.content, "content", input_lines))
+
+        return errors
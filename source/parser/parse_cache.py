@@ -0,0 +1,103 @@
+__author__ = 'Paul Dapolito'
+
+import cPickle
+import errno
+import hashlib
+import os
+import tempfile
+
+# Default limit on the total size of a cache directory, in bytes
+default_max_size = 64*1024*1024
+
+cache_suffix = ".pickle"
+
+
+# On-disk cache of parsed documents (the pickled ProblemSet or Memorandum), keyed by a hash of the
+# input text, the parser engine, and parser_version. Entries are written to a temporary file and
+# renamed into place, so parallel builds sharing a directory only ever read whole entries; any
+# entry that cannot be read is treated as a miss. Reading an entry touches it, and once the
+# directory grows past max_size the least recently used entries are removed.
+class ParseCache(object):
+    def __init__(self, directory, max_size=default_max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            os.makedirs(directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+    @staticmethod
+    def cache_key(input_string, engine, version):
+        if isinstance(input_string, unicode):
+            input_string = input_string.encode("utf-8")
+
+        return hashlib.sha1("{}\0{}\0".format(version, engine) + input_string).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + cache_suffix)
+
+    # Returns the cached document, or None on a miss
+    def get(self, key):
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as entry:
+                document = cPickle.load(entry)
+        except (IOError, OSError, EOFError, cPickle.UnpicklingError, AttributeError, ImportError, IndexError):
+            self.misses += 1
+            return None
+
+        # Another process may have evicted the entry since it was read, which leaves the document no worse
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return document
+
+    def put(self, key, document):
+        entry, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(entry, "wb") as entry_file:
+                cPickle.dump(document, entry_file, cPickle.HIGHEST_PROTOCOL)
+            os.rename(temporary_path, self.entry_path(key))
+        except:
+            os.remove(temporary_path)
+            raise
+
+        self.evict()
+
+    # Removes the least recently used entries until the cache fits in max_size
+    def evict(self):
+        entries = list()
+        for name in os.listdir(self.directory):
+            if not name.endswith(cache_suffix):
+                continue
+            try:
+                status = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                # Removed by another build
+                continue
+            entries.append((status.st_mtime, status.st_size, name))
+
+        total_size = sum(size for modified, size, name in entries)
+        for modified, size, name in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(cache_suffix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
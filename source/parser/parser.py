@@ -1,10 +1,16 @@
 __author__ = 'Paul Dapolito'
 
-from pyparsing import *
+import mmap
+import os
 
 from source.errors.parser.parse_document_error import ParseDocumentError
 from source.errors.parser.parse_text_error import ParseTextError
 
+from source.parser.terminals import newline
+from source.parser.scanner import EasyTeXScanner, default_chunk_size
+from source.parser.header_table import HeaderTable
+from source.parser.text_validator import TextValidator
+
 from source.ir.shared.author import Author
 from source.ir.shared.collaborator import Collaborator
 from source.ir.memorandums.date import Date
@@ -22,192 +28,163 @@ from source.ir.memorandums.content import Content
 from source.ir.memorandums.section import Section
 from source.ir.problem_sets.problem_set import ProblemSet
 from source.ir.memorandums.memorandum import Memorandum
-
-# Terminals
-caps = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-lowers = caps.lower()
-alphas = caps + lowers
-digits = "0123456789"
-symbols = "[]{}()<>\'\"=|.,;\/:-$?!*_+#^`"
-
-space = " "
-newline = "\n"
-tab = 4*space
-whitespace = space + newline + tab
-
-terminals = alphas + digits + symbols + whitespace
-text = ZeroOrMore(Word(terminals)).leaveWhitespace()
-
-# Grammar
-## Author
-author_expr = Suppress(White(tab) + Literal("author:") + White(space)) + restOfLine
-author = author_expr.setResultsName("author")
-
-## Collaborators [Optional]
-collaborators_ignored = Suppress(White(tab) + Literal("collaborators:") + White(space))
-collaborators_expr = collaborators_ignored + restOfLine
-optional_collaborators = Optional(collaborators_expr.setResultsName("collaborators"), default=list())
-
-## Packages [Optional]
-packages_ignored = Suppress(White(tab) + Literal("packages:") + White(space))
-packages_expr = packages_ignored + restOfLine
-optional_packages = Optional(packages_expr.setResultsName("packages"), default=list())
-
-## Date [Optional]
-date_expr = Suppress(White(tab) + Literal("date:") + White(space)) + restOfLine
-optional_date = Optional(date_expr.setResultsName("date"), default=list())
-
-## Title Expressions
-title_expr = Suppress(White(tab) + Literal("title:") + White(space)) + restOfLine
-section_title_expr = Suppress(White(2*tab) + Literal("title:") + White(space)) + restOfLine
-
-## Title [Optional]
-title = title_expr.setResultsName("title")
-
-## Title [Required]
-optional_title = Optional(title_expr.setResultsName("title"), default=list())
-optional_section_title = Optional(section_title_expr.setResultsName("title"), default=list())
-
-## Subtitle [Optional]
-subtitle_expr = Suppress(White(tab) + Literal("subtitle:") + White(space)) + restOfLine
-optional_subtitle = Optional(subtitle_expr.setResultsName("subtitle"), default=list())
-
-## School [Optional]
-school_expr = Suppress(White(tab) + Literal("school:") + White(space)) + restOfLine
-optional_school = Optional(school_expr.setResultsName("school"), default=list())
-
-## Course [Optional]
-course_expr = Suppress(White(tab) + Literal("course:") + White(space)) + restOfLine
-optional_course = Optional(course_expr.setResultsName("course"), default=list())
-
-## Due Date [Optional]
-due_date_expr = Suppress(White(tab) + Literal("due_date:") + White(space)) + restOfLine
-optional_due_date = Optional(due_date_expr.setResultsName("due_date"), default=list())
-
-## Label [Optional]
-label_expr = Suppress(White(2*tab) + Literal("label:") + White(space)) + restOfLine
-optional_label = Optional(label_expr.setResultsName("label"), default=list())
-
-## Statement
-statement_ignored = Suppress(White(2*tab) + Literal("statement:") + White(newline))
-statement_lines = Group(OneOrMore(Regex(ur'(            .+)').leaveWhitespace() + Suppress(White(newline))))
-statement_expr = statement_ignored + statement_lines
-statement = statement_expr.setResultsName("statement")
-
-## Solution
-solution_ignored = Suppress(White(2*tab) + Literal("solution:") + White(newline))
-solution_lines = Group(OneOrMore(Regex(ur'(            .+)').leaveWhitespace() + Suppress(White(newline))))
-solution_expr = solution_ignored + solution_lines
-solution = solution_expr.setResultsName("solution")
-
-## Problem
-problem_ignored = Suppress(White(tab) + Literal("problem:"))
-problem = problem_ignored + Group(optional_label + statement + solution)
-problems_expr = Group(OneOrMore(problem))
-problems = problems_expr.setResultsName("problems")
-
-## Content
-content_ignored = Suppress(White(2*tab) + Literal("content:") + White(newline))
-content_lines = Group(OneOrMore(Regex(ur'(            .+)').leaveWhitespace() + Suppress(White(newline))))
-content_expr = content_ignored + content_lines
-content = content_expr.setResultsName("content")
-
-## Section
-section = Group(Suppress(White(tab) + Literal("section:")) + optional_section_title + content)
-sections_expr = Group(OneOrMore(section))
-sections = sections_expr.setResultsName("sections")
-
-## Problem Set
-problem_set_identifier = Literal("problem_set")
-problem_set_ignored = Suppress(Literal(":"))
-problem_set_headers = author & optional_collaborators & optional_due_date & optional_title & optional_course & optional_school & optional_packages
-problem_set = problem_set_identifier + problem_set_ignored + problem_set_headers + problems
-
-## Memorandum
-memorandum_identifier = Literal("memorandum")
-memorandum_ignored = Suppress(Literal(":"))
-memorandum_headers = author & optional_collaborators & optional_date & title & optional_subtitle & optional_packages
-memorandum = memorandum_identifier + memorandum_ignored + memorandum_headers + sections
-
-## Document
-document = problem_set | memorandum
+from source.ir.easytex_element import EasyTeXElement
+from source.ir.source_span import SourceSpan
+from source.ir.span_text import SpanText
+
+from source.errors.ir.shared.author_error import AuthorError
+from source.errors.ir.shared.collaborator_error import CollaboratorError
+from source.errors.ir.shared.package_error import PackageError
+from source.errors.ir.shared.title_error import TitleError
+from source.errors.ir.memorandums.date_error import DateError
+from source.errors.ir.memorandums.subtitle_error import SubtitleError
+from source.errors.ir.memorandums.content_error import ContentError
+from source.errors.ir.memorandums.section_error import SectionError
+from source.errors.ir.problem_sets.course_error import CourseError
+from source.errors.ir.problem_sets.due_date_error import DueDateError
+from source.errors.ir.problem_sets.school_error import SchoolError
+from source.errors.ir.problem_sets.label_error import LabelError
+from source.errors.ir.problem_sets.statement_error import StatementError
+from source.errors.ir.problem_sets.solution_error import SolutionError
+from source.errors.ir.problem_sets.problem_error import ProblemError
+
+# Errors raised while building IR from a block that scanned correctly
+ir_errors = (AuthorError, CollaboratorError, PackageError, TitleError, DateError, SubtitleError, ContentError,
+             SectionError, CourseError, DueDateError, SchoolError, LabelError, StatementError, SolutionError,
+             ProblemError)
+
+# Parser engines
+pyparsing_engine = "pyparsing"
+scanner_engine = "scanner"
+engines = (pyparsing_engine, scanner_engine)
+
+# Part of every ParseCache key. Bump it whenever parsing or the IR changes, so that documents
+# cached by an older parser are never used.
+parser_version = 1
+
+# Documents with fewer problems or sections than this are parsed serially, since starting worker
+# processes and sending blocks to them costs more than parallel parsing saves
+parallel_block_threshold = 2000
+
+
+# Parses one (block type, first line number, block text) task from parse_parallel_document in a worker
+# process. Errors are returned rather than raised, so the first one in the document can be raised, and
+# as an (error message, line number, column) tuple, since the error classes cannot be pickled.
+def parse_block_task(task):
+    block_type, first_line_number, block_text = task
+    lines = block_text.split(newline)
+    try:
+        scanned_block = EasyTeXScanner().scan_block(block_type, lines, first_line_number)
+        if block_type == "problem":
+            return EasyTeXParser.parse_problem(scanned_block)
+        else:
+            return EasyTeXParser.parse_section(scanned_block)
+    except ir_errors as error:
+        block_error = EasyTeXParser.block_error(error, first_line_number, lines)
+        return block_error.error_message, block_error.line_number, block_error.column
+    except ParseDocumentError as error:
+        return error.error_message, error.line_number, error.column
 
 
 # Parser Implementation
 class EasyTeXParser(object):
+    # pyparsing grammar, shared by every parser once it has been built
+    grammar = None
+
+    # Documents are looked up in (and added to) cache, a ParseCache, when one is given
+    def __init__(self, engine=pyparsing_engine, cache=None):
+        if engine not in engines:
+            raise ParseDocumentError("Unknown parser engine: '{}'".format(engine))
+        self.engine = engine
+        self.cache = cache
+
+    @classmethod
+    def load_grammar(cls):
+        if cls.grammar is None:
+            from source.parser import grammar
+            cls.grammar = grammar
+
+        return cls.grammar
+
     @staticmethod
     def parse_text(input_string):
-        try:
-            parsed_text = text.parseString(input_string)
-        except ParseException as pex:
-            raise ParseTextError("Error parsing text: '{}'. Exception raised: '{}'".format(input_string, pex))
-
-        if parsed_text[0]:
-            return parsed_text[0]
+        # Like pyparsing, tabs are expanded into spaces, so they are valid too. The text is checked
+        # before they are expanded, so that offsets are into the text as given.
+        invalid_characters = [(offset, character) for offset, character in
+                              TextValidator.invalid_characters(input_string) if character != "\t"]
+        if invalid_characters:
+            raise ParseTextError("Error parsing text: invalid character(s) {}".format(", ".join(
+                "{!r} at offset {}".format(character, offset) for offset, character in invalid_characters)),
+                invalid_characters)
+
+        if "\t" in input_string:
+            input_string = input_string.expandtabs()
+        if input_string:
+            return input_string
         else:
             raise ParseTextError("Error parsing text: '{}'".format(input_string))
 
     @staticmethod
-    def parse_author(parsed_block):
-        return Author(parsed_block["author"][0])
+    def parse_author(header_table):
+        return Author(header_table["author"][0])
 
     @staticmethod
-    def parse_collaborators(parsed_block):
-        if parsed_block["collaborators"]:
+    def parse_collaborators(header_table):
+        if header_table["collaborators"]:
             # Split on commas
-            collaborators_split = parsed_block["collaborators"][0].split(", ")
+            collaborators_split = header_table["collaborators"][0].split(", ")
             return [Collaborator(collab) for collab in collaborators_split]
         else:
             return None
 
     @staticmethod
-    def parse_packages(parsed_block):
-        if parsed_block["packages"]:
+    def parse_packages(header_table):
+        if header_table["packages"]:
             # Split on commas
-            packages_split = parsed_block["packages"][0].split(", ")
+            packages_split = header_table["packages"][0].split(", ")
             return [Package(package) for package in packages_split]
         else:
             return None
 
     @staticmethod
-    def parse_due_date(parsed_block):
-        if parsed_block["due_date"]:
-            return DueDate(parsed_block["due_date"][0])
+    def parse_due_date(header_table):
+        if header_table["due_date"]:
+            return DueDate(header_table["due_date"][0])
         else:
             return None
 
     @staticmethod
-    def parse_date(parsed_block):
-        if parsed_block["date"]:
-            return Date(parsed_block["date"][0])
+    def parse_date(header_table):
+        if header_table["date"]:
+            return Date(header_table["date"][0])
         else:
             return None
 
     @staticmethod
-    def parse_title(parsed_block):
-        if parsed_block["title"]:
-            return Title(parsed_block["title"][0])
+    def parse_title(header_table):
+        if header_table["title"]:
+            return Title(header_table["title"][0])
         else:
             return None
 
     @staticmethod
-    def parse_subtitle(parsed_block):
-        if parsed_block["subtitle"]:
-            return Subtitle(parsed_block["subtitle"][0])
+    def parse_subtitle(header_table):
+        if header_table["subtitle"]:
+            return Subtitle(header_table["subtitle"][0])
         else:
             return None
 
     @staticmethod
-    def parse_course(parsed_block):
-        if parsed_block["course"]:
-            return Course(parsed_block["course"][0])
+    def parse_course(header_table):
+        if header_table["course"]:
+            return Course(header_table["course"][0])
         else:
             return None
 
     @staticmethod
-    def parse_school(parsed_block):
-        if parsed_block["school"]:
-            return School(parsed_block["school"][0])
+    def parse_school(header_table):
+        if header_table["school"]:
+            return School(header_table["school"][0])
         else:
             return None
 
@@ -219,67 +196,159 @@ class EasyTeXParser(object):
         else:
             label = None
 
-        # Strip leftmost whitespace from every line of statement and solution
-        statement_stripped = [line.lstrip() for line in problem["statement"][0]]
-        statement_txt = newline.join(statement_stripped)
-        statement = Statement(statement_txt)
+        statement = Statement(EasyTeXParser.parse_body(problem["statement"][0]))
+        solution = Solution(EasyTeXParser.parse_body(problem["solution"][0], "\n"))
 
-        solution_stripped = [line.lstrip() for line in problem["solution"][0]]
-        solution_txt = newline.join(solution_stripped) + "\n"
-        solution = Solution(solution_txt)
+        parsed_problem = Problem(label, statement, solution)
+        if "positions" in problem:
+            EasyTeXParser.set_block_spans(parsed_problem, problem["positions"])
 
-        return Problem(label, statement, solution)
+        return parsed_problem
 
     @staticmethod
     def parse_section(section):
-        title = Title(section["title"][0])
+        # Check for title, which Section requires
+        if section["title"]:
+            title = Title(section["title"][0])
+        else:
+            title = None
+
+        content = Content(EasyTeXParser.parse_body(section["content"][0]))
+
+        parsed_section = Section(title, content)
+        if "positions" in section:
+            EasyTeXParser.set_block_spans(parsed_section, section["positions"])
 
-        # Strip leftmost whitespace from every line of content
-        content_stripped = [line.lstrip() for line in section["content"][0]]
-        content_txt = newline.join(content_stripped)
-        content = Content(content_txt)
+        return parsed_section
+
+    @staticmethod
+    def parse_body(body, suffix=""):
+        # Bodies scanned from a buffer are SpanText already, and are only read when their text is used
+        if isinstance(body, SpanText):
+            body.suffix = suffix
+            return body
+
+        # Strip leftmost whitespace from every line of the body
+        body_stripped = [line.lstrip() for line in body]
+        return newline.join(body_stripped) + suffix
+
+    # Block positions map "problem" or "section" to the block's keyword line, and each of its
+    # fields to the line (or first and last lines) it was read from
+    @staticmethod
+    def set_block_spans(block, positions):
+        spans = list()
+        for field, position in positions.items():
+            span = SourceSpan.of_line(*position) if len(position) == 2 else SourceSpan.of_lines(*position)
+            if field not in ("problem", "section"):
+                getattr(block, field).span = span
+            spans.append(span)
+
+        block.span = SourceSpan.cover(spans)
+
+    # Header fields span their whole line, except for comma-separated lists, where each item
+    # spans its own part of the line
+    @staticmethod
+    def set_header_spans(header_table, fields):
+        for field, parsed_field in fields:
+            if parsed_field is None or field not in header_table.positions:
+                continue
+
+            line_number, line = header_table.positions[field]
+            if type(parsed_field) is list:
+                column = len(line) - len(header_table[field][0]) + 1
+                for item, item_text in zip(parsed_field, header_table[field][0].split(", ")):
+                    item.span = SourceSpan(line_number, column, line_number, column + len(item_text))
+                    column += len(item_text) + len(", ")
+            else:
+                parsed_field.span = SourceSpan.of_line(line_number, line)
+
+    # A document spans its header fields and every problem or section parsed so far
+    @staticmethod
+    def set_document_span(document):
+        spans = list()
+        for value in vars(document).values():
+            for element in value if type(value) is list else [value]:
+                if isinstance(element, EasyTeXElement):
+                    spans.append(element.span)
+
+        document.span = SourceSpan.cover(spans)
+
+    def parse_problem_set_headers(self, header_fields):
+        header_table = HeaderTable("problem_set", header_fields)
+        author = self.parse_author(header_table)
+        collaborators = self.parse_collaborators(header_table)
+        packages = self.parse_packages(header_table)
+        due_date = self.parse_due_date(header_table)
+        title = self.parse_title(header_table)
+        course = self.parse_course(header_table)
+        school = self.parse_school(header_table)
+
+        # Create and return problem set, without any problems yet
+        problem_set = ProblemSet(author, collaborators, due_date, title, course, school, packages, list())
+        self.set_header_spans(header_table, [("author", author), ("collaborators", collaborators),
+                                             ("packages", packages), ("due_date", due_date), ("title", title),
+                                             ("course", course), ("school", school)])
+        self.set_document_span(problem_set)
+        return problem_set
 
-        return Section(title, content)
+    def parse_memorandum_headers(self, header_fields):
+        header_table = HeaderTable("memorandum", header_fields)
+        author = self.parse_author(header_table)
+        collaborators = self.parse_collaborators(header_table)
+        packages = self.parse_packages(header_table)
+        date = self.parse_date(header_table)
+        title = self.parse_title(header_table)
+        subtitle = self.parse_subtitle(header_table)
+
+        # Create and return memorandum, without any sections yet
+        memorandum = Memorandum(author, collaborators, date, title, subtitle, packages, list())
+        self.set_header_spans(header_table, [("author", author), ("collaborators", collaborators),
+                                             ("packages", packages), ("date", date), ("title", title),
+                                             ("subtitle", subtitle)])
+        self.set_document_span(memorandum)
+        return memorandum
 
     def parse_problem_set(self, parsed_block):
-        author = self.parse_author(parsed_block)
-        collaborators = self.parse_collaborators(parsed_block)
-        packages = self.parse_packages(parsed_block)
-        due_date = self.parse_due_date(parsed_block)
-        title = self.parse_title(parsed_block)
-        course = self.parse_course(parsed_block)
-        school = self.parse_school(parsed_block)
+        problem_set = self.parse_problem_set_headers(parsed_block["headers"])
 
         # Accumulate problems
-        problems = list()
         for problem in parsed_block["problems"]:
-            problems.append(self.parse_problem(problem))
+            problem_set.problems.append(self.parse_problem(problem))
 
-        # Create and return problem set
-        problem_set = ProblemSet(author, collaborators, due_date, title, course, school, packages, problems)
+        self.set_document_span(problem_set)
         return problem_set
 
     def parse_memorandum(self, parsed_block):
-        author = self.parse_author(parsed_block)
-        collaborators = self.parse_collaborators(parsed_block)
-        packages = self.parse_packages(parsed_block)
-        date = self.parse_date(parsed_block)
-        title = self.parse_title(parsed_block)
-        subtitle = self.parse_subtitle(parsed_block)
+        memorandum = self.parse_memorandum_headers(parsed_block["headers"])
 
         # Accumulate sections
-        sections = list()
         for section in parsed_block["sections"]:
-            sections.append(self.parse_section(section))
+            memorandum.sections.append(self.parse_section(section))
 
-        # Create and return memorandum
-        memorandum = Memorandum(author, collaborators, date, title, subtitle, packages, sections)
+        self.set_document_span(memorandum)
         return memorandum
 
     def parse_document(self, input_string):
+        if self.cache is None:
+            return self.parse_uncached_document(input_string)
+
+        # Only whole documents that parsed are cached, so a hit skips parsing entirely
+        key = self.cache.cache_key(input_string, self.engine, parser_version)
+        document = self.cache.get(key)
+        if document is None:
+            document = self.parse_uncached_document(input_string)
+            self.cache.put(key, document)
+
+        return document
+
+    def parse_uncached_document(self, input_string):
+        if self.engine == scanner_engine:
+            return self.parse_scanned_document(input_string)
+
+        grammar = self.load_grammar()
         try:
-            indented_block = document.parseString(input_string)
-        except ParseException as pex:
+            indented_block = grammar.document.parseString(input_string)
+        except grammar.ParseException as pex:
             raise ParseDocumentError("Error parsing document. Exception raised: '{}'".format(pex))
 
         if indented_block is None:
@@ -290,3 +359,172 @@ class EasyTeXParser(object):
             return self.parse_problem_set(indented_block)
         else:
             raise ParseDocumentError("Error parsing document: found no indented block!".format(input_string))
+
+    # Parses a document's problems or sections in a pool of worker processes, with the scanner
+    # engine. The document is split at its block keyword lines, the headers are parsed here, and
+    # the blocks are parsed by the workers and put back in source order. Documents with fewer than
+    # parallel_block_threshold blocks, or a single process (by default, one per CPU), are parsed serially.
+    # Errors in blocks, including IR errors, are raised as a ParseDocumentError with their position.
+    def parse_parallel_document(self, input_string, processes=None):
+        scanner = EasyTeXScanner()
+        blocks = scanner.split_blocks(input_string.split(newline))
+        first_block_line = blocks[1][1][0] if len(blocks) > 1 else None
+
+        document_type, header_fields = scanner.scan_header_block(blocks[0][1], first_block_line)
+        if document_type == "problem_set":
+            document = self.parse_problem_set_headers(header_fields)
+            block_type, document_blocks = "problem", document.problems
+        else:
+            document = self.parse_memorandum_headers(header_fields)
+            block_type, document_blocks = "section", document.sections
+
+        # Blocks are sent to workers as one string each, which is cheaper to pickle than their lines
+        tasks = [(block_type, first_line_number, newline.join(lines)) for first_line_number, lines in blocks[1:]]
+        parallel = len(tasks) >= parallel_block_threshold and processes != 1
+        if parallel:
+            import multiprocessing
+            processes = processes or multiprocessing.cpu_count()
+            parallel = processes > 1
+
+        if not parallel:
+            parsed_blocks = map(parse_block_task, tasks)
+        else:
+            pool = multiprocessing.Pool(processes)
+            try:
+                # Send blocks in a few large chunks per worker, rather than one at a time
+                parsed_blocks = pool.map(parse_block_task, tasks, max(1, len(tasks) // (4 * processes)))
+            finally:
+                pool.close()
+                pool.join()
+
+        for parsed_block in parsed_blocks:
+            if type(parsed_block) is tuple:
+                raise ParseDocumentError(*parsed_block)
+            document_blocks.append(parsed_block)
+
+        self.set_document_span(document)
+        return document
+
+    def parse_scanned_document(self, input_string):
+        return self.parse_scanned_block(*EasyTeXScanner().scan_document(input_string))
+
+    # Parses a document straight from a memory-mapped file, with the scanner engine. Statements,
+    # solutions, and content keep only their offsets into the mapping, so their lines are never
+    # held or copied while parsing; their text is copied out when it is used. The mapping stays
+    # open for as long as the IR refers to it.
+    def parse_mapped_document(self, input_file):
+        # Empty files cannot be mapped
+        if os.fstat(input_file.fileno()).st_size == 0:
+            return self.parse_scanned_document("")
+
+        buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        scanner = EasyTeXScanner(buffer)
+        return self.parse_scanned_block(*scanner.scan_document_lines(scanner.map_lines(buffer)))
+
+    def parse_scanned_block(self, document_type, scanned_block):
+        if document_type == "memorandum":
+            return self.parse_memorandum(scanned_block)
+        else:
+            return self.parse_problem_set(scanned_block)
+
+    # Streams a document from a file object: the header IR (a problem set or memorandum without
+    # problems or sections) comes first, followed by each Problem or Section as soon as its block
+    # is complete. Streaming always uses the scanner engine, since pyparsing needs the whole string.
+    def iter_document(self, input_file, chunk_size=default_chunk_size):
+        scanner = EasyTeXScanner()
+        for block_type, block in scanner.scan_lines(scanner.read_lines(input_file, chunk_size)):
+            if block_type == "problem":
+                yield self.parse_problem(block)
+            elif block_type == "section":
+                yield self.parse_section(block)
+            elif block_type == "problem_set":
+                yield self.parse_problem_set_headers(block)
+            else:
+                yield self.parse_memorandum_headers(block)
+
+    def iter_problems(self, input_file, chunk_size=default_chunk_size):
+        return self.iter_document_of_type(ProblemSet, input_file, chunk_size)
+
+    def iter_sections(self, input_file, chunk_size=default_chunk_size):
+        return self.iter_document_of_type(Memorandum, input_file, chunk_size)
+
+    def iter_document_of_type(self, document_type, input_file, chunk_size):
+        blocks = self.iter_document(input_file, chunk_size)
+
+        headers = next(blocks)
+        if type(headers) is not document_type:
+            raise ParseDocumentError("Error parsing document: expected a {} but found a {}!".format(
+                document_type.__name__, type(headers).__name__))
+        yield headers
+
+        for block in blocks:
+            yield block
+
+    # Parses every block that can be parsed, instead of stopping at the first error. After a
+    # malformed block, scanning resyncs at the next 'problem:' or 'section:' line. Returns the
+    # document with every block that parsed (None if its headers did not parse) along with a
+    # ParseDocumentError, with line and column, for every malformed block.
+    def parse_document_with_recovery(self, input_string):
+        # Recovery always scans, so cached documents are looked up as scanned documents
+        if self.cache is not None:
+            key = self.cache.cache_key(input_string, scanner_engine, parser_version)
+            document = self.cache.get(key)
+            if document is not None:
+                return document, list()
+
+        scanner = EasyTeXScanner()
+        blocks = scanner.split_blocks(input_string.split(newline))
+        first_block_line = blocks[1][1][0] if len(blocks) > 1 else None
+        errors = list()
+
+        document = None
+        block_type = "problem"
+        try:
+            document_type, header_fields = scanner.scan_header_block(blocks[0][1], first_block_line)
+            if document_type == "problem_set":
+                document = self.parse_problem_set_headers(header_fields)
+            else:
+                document = self.parse_memorandum_headers(header_fields)
+                block_type = "section"
+        except ParseDocumentError as error:
+            errors.append(error)
+        except ir_errors as error:
+            errors.append(self.block_error(error, 1, blocks[0][1]))
+
+        # Without headers, the first block decides which kind of block to expect
+        if document is None and first_block_line is not None and first_block_line.strip() == "section:":
+            block_type = "section"
+
+        for first_line_number, lines in blocks[1:]:
+            try:
+                scanned_block = scanner.scan_block(block_type, lines, first_line_number)
+                if block_type == "problem":
+                    block = self.parse_problem(scanned_block)
+                else:
+                    block = self.parse_section(scanned_block)
+            except ParseDocumentError as error:
+                errors.append(error)
+                continue
+            except ir_errors as error:
+                errors.append(self.block_error(error, first_line_number, lines))
+                continue
+
+            if type(document) is ProblemSet:
+                document.problems.append(block)
+            elif type(document) is Memorandum:
+                document.sections.append(block)
+
+        if document is not None:
+            self.set_document_span(document)
+        if self.cache is not None and document is not None and not errors:
+            self.cache.put(key, document)
+        return document, errors
+
+    @staticmethod
+    def block_error(error, first_line_number, lines):
+        # IR errors do not know where they came from, so they are reported at the start of their block
+        first_line = next((line for line in lines if line.strip()), lines[0])
+        line_number = first_line_number + lines.index(first_line)
+        column = len(first_line) - len(first_line.lstrip()) + 1
+        return ParseDocumentError("Error parsing document: {} in the block at line {}, column {}".format(
+            error.error_message, line_number, column), line_number, column)
@@ -0,0 +1,324 @@
+__author__ = 'Paul Dapolito'
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+from source.parser.terminals import space, newline, tab
+
+from source.ir.span_text import SpanText
+
+# Statement, solution, and content lines are indented by three tabs
+body_indentation = 3*tab
+
+# Number of characters read at a time when scanning from a file object
+default_chunk_size = 64*1024
+
+# Document identifiers
+problem_set_identifier = "problem_set:"
+memorandum_identifier = "memorandum:"
+
+# Block keywords
+problem_keyword = "problem:"
+label_keyword = "label:"
+statement_keyword = "statement:"
+solution_keyword = "solution:"
+section_keyword = "section:"
+title_keyword = "title:"
+content_keyword = "content:"
+
+# Scanner states
+expect_identifier = "identifier"
+expect_headers = "headers"
+expect_problem = "problem"
+expect_statement = "statement"
+expect_solution = "solution"
+expect_section = "section"
+expect_content = "content"
+in_statement = "statement body"
+in_solution = "solution body"
+in_content = "content body"
+
+# Body that each body state reads
+body_names = {in_statement: "statement", in_solution: "solution", in_content: "content"}
+
+# What each scanner state expects next, for error messages
+expectations = {
+    expect_identifier: "'problem_set:' or 'memorandum:'",
+    expect_headers: "an indented header field",
+    expect_problem: "'problem:'",
+    expect_statement: "'label:' or 'statement:'",
+    expect_solution: "'solution:'",
+    expect_section: "'section:'",
+    expect_content: "'title:' or 'content:'",
+    in_statement: "statement lines indented by three tabs",
+    in_solution: "solution lines indented by three tabs",
+    in_content: "content lines indented by three tabs"
+}
+
+
+# Single-pass, indentation-aware alternative to the pyparsing grammar. Every line is looked at
+# exactly once, so scanning time is linear in the size of the input. The blocks it yields have
+# the same shape as the pyparsing results, so EasyTeXParser builds the IR from either engine
+# with the same parse_* methods. Every block also gets a "positions" entry with the (line number,
+# line) of its keyword line and fields, and the first and last lines of each body.
+#
+# A scanner given the buffer that its lines come from (such as a memory-mapped file) does not
+# keep body lines: each body is yielded as a SpanText over the buffer instead.
+class EasyTeXScanner(object):
+    def __init__(self, buffer=None):
+        self.buffer = buffer
+
+    @staticmethod
+    def scan_error(message, line_number, line):
+        column = len(line) - len(line.lstrip(space)) + 1
+        return ParseDocumentError("Error parsing document: {} at line {}, column {}: '{}'".format(
+            message, line_number, column, line), line_number, column)
+
+    @staticmethod
+    def is_blank(line):
+        return line.strip() == ""
+
+    @staticmethod
+    def is_indented(line):
+        return line.startswith(space)
+
+    @staticmethod
+    def is_body_line(line):
+        # Statement, solution, and content lines are indented by three tabs and are not empty
+        return line.startswith(body_indentation) and len(line) > len(body_indentation)
+
+    @staticmethod
+    def is_keyword_line(line, keyword):
+        return line.startswith(space) and line.strip() == keyword
+
+    @staticmethod
+    def scan_field(line, keyword=None):
+        # Fields look like "key: value", where the value is everything after the run of spaces
+        key, separator, value = line.lstrip(space).partition(":")
+        if not separator or not value.startswith(space) or (keyword is not None and key + ":" != keyword):
+            return None
+
+        return key, value.lstrip(space)
+
+    # Yields the lines of a file object, reading it in chunks rather than all at once. The lines
+    # are the same as input_string.split(newline) would give for the whole file.
+    @staticmethod
+    def read_lines(input_file, chunk_size=default_chunk_size):
+        partial_line = list()
+        for chunk in iter(lambda: input_file.read(chunk_size), ""):
+            if newline not in chunk:
+                partial_line.append(chunk)
+                continue
+
+            lines = chunk.split(newline)
+            partial_line.append(lines[0])
+            yield "".join(partial_line)
+            for line in lines[1:-1]:
+                yield line
+            partial_line = [lines[-1]]
+
+        yield "".join(partial_line)
+
+    # Yields the lines of a buffer, such as a memory-mapped file, without splitting it all at once.
+    # The lines are the same as buffer.split(newline) would give.
+    @staticmethod
+    def map_lines(buffer):
+        start = 0
+        end = buffer.find(newline)
+        while end != -1:
+            yield buffer[start:end]
+            start = end + 1
+            end = buffer.find(newline, start)
+
+        yield buffer[start:]
+
+    # Yields (document type, header fields) once the headers are complete, followed by
+    # ("problem", problem) or ("section", section) as soon as each block is complete. Scanning
+    # starts at the document identifier unless another starting state is given. SpanText offsets
+    # are counted from first_offset, the offset of the first line in the buffer.
+    def scan_lines(self, lines, state=expect_identifier, first_line_number=1, first_offset=0):
+        identifier = None
+        header_fields = list()
+        block = None
+        body = None
+        body_first_line = None
+        body_last_line = None
+        blocks_scanned = 0
+        line_number = 0
+        line = ""
+        next_offset = first_offset
+
+        for line_number, line in enumerate(lines, first_line_number):
+            offset = next_offset
+            next_offset += len(line) + 1
+
+            # Body lines continue until the first line that is neither a body line nor blank. Unlike
+            # the pyparsing grammar, whitespace-only lines do not silently end the body.
+            if state in (in_statement, in_solution, in_content):
+                if self.is_body_line(line) and not self.is_blank(line):
+                    if body_first_line is None:
+                        body_first_line = (line_number, line)
+                    body_last_line = (line_number, line)
+
+                    if self.buffer is None:
+                        body.append(line)
+                    else:
+                        body.end = offset + len(line)
+                    continue
+                elif self.is_blank(line):
+                    continue
+                elif body_first_line is None:
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+
+                block["positions"][body_names[state]] = body_first_line + body_last_line
+
+                if state == in_statement:
+                    state = expect_solution
+                elif state == in_solution:
+                    blocks_scanned += 1
+                    yield "problem", block
+                    state = expect_problem
+                else:
+                    blocks_scanned += 1
+                    yield "section", block
+                    state = expect_section
+
+            if self.is_blank(line):
+                continue
+
+            if state == expect_identifier:
+                if line.strip() not in (problem_set_identifier, memorandum_identifier):
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+                identifier = line.strip()
+                state = expect_headers
+
+            elif state == expect_headers:
+                block_keyword = problem_keyword if identifier == problem_set_identifier else section_keyword
+                if self.is_keyword_line(line, block_keyword):
+                    yield identifier[:-1], header_fields
+                    state = expect_problem if identifier == problem_set_identifier else expect_section
+                else:
+                    field = self.scan_field(line)
+                    if field is None or not self.is_indented(line):
+                        raise self.scan_error("expected an indented header field or '{}'".format(block_keyword),
+                                              line_number, line)
+                    header_fields.append(field + (line_number, line))
+                    continue
+
+            if state == expect_problem:
+                if not self.is_keyword_line(line, problem_keyword):
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+                block = {"label": list(), "positions": {"problem": (line_number, line)}}
+                state = expect_statement
+
+            elif state == expect_statement:
+                label = self.scan_field(line, label_keyword)
+                if label is not None and self.is_indented(line) and not block["label"]:
+                    block["label"] = [label[1]]
+                    block["positions"]["label"] = (line_number, line)
+                elif self.is_keyword_line(line, statement_keyword):
+                    body, body_first_line = self.start_body(next_offset), None
+                    block["statement"] = [body]
+                    state = in_statement
+                else:
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+
+            elif state == expect_solution:
+                if not self.is_keyword_line(line, solution_keyword):
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+                body, body_first_line = self.start_body(next_offset), None
+                block["solution"] = [body]
+                state = in_solution
+
+            elif state == expect_section:
+                if not self.is_keyword_line(line, section_keyword):
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+                block = {"title": list(), "positions": {"section": (line_number, line)}}
+                state = expect_content
+
+            elif state == expect_content:
+                title = self.scan_field(line, title_keyword)
+                if title is not None and self.is_indented(line) and not block["title"]:
+                    block["title"] = [title[1]]
+                    block["positions"]["title"] = (line_number, line)
+                elif self.is_keyword_line(line, content_keyword):
+                    body, body_first_line = self.start_body(next_offset), None
+                    block["content"] = [body]
+                    state = in_content
+                else:
+                    raise self.scan_error("expected " + expectations[state], line_number, line)
+
+        # Close the final block
+        if state in (in_solution, in_content) and body_first_line is not None:
+            block["positions"][body_names[state]] = body_first_line + body_last_line
+
+        if state == in_solution and body_first_line is not None:
+            blocks_scanned += 1
+            yield "problem", block
+            state = expect_problem
+        elif state == in_content and body_first_line is not None:
+            blocks_scanned += 1
+            yield "section", block
+            state = expect_section
+
+        if state not in (expect_problem, expect_section) or blocks_scanned == 0:
+            raise self.scan_error("unexpected end of document, expected " + expectations[state], line_number, line)
+
+    # Starts an empty body whose lines begin at offset
+    def start_body(self, offset):
+        if self.buffer is None:
+            return list()
+        return SpanText(self.buffer, offset, offset)
+
+    # Scans a whole document into a (document type, parsed block) pair
+    def scan_document(self, input_string):
+        return self.scan_document_lines(input_string.split(newline))
+
+    def scan_document_lines(self, lines):
+        document_type = None
+        parsed_block = None
+
+        for block_type, block in self.scan_lines(lines):
+            if block_type == "problem":
+                parsed_block["problems"].append(block)
+            elif block_type == "section":
+                parsed_block["sections"].append(block)
+            else:
+                document_type = block_type
+                parsed_block = {"headers": block, "problems": list(), "sections": list()}
+
+        return document_type, parsed_block
+
+    # Splits a document's lines at every top-level 'problem:' or 'section:' line. Returns a list of
+    # (first line number, lines) pairs: the header block first, then one entry per problem or section.
+    # Bodies are followed the same way scan_lines follows them, so a statement, solution, or content
+    # line that reads 'problem:' or 'section:' stays in its block.
+    def split_blocks(self, lines):
+        blocks = [(1, list())]
+        in_body = False
+        for line_number, line in enumerate(lines, 1):
+            if in_body and (self.is_body_line(line) or self.is_blank(line)):
+                blocks[-1][1].append(line)
+                continue
+
+            in_body = any(self.is_keyword_line(line, keyword)
+                          for keyword in (statement_keyword, solution_keyword, content_keyword))
+            if self.is_keyword_line(line, problem_keyword) or self.is_keyword_line(line, section_keyword):
+                blocks.append((line_number, list()))
+            blocks[-1][1].append(line)
+
+        return blocks
+
+    # Scans the header block from split_blocks. The headers are complete as soon as the first block
+    # starts, so that block's first line is passed in too when there is one.
+    def scan_header_block(self, lines, first_block_line=None):
+        if first_block_line is not None:
+            lines = lines + [first_block_line]
+
+        return next(self.scan_lines(lines))
+
+    # Scans one problem or section block from split_blocks
+    def scan_block(self, block_type, lines, first_line_number):
+        state = expect_problem if block_type == "problem" else expect_section
+        scanned_blocks = list(self.scan_lines(lines, state, first_line_number))
+
+        return scanned_blocks[0][1]
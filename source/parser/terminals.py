@@ -0,0 +1,15 @@
+__author__ = 'Paul Dapolito'
+
+# Terminals
+caps = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+lowers = caps.lower()
+alphas = caps + lowers
+digits = "0123456789"
+symbols = "[]{}()<>\'\"=|.,;\/:-$?!*_+#^`"
+
+space = " "
+newline = "\n"
+tab = 4*space
+whitespace = space + newline + tab
+
+terminals = alphas + digits + symbols + whitespace
@@ -0,0 +1,33 @@
+__author__ = 'Paul Dapolito'
+
+from source.parser.terminals import terminals
+
+# Translation tables that delete every terminal, built once. Translating valid text leaves an empty string.
+byte_deletions = terminals
+unicode_deletions = dict((ord(terminal), None) for terminal in terminals)
+
+
+# Checks that text is made only of terminals, without building any pyparsing tokens. The check
+# itself is one str.translate over the buffer; offsets are only looked for once it has failed.
+class TextValidator(object):
+    # Returns the characters of input_string that are not terminals, in order
+    @staticmethod
+    def strip_terminals(input_string):
+        if isinstance(input_string, unicode):
+            return input_string.translate(unicode_deletions)
+        return input_string.translate(None, byte_deletions)
+
+    # Returns an (offset, character) pair for every character that is not a terminal
+    @staticmethod
+    def invalid_characters(input_string):
+        invalid_characters = list()
+
+        # Only the characters left over by translate are searched for
+        for character in set(TextValidator.strip_terminals(input_string)):
+            offset = input_string.find(character)
+            while offset != -1:
+                invalid_characters.append((offset, character))
+                offset = input_string.find(character, offset + 1)
+
+        invalid_characters.sort()
+        return invalid_characters
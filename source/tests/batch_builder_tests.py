@@ -0,0 +1,63 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.build.batch_builder import BatchBuilder
+from source.interpreters.interpreter import html_format
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXBatchBuilderTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        for folder in ["problem_sets/full_problem_set_1", "problem_sets/full_problem_set_2",
+                       "memorandums/full_memorandum_1"]:
+            name = os.path.basename(folder)
+            shutil.copy(os.path.join(base_path, "test_text_files", folder, name + ".txt"), self.directory)
+        with open(os.path.join(self.directory, "invalid.txt"), "w") as invalid_file:
+            invalid_file.write("problem_set:\n    author:\n")
+
+        self.batch_builder = BatchBuilder(jobs=2, output_format=html_format)
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    ## Test that directories and glob patterns are expanded in order, without repeats
+    def test_that_inputs_are_expanded(self):
+        input_file_names = BatchBuilder.expand_inputs([self.path("full_problem_set_2.txt"), self.directory,
+                                                       self.path("full_problem_set_*.txt")])
+
+        self.assertEqual([self.path(name) for name in ["full_problem_set_2.txt", "full_memorandum_1.txt",
+                                                       "full_problem_set_1.txt", "invalid.txt"]],
+                         input_file_names)
+
+    ## Test that every input is built, and that one failure does not stop the others
+    def test_that_every_input_is_built(self):
+        input_file_names = BatchBuilder.expand_inputs([self.directory])
+        reported_file_names = list()
+        results = self.batch_builder.build(input_file_names, lambda result: reported_file_names.append(result[0]))
+
+        self.assertEqual(input_file_names, [result[0] for result in results])
+        self.assertEqual(sorted(input_file_names), sorted(reported_file_names))
+        self.assertEqual([True, True, True, False], [result[1] for result in results])
+        for name in ["full_memorandum_1", "full_problem_set_1", "full_problem_set_2"]:
+            self.assertTrue(os.path.exists(self.path(name + ".html")))
+
+    ## Test that the summary has a line for every input and the errors of failed ones
+    def test_that_the_summary_reports_failures(self):
+        results = self.batch_builder.build(BatchBuilder.expand_inputs([self.directory]))
+        summary = BatchBuilder.summary(results)
+
+        for input_file_name in BatchBuilder.expand_inputs([self.directory]):
+            self.assertIn(input_file_name, summary)
+        self.assertIn("Could not parse input file: found 1 error(s).", summary)
+        self.assertIn("3 of 4 file(s) built successfully.", summary)
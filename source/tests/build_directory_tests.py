@@ -0,0 +1,127 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import errno
+import os
+import shutil
+import stat
+import tempfile
+
+from source.build.builder import EasyTeXBuilder, default_build_directory, hmcpset_path, built_status, \
+    up_to_date_status
+from source.build.toolchain import ToolchainCache
+
+base_path = os.path.dirname(__file__)
+
+# Stands in for pdflatex: checks that hmcpset.cls is found through TEXINPUTS, and writes the .aux,
+# .log (naming the program run), and PDF files to the output directory
+pdflatex_script = """#!/bin/sh
+test "$1" = -v && exit 0
+for argument in "$@"; do
+    case "$argument" in
+        -output-directory=*) output_directory="${argument#*=}";;
+        -*) ;;
+        *) tex_file_name="$argument";;
+    esac
+done
+test -e "${TEXINPUTS%%:*}/hmcpset.cls" || exit 1
+stem=$(basename "$tex_file_name" .tex)
+echo relax > "$output_directory/$stem.aux"
+echo "This is pdfTeX, run as $0" > "$output_directory/$stem.log"
+echo %PDF > "$output_directory/$stem.pdf"
+"""
+
+
+class EasyTeXBuildDirectoryTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.build_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.build_directory)
+
+        self.input_directory = os.path.join(self.directory, "documents")
+        os.mkdir(self.input_directory)
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        self.input_file_name = os.path.join(self.input_directory, "problem_set.txt")
+        shutil.copy(folder_path + "full_problem_set_2.txt", self.input_file_name)
+
+        bin_directory = os.path.join(self.directory, "bin")
+        os.mkdir(bin_directory)
+        self.pdflatex_file_name = os.path.join(bin_directory, "pdflatex")
+        with open(self.pdflatex_file_name, "w") as pdflatex_file:
+            pdflatex_file.write(pdflatex_script)
+        os.chmod(self.pdflatex_file_name, 0755)
+
+        path = os.environ["PATH"]
+        self.addCleanup(os.environ.__setitem__, "PATH", path)
+        os.environ["PATH"] = bin_directory + os.pathsep + path
+
+        toolchain_cache = ToolchainCache(os.path.join(self.directory, "toolchain.json"))
+        self.builder = EasyTeXBuilder(open_viewer=False, verbose=False, build_directory=self.build_directory,
+                                      toolchain_cache=toolchain_cache)
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that the default build directory is private to the user and reused
+    def test_that_the_default_build_directory_is_private(self):
+        build_directory = default_build_directory()
+
+        self.assertEqual(0700, stat.S_IMODE(os.stat(build_directory).st_mode))
+        self.assertEqual(os.getuid(), os.stat(build_directory).st_uid)
+        self.assertEqual(build_directory, default_build_directory())
+
+    ## Test that only the LaTeX file and the PDF are left next to the input
+    def test_that_inputs_are_built_in_scratch_directories(self):
+        self.assertTrue(self.builder.build(self.input_file_name))
+
+        self.assertEqual(built_status, self.builder.status, self.builder.messages)
+        self.assertEqual(["problem_set.pdf", "problem_set.tex", "problem_set.txt"],
+                         sorted(os.listdir(self.input_directory)))
+        self.assertNotEqual(os.path.dirname(hmcpset_path), self.input_directory)
+
+        job_directory = self.builder.job_directory(self.input_file_name)
+        self.assertTrue(os.path.exists(os.path.join(job_directory, "problem_set.aux")))
+        self.assertTrue(os.path.exists(os.path.join(job_directory, "problem_set.log")))
+
+    ## Test that a document keeps its scratch directory, and its build record, between builds
+    def test_that_scratch_directories_are_reused(self):
+        self.assertTrue(self.builder.build(self.input_file_name))
+        self.assertTrue(self.builder.build(self.input_file_name))
+
+        self.assertEqual(up_to_date_status, self.builder.status)
+        self.assertEqual(1, len(os.listdir(self.build_directory)))
+
+    ## Test that inputs with the same name in different directories get different scratch directories
+    def test_that_scratch_directories_do_not_clash(self):
+        other_directory = os.path.join(self.directory, "other")
+        os.mkdir(other_directory)
+        other_input_file_name = os.path.join(other_directory, "problem_set.txt")
+        shutil.copy(self.input_file_name, other_input_file_name)
+
+        self.assertNotEqual(self.builder.job_directory(self.input_file_name),
+                            self.builder.job_directory(other_input_file_name))
+
+    ## Test that pdflatex is run from where the toolchain probe found it, not looked up on PATH again
+    def test_that_the_probed_pdflatex_is_run(self):
+        self.assertTrue(self.builder.build(self.input_file_name))
+
+        log_file_name = os.path.join(self.builder.job_directory(self.input_file_name), "problem_set.log")
+        self.assertEqual("This is pdfTeX, run as {}\n".format(self.pdflatex_file_name), open(log_file_name).read())
+
+    ## Test that a PDF published from another file system is not also left in the scratch directory
+    def test_that_copied_pdfs_leave_the_scratch_directory(self):
+        rename = os.rename
+        self.addCleanup(setattr, os, "rename", rename)
+
+        def rename_across_file_systems(source, destination):
+            if source.startswith(self.build_directory) != destination.startswith(self.build_directory):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            rename(source, destination)
+
+        os.rename = rename_across_file_systems
+        self.assertTrue(self.builder.build(self.input_file_name))
+
+        self.assertTrue(os.path.exists(os.path.join(self.input_directory, "problem_set.pdf")))
+        self.assertFalse(os.path.exists(os.path.join(self.builder.job_directory(self.input_file_name),
+                                                     "problem_set.pdf")))
@@ -0,0 +1,83 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.build.atomic_file import AtomicFile
+from source.build.build_manifest import BuildManifest
+
+
+class EasyTeXBuildManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.tex_file_name = os.path.join(self.directory, "problem_set.tex")
+        self.pdf_file_name = os.path.join(self.directory, "problem_set.pdf")
+        self.class_file_name = os.path.join(self.directory, "hmcpset.cls")
+        AtomicFile.write_text(self.tex_file_name, "\\begin{document}\\end{document}\n")
+        AtomicFile.write_text(self.class_file_name, "\\ProvidesClass{hmcpset}\n")
+
+        self.manifest = BuildManifest(BuildManifest.manifest_file_name_for(os.path.join(self.directory,
+                                                                                       "problem_set")))
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def build_inputs(self, packages=None):
+        return BuildManifest.build_inputs([self.tex_file_name], self.class_file_name, packages or ["amsmath"])
+
+    # Records a build, with a PDF made after the .tex file
+    def record_build(self):
+        self.manifest.record(self.build_inputs())
+        AtomicFile.write_text(self.pdf_file_name, "%PDF-1.4\n")
+        os.utime(self.tex_file_name, (0, 0))
+
+    ## Test that a file is only replaced when its contents change
+    def test_that_unchanged_files_are_not_replaced(self):
+        os.utime(self.tex_file_name, (0, 0))
+
+        self.assertFalse(AtomicFile.write_text(self.tex_file_name, "\\begin{document}\\end{document}\n"))
+        self.assertEqual(0, os.path.getmtime(self.tex_file_name))
+        self.assertTrue(AtomicFile.write_text(self.tex_file_name, "\\begin{document}Edited\\end{document}\n"))
+        self.assertEqual("\\begin{document}Edited\\end{document}\n", open(self.tex_file_name).read())
+
+    ## Test that a failed write leaves the old file in place and no temporary files behind
+    def test_that_failed_writes_leave_the_old_file(self):
+        try:
+            with AtomicFile(self.tex_file_name) as output_file:
+                output_file.write("\\begin{document}")
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        self.assertEqual("\\begin{document}\\end{document}\n", open(self.tex_file_name).read())
+        self.assertEqual(["hmcpset.cls", "problem_set.tex"], sorted(os.listdir(self.directory)))
+
+    ## Test that a build with the same inputs and a newer PDF is up to date
+    def test_that_unchanged_builds_are_up_to_date(self):
+        self.record_build()
+
+        reloaded_manifest = BuildManifest(self.manifest.manifest_file_name)
+        self.assertTrue(reloaded_manifest.is_up_to_date(self.build_inputs(), self.tex_file_name, self.pdf_file_name))
+
+    ## Test that changing the .tex file, the class file, or the packages needs a new build
+    def test_that_changed_inputs_are_not_up_to_date(self):
+        self.record_build()
+
+        self.assertFalse(self.manifest.is_up_to_date(self.build_inputs(["amsmath", "graphicx"]), self.tex_file_name,
+                                                     self.pdf_file_name))
+        AtomicFile.write_text(self.class_file_name, "\\ProvidesClass{hmcpset}[edited]\n")
+        self.assertFalse(self.manifest.is_up_to_date(self.build_inputs(), self.tex_file_name, self.pdf_file_name))
+
+    ## Test that a missing PDF, or one older than the .tex file, needs a new build
+    def test_that_missing_or_old_pdfs_are_not_up_to_date(self):
+        self.record_build()
+        os.utime(self.pdf_file_name, (0, 0))
+        os.utime(self.tex_file_name, None)
+        self.assertFalse(self.manifest.is_up_to_date(self.build_inputs(), self.tex_file_name, self.pdf_file_name))
+
+        os.remove(self.pdf_file_name)
+        self.assertFalse(self.manifest.is_up_to_date(self.build_inputs(), self.tex_file_name, self.pdf_file_name))
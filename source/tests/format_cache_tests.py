@@ -0,0 +1,166 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from source.build.atomic_file import AtomicFile
+from source.build.format_cache import FormatCache, FormatCompiler
+from source.errors.build.compile_error import CompileError
+from source.tests.pdf_compiler_tests import script_compiler
+
+pdflatex_version = "pdfTeX 3.14159265-2.6-1.40.21"
+preamble = "\\documentclass[11pt,letterpaper,boxed]{hmcpset}\n\\usepackage{amsmath}\n"
+
+
+# Runs a shell script in place of pdflatex -ini, with the output directory and preamble file as $1
+# and $2, and counts its runs in the file $3
+def script_format_cache(script, count_file_name):
+    class ScriptFormatCompiler(FormatCompiler):
+        @staticmethod
+        def pdflatex_command(tex_file_name, output_directory, format_name=None, draft=False, pdflatex_path=None):
+            return ["sh", "-c", "echo >> \"$3\"; " + script, "pdflatex", output_directory, tex_file_name,
+                    count_file_name]
+
+    class ScriptFormatCache(FormatCache):
+        compiler = ScriptFormatCompiler
+
+    return ScriptFormatCache
+
+
+# Stands in for a semaphore, recording when it is acquired and released
+class RecordingSlots(object):
+    def __init__(self):
+        self.events = list()
+
+    def acquire(self):
+        self.events.append("acquire")
+
+    def release(self):
+        self.events.append("release")
+
+
+class EasyTeXFormatCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.cache_directory = os.path.join(self.directory, "formats")
+        self.count_file_name = os.path.join(self.directory, "runs")
+        self.class_file_name = os.path.join(self.directory, "hmcpset.cls")
+        AtomicFile.write_text(self.class_file_name, "\\ProvidesClass{hmcpset}\n")
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def format_cache(self, script="cp \"$2\" \"$1/$(basename \"$2\" .tex).fmt\"", max_formats=16):
+        return script_format_cache(script, self.count_file_name)(self.cache_directory, max_formats)
+
+    def dump_count(self):
+        if not os.path.exists(self.count_file_name):
+            return 0
+        return len(open(self.count_file_name).readlines())
+
+    ## Test that the key changes with the package list, the class file, and the pdflatex version
+    def test_that_keys_change_with_their_inputs(self):
+        key = FormatCache.format_key(preamble, self.class_file_name, pdflatex_version)
+
+        self.assertEqual(key, FormatCache.format_key(preamble, self.class_file_name, pdflatex_version))
+        self.assertNotEqual(key, FormatCache.format_key(preamble + "\\usepackage{graphicx}\n", self.class_file_name,
+                                                        pdflatex_version))
+        self.assertNotEqual(key, FormatCache.format_key(preamble, self.class_file_name, "pdfTeX 3.141592653"))
+
+        AtomicFile.write_text(self.class_file_name, "\\ProvidesClass{hmcpset}[2015/01/01]\n")
+        self.assertNotEqual(key, FormatCache.format_key(preamble, self.class_file_name, pdflatex_version))
+
+    ## Test that a format is dumped from the preamble once, and then reused
+    def test_that_formats_are_dumped_once(self):
+        format_cache = self.format_cache()
+        format_file_name = format_cache.format_for(preamble, self.class_file_name, pdflatex_version)
+
+        self.assertTrue(open(format_file_name).read().startswith(preamble))
+        self.assertTrue(open(format_file_name).read().endswith("\\dump\n"))
+        self.assertEqual(format_file_name, format_cache.format_for(preamble, self.class_file_name, pdflatex_version))
+        self.assertEqual(1, self.dump_count())
+
+        format_cache.format_for(preamble + "\\usepackage{graphicx}\n", self.class_file_name, pdflatex_version)
+        self.assertEqual(2, self.dump_count())
+
+    ## Test that a failed dump is raised, and leaves nothing in the cache
+    def test_that_failed_dumps_leave_nothing_behind(self):
+        format_cache = self.format_cache("exit 1")
+
+        with self.assertRaises(CompileError):
+            format_cache.format_for(preamble, self.class_file_name, pdflatex_version)
+        self.assertEqual([], os.listdir(self.cache_directory))
+
+    ## Test that pdflatex can find the class file in its own directory
+    def test_that_the_class_directory_is_searched(self):
+        format_cache = self.format_cache("test \"${TEXINPUTS%%:*}\" = \"" + self.directory + "\" && "
+                                         "touch \"$1/$(basename \"$2\" .tex).fmt\"")
+
+        format_cache.format_for(preamble, self.class_file_name, pdflatex_version)
+
+    ## Test that only the most recently used formats are kept
+    def test_that_old_formats_are_evicted(self):
+        format_cache = self.format_cache()
+        format_file_names = [format_cache.format_for(preamble + "%" + str(index) + "\n", self.class_file_name,
+                                                     pdflatex_version) for index in range(3)]
+        for index, format_file_name in enumerate(format_file_names):
+            os.utime(format_file_name, (index, index))
+        format_cache.max_formats = 2
+        format_cache.evict()
+
+        self.assertEqual([False, True, True], [os.path.exists(name) for name in format_file_names])
+
+    ## Test that documents are compiled from the format they are given
+    def test_that_compiles_use_the_format(self):
+        format_file_name = self.format_cache().format_for(preamble, self.class_file_name, pdflatex_version)
+        tex_file_name = os.path.join(self.directory, "problem_set.tex")
+        open(tex_file_name, "w").close()
+        compiler = script_compiler("test \"$3\" = \"" + os.path.splitext(os.path.basename(format_file_name))[0] +
+                                   "\" && test -e \"${TEXFORMATS%%:*}/$3.fmt\" && "
+                                   "echo '%PDF' > \"$1/problem_set.pdf\"")
+
+        compiler.compile(tex_file_name, self.directory, 10, format_file_name=format_file_name)
+
+    ## Test that builds needing the same format at once wait for one dump, and leave no lock behind
+    def test_that_concurrent_builds_dump_once(self):
+        format_cache = self.format_cache("sleep 0.2; cp \"$2\" \"$1/$(basename \"$2\" .tex).fmt\"")
+        format_file_names = list()
+        threads = [threading.Thread(target=lambda: format_file_names.append(
+            format_cache.format_for(preamble, self.class_file_name, pdflatex_version))) for index in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, self.dump_count())
+        self.assertEqual(3 * format_file_names[:1], format_file_names)
+        self.assertEqual([os.path.basename(format_file_names[0])], os.listdir(self.cache_directory))
+
+    ## Test that a compile slot is held while a format is dumped, and not for a cached format
+    def test_that_dumps_hold_a_compile_slot(self):
+        format_cache = self.format_cache()
+        compile_slots = RecordingSlots()
+
+        format_cache.format_for(preamble, self.class_file_name, pdflatex_version, compile_slots=compile_slots)
+        format_cache.format_for(preamble, self.class_file_name, pdflatex_version, compile_slots=compile_slots)
+        self.assertEqual(["acquire", "release"], compile_slots.events)
+
+    ## Test that dumps are run with the limits they are given, including none at all
+    def test_that_dumps_use_their_limits(self):
+        format_cache = self.format_cache("echo \"$(ulimit -t) $(ulimit -v)\" > \"$1/$(basename \"$2\" .tex).fmt\"")
+
+        format_file_name = format_cache.format_for(preamble, self.class_file_name, pdflatex_version,
+                                                   cpu_timeout=30, memory_limit=256*1024*1024)
+        self.assertEqual("30 262144\n", open(format_file_name).read())
+
+        format_file_name = format_cache.format_for(preamble + "%\n", self.class_file_name, pdflatex_version,
+                                                   cpu_timeout=None, memory_limit=None)
+        # Without limits, the dump keeps this process's own
+        self.assertEqual(subprocess.check_output(["sh", "-c", "echo \"$(ulimit -t) $(ulimit -v)\""]),
+                         open(format_file_name).read())
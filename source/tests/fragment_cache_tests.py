@@ -0,0 +1,93 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from StringIO import StringIO
+
+from source.parser.parser import EasyTeXParser
+from source.interpreters.interpreter import EasyTeXInterpreter, html_format
+from source.interpreters.fragment_cache import FragmentCache
+from source.build.builder import EasyTeXBuilder
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXFragmentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser()
+        self.interpreter = EasyTeXInterpreter()
+        self.fragment_cache = FragmentCache()
+
+        self.default_fragment_cache = self.interpreter.fragment_cache()
+        self.interpreter.set_fragment_cache(self.fragment_cache)
+        self.addCleanup(self.interpreter.set_fragment_cache, self.default_fragment_cache)
+
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        self.input_string = open(folder_path + "full_problem_set_2.txt").read()
+        self.expected_tex = open(folder_path + "full_problem_set_2.tex").read()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that cached fragments are stitched back into the same LaTeX
+    def test_that_cached_fragments_give_the_same_latex(self):
+        parsed_problem_set = self.parser.parse_document(self.input_string)
+
+        self.assertEqual(self.expected_tex, self.interpreter.interpret_document(parsed_problem_set))
+        self.assertEqual(self.expected_tex, self.interpreter.interpret_document(parsed_problem_set))
+        self.assertEqual({"hits": 2, "misses": 2, "fragments": 2, "size": self.fragment_cache.size},
+                         self.fragment_cache.statistics())
+
+    ## Test that only the edited problem is rendered again
+    def test_that_only_edited_problems_are_rendered_again(self):
+        self.interpreter.interpret_document(self.parser.parse_document(self.input_string))
+
+        before, separator, after = self.input_string.rpartition("QED.")
+        edited_problem_set = self.parser.parse_document(before + "Q.E.D." + after)
+        self.interpreter.set_fragment_cache(None)
+        expected_tex = self.interpreter.interpret_document(edited_problem_set)
+        self.interpreter.set_fragment_cache(self.fragment_cache)
+
+        self.assertEqual(expected_tex, self.interpreter.interpret_document(edited_problem_set))
+        self.assertEqual((1, 3), (self.fragment_cache.hits, self.fragment_cache.misses))
+
+    ## Test that the least recently used fragments are evicted once the cache is full
+    def test_that_least_recently_used_fragments_are_evicted(self):
+        self.fragment_cache.resize(len("first") + len("second"))
+        for text in ["first", "second", "first", "third"]:
+            self.fragment_cache.write_fragment(("text", text), lambda output: output.write(text), StringIO())
+
+        self.assertEqual([self.fragment_cache.fragment_key(("text", text)) for text in ["first", "third"]],
+                         self.fragment_cache.fragments.keys())
+
+    ## Test that a cache of size 0 renders every fragment and keeps none
+    def test_that_empty_caches_keep_no_fragments(self):
+        self.fragment_cache.resize(0)
+        parsed_problem_set = self.parser.parse_document(self.input_string)
+
+        self.assertEqual(self.expected_tex, self.interpreter.interpret_document(parsed_problem_set))
+        self.assertEqual(self.expected_tex, self.interpreter.interpret_document(parsed_problem_set))
+        self.assertEqual((0, 0, 0), (self.fragment_cache.hits, self.fragment_cache.misses, self.fragment_cache.size))
+
+    ## Test that interpreters keep no fragments by default, and builds only keep them in their builder's cache
+    def test_that_only_builders_with_a_cache_keep_fragments(self):
+        self.assertIsNone(self.default_fragment_cache)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        input_file_name = os.path.join(directory, "problem_set.txt")
+        open(input_file_name, "w").write(self.input_string)
+
+        builder = EasyTeXBuilder(html_format, open_viewer=False, verbose=False, build_directory=directory,
+                                 fragment_cache=self.fragment_cache)
+        self.assertTrue(builder.build(input_file_name))
+        self.assertTrue(builder.build(input_file_name))
+        self.assertEqual((2, 2), (self.fragment_cache.hits, self.fragment_cache.misses))
+
+        builder = EasyTeXBuilder(html_format, open_viewer=False, verbose=False, build_directory=directory)
+        self.assertTrue(builder.build(input_file_name))
+        self.assertIsNone(self.interpreter.fragment_cache())
+        self.assertEqual((2, 2), (self.fragment_cache.hits, self.fragment_cache.misses))
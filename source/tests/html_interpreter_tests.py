@@ -0,0 +1,75 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+
+from source.parser.parser import EasyTeXParser
+from source.interpreters.interpreter import EasyTeXInterpreter, html_format
+from source.interpreters.html_interpreter import HTMLInterpreter
+from source.errors.interpreters.interpret_document_error import InterpretDocumentError
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXHTMLInterpreterTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser()
+        self.interpreter = EasyTeXInterpreter()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def interpret_file(self, rel_path_to_txt_file):
+        input_string = open(os.path.join(base_path, rel_path_to_txt_file)).read()
+        return self.interpreter.interpret_document(self.parser.parse_document(input_string),
+                                                   output_format=html_format)
+
+    ## Test that a problem set is rendered to a standalone page with its header and problems
+    def test_that_problem_sets_are_rendered_to_html(self):
+        html = self.interpret_file("test_text_files/problem_sets/full_problem_set_2/full_problem_set_2.txt")
+
+        self.assertTrue(html.startswith("<!DOCTYPE html>"))
+        self.assertIn("<h1 class=\"title\">Basic title</h1>", html)
+        self.assertIn("<p class=\"due-date\">Due September 21, 2015</p>", html)
+        self.assertIn("<p class=\"collaborators\">Worked with Robert, Angela, Daniel</p>", html)
+        self.assertEqual(2, html.count("<section class=\"problem\">"))
+        self.assertIn("<h2>Problem 1</h2>", html)
+        self.assertIn("<script>", html)
+        self.assertNotIn("\\documentclass", html)
+
+    ## Test that a memorandum is rendered with its subtitle and sections
+    def test_that_memorandums_are_rendered_to_html(self):
+        html = self.interpret_file("test_text_files/memorandums/full_memorandum_1/full_memorandum_1.txt")
+
+        self.assertIn("<p class=\"subtitle\">Super <u>Advanced</u> Subtitle</p>", html)
+        self.assertIn("<h2>Abstract</h2>", html)
+
+    ## Test that math is kept as TeX for the math renderer, and everything else is escaped
+    def test_that_math_is_kept_and_text_is_escaped(self):
+        html = HTMLInterpreter.html_text("If $a < b$ & \\textbf{c}, then $$\\frac{a}{b} < 1$$ costs \\$5.")
+
+        self.assertEqual("If <span class=\"math inline\">a &lt; b</span> &amp; <b>c</b>, then "
+                         "<span class=\"math display\">\\frac{a}{b} &lt; 1</span> costs $5.", html)
+
+    ## Test that \\[...\\] and \\(...\\) are kept as math too, as in the sample problem set
+    def test_that_bracketed_math_is_kept(self):
+        self.assertEqual("<span class=\"math display\">x &lt; 1</span> and <span class=\"math inline\">y</span>, "
+                         "then\\\\[2pt]", HTMLInterpreter.html_text("\\[x < 1\\] and \\(y\\), then\\\\[2pt]"))
+
+        html = self.interpret_file("../../samples/problem_set_sample_2.txt")
+        self.assertIn("<span class=\"math display\">\n", html)
+        self.assertIn("f(x,y)=x^2-3y^2, \\qquad", html)
+        self.assertNotIn("\\[", html)
+
+    ## Test that LaTeX line breaks are dropped, since text keeps its own lines
+    def test_that_line_breaks_are_dropped(self):
+        self.assertEqual("first\nsecond", HTMLInterpreter.html_text("first \\\\\nsecond"))
+
+    ## Test that unknown output formats are rejected
+    def test_that_unknown_output_formats_are_rejected(self):
+        input_string = open(os.path.join(base_path, "test_text_files/problem_sets/full_problem_set_1/"
+                                                    "full_problem_set_1.txt")).read()
+        parsed_problem_set = self.parser.parse_document(input_string)
+
+        self.assertRaises(InterpretDocumentError, self.interpreter.interpret_document, parsed_problem_set,
+                          output_format="docx")
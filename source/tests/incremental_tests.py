@@ -0,0 +1,97 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+
+from source.parser.parser import EasyTeXParser
+from source.parser.incremental import EasyTeXParseSession
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXParseSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser()
+        self.session = EasyTeXParseSession()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that a first parse parses every block and matches a full parse
+    def test_that_first_parse_matches_full_parse(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+
+        self.assertEqual(self.parser.parse_document(input_string), self.session.parse_document(input_string))
+        self.assertEqual([0, 1], self.session.changed_blocks)
+
+    ## Test that editing one solution only parses that problem again
+    def test_that_only_edited_problems_are_parsed_again(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+        first_problem_set = self.session.parse_document(input_string)
+
+        # Edit the last solution only
+        before, separator, after = input_string.rpartition("QED.")
+        edited_string = before + "Q.E.D." + after
+        edited_problem_set = self.session.parse_document(edited_string)
+
+        self.assertEqual(self.parser.parse_document(edited_string), edited_problem_set)
+        self.assertEqual([1], self.session.changed_blocks)
+        self.assertIs(first_problem_set.problems[0], edited_problem_set.problems[0])
+
+    ## Test that header edits are picked up without parsing any section again
+    def test_that_header_edits_reuse_every_section(self):
+        folder_path = base_path + "/test_text_files/memorandums/full_memorandum_2/"
+        input_string = open(folder_path + "full_memorandum_2.txt").read()
+        self.session.parse_document(input_string)
+
+        edited_string = input_string.replace("title: Basic title", "title: Edited title")
+        edited_memorandum = self.session.parse_document(edited_string)
+
+        self.assertEqual(self.parser.parse_document(edited_string), edited_memorandum)
+        self.assertEqual([], self.session.changed_blocks)
+
+    ## Test that errors in a changed block still point at the right line
+    def test_that_errors_in_changed_blocks_report_document_lines(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+        self.session.parse_document(input_string)
+
+        lines = input_string.split("\n")
+        solution_line = max(index for index, line in enumerate(lines) if line.strip() == "solution:")
+        lines[solution_line] = "        answer:"
+
+        with self.assertRaises(ParseDocumentError) as context:
+            self.session.parse_document("\n".join(lines))
+        self.assertEqual(solution_line + 1, context.exception.line_number)
+
+    ## Test that moving reused problems leaves the spans of documents returned earlier alone
+    def test_that_moved_problems_keep_earlier_spans(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+        first_problem_set = self.session.parse_document(input_string)
+        first_spans = [(parsed_problem.span, parsed_problem.statement.span, parsed_problem.solution.span)
+                       for parsed_problem in first_problem_set.problems]
+
+        edited_string = input_string.replace("problem_set:\n", "problem_set:\n\n\n", 1)
+        edited_problem_set = self.session.parse_document(edited_string)
+
+        self.assertEqual([], self.session.changed_blocks)
+        self.assertEqual(first_spans, [(parsed_problem.span, parsed_problem.statement.span,
+                                        parsed_problem.solution.span) for parsed_problem in first_problem_set.problems])
+        self.assertEqual([parsed_problem.span for parsed_problem in
+                          EasyTeXParseSession().parse_document(edited_string).problems],
+                         [parsed_problem.span for parsed_problem in edited_problem_set.problems])
+
+    ## Test that body lines reading problem: or section: stay in their block between parses
+    def test_that_keyword_body_lines_are_parsed_incrementally(self):
+        input_string = "problem_set:\n    author: Paul\n    problem:\n        statement:\n            problem:\n" \
+                       "        solution:\n            section:\n"
+        self.assertEqual(self.parser.parse_document(input_string), self.session.parse_document(input_string))
+
+        edited_string = input_string.replace("author: Paul", "author: Paul\n    title: Title")
+        self.assertEqual(self.parser.parse_document(edited_string), self.session.parse_document(edited_string))
+        self.assertEqual([], self.session.changed_blocks)
@@ -1,10 +1,13 @@
 __author__ = 'Paul Dapolito'
 
 import unittest
+import glob
 import os
+import tempfile
 
 from source.parser.parser import EasyTeXParser
 from source.interpreters.interpreter import EasyTeXInterpreter
+from source.interpreters import problem_set_interpreter
 
 base_path = os.path.dirname(__file__)
 
@@ -421,3 +424,60 @@ class EasyTeXParserTests(unittest.TestCase):
         expected_tex_file = open(full_path_tex_file).read()
 
         self.assertEqual(interpreted_memorandum, expected_tex_file)
+
+    # Stream Tests
+    ## Test that writing to a file gives the same LaTeX as interpreting to a string
+    def test_that_documents_can_be_written_to_files(self):
+        tex_files = glob.glob(os.path.join(base_path, "test_text_files", "*", "*", "*.tex"))
+
+        for tex_file in tex_files:
+            parsed_document = self.parser.parse_document(open(os.path.splitext(tex_file)[0] + ".txt").read())
+            with tempfile.TemporaryFile() as output_file:
+                self.interpreter.interpret_document_to(parsed_document, output_file)
+                output_file.seek(0)
+                self.assertEqual(open(tex_file).read(), output_file.read(), tex_file)
+
+    ## Test that, without a fragment cache, no single write holds more than one line of a problem's solution
+    def test_that_solutions_are_written_a_line_at_a_time(self):
+        fragment_cache = self.interpreter.fragment_cache()
+        self.interpreter.set_fragment_cache(None)
+        self.addCleanup(self.interpreter.set_fragment_cache, fragment_cache)
+
+        rel_path_to_txt_file = "test_text_files/problem_sets/full_problem_set_2/full_problem_set_2.txt"
+        parsed_problem_set = self.parser.parse_document(open(os.path.join(base_path, rel_path_to_txt_file)).read())
+        solution_lines = parsed_problem_set.problems[0].solution.text.split("\n")
+        parsed_problem_set.problems[0].solution.source_text = "\n".join(solution_lines * 1000) + "\n"
+
+        chunks = list()
+
+        class ChunkStream(object):
+            def write(self, chunk):
+                chunks.append(chunk)
+
+            def writelines(self, lines):
+                for line in lines:
+                    self.write(line)
+
+        self.interpreter.interpret_document_to(parsed_problem_set, ChunkStream())
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), 2000)
+        self.assertEqual(self.interpreter.interpret_document(parsed_problem_set), "".join(chunks))
+
+    # Parallel Rendering Tests
+    ## Test that problems rendered by worker processes give byte-identical LaTeX
+    def test_that_parallel_rendering_matches_serial_rendering(self):
+        problem = "    problem:\n{1}        statement:\n            Question {0}\n        solution:\n" \
+                  "            Answer {0}\n            QED.\n"
+        input_string = "problem_set:\n    author: Paul\n    title: Generated\n" + \
+                       "".join(problem.format(index, "        label: {}\n".format(index) if index % 3 else "")
+                               for index in range(25))
+        parsed_problem_set = self.parser.parse_document(input_string)
+
+        self.addCleanup(setattr, problem_set_interpreter, "parallel_problem_threshold",
+                        problem_set_interpreter.parallel_problem_threshold)
+        self.addCleanup(setattr, problem_set_interpreter, "problems_per_task",
+                        problem_set_interpreter.problems_per_task)
+        problem_set_interpreter.parallel_problem_threshold = 0
+        problem_set_interpreter.problems_per_task = 4
+
+        self.assertEqual(self.interpreter.interpret_document(parsed_problem_set),
+                         self.interpreter.interpret_document(parsed_problem_set, 2))
@@ -0,0 +1,102 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.parser.parser import EasyTeXParser, scanner_engine
+from source.parser.latex_validator import LaTeXValidator
+from source.build.builder import EasyTeXBuilder, failed_status
+
+base_path = os.path.dirname(__file__)
+
+problem = "    problem:\n        statement:\n            {0}\n        solution:\n            {1}\n"
+
+
+class EasyTeXLaTeXValidatorTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser(engine=scanner_engine)
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def messages(self, text):
+        return [message for message, line_index, column in LaTeXValidator.text_errors(text)]
+
+    def document_errors(self, input_string):
+        parsed_document, parse_errors = self.parser.parse_document_with_recovery(input_string)
+        self.assertEqual([], parse_errors)
+        return LaTeXValidator.document_errors(parsed_document, input_string)
+
+    ## Test that balanced LaTeX, including the sample documents, has no errors
+    def test_that_balanced_latex_has_no_errors(self):
+        text = "Let $x = \\{1, 2\\}$ cost \\$5 (50% off).\n$$ \\frac{a}{b} $$ and $a$$b$ and \\(c\\) \\[d\\]\n" \
+               "\\begin{align}\n  x &= {y} \\\\[2pt]\n\\end{align}\n\\verb|{$| % {unbalanced $\n" \
+               "\\begin{verbatim}\n{ $ \\end{itemize}\n\\end{verbatim}\n"
+        self.assertEqual([], self.messages(text))
+
+        for folder in ["problem_sets/full_problem_set_1", "problem_sets/full_problem_set_2",
+                       "memorandums/full_memorandum_1"]:
+            name = os.path.basename(folder)
+            input_string = open(os.path.join(base_path, "test_text_files", folder, name + ".txt")).read()
+            self.assertEqual([], self.document_errors(input_string))
+
+    ## Test that unbalanced braces are found, where they are
+    def test_that_unbalanced_braces_are_found(self):
+        self.assertEqual([("'{' without a matching '}'", 0, 5)], LaTeXValidator.text_errors("\\frac{a{b}"))
+        self.assertEqual([("'}' without a matching '{'", 1, 1)], LaTeXValidator.text_errors("{a}\nb}"))
+
+    ## Test that unbalanced math delimiters are found
+    def test_that_unbalanced_math_is_found(self):
+        self.assertEqual(["'$' without a matching end"], self.messages("Let $x = 1."))
+        self.assertEqual(["'$$' without a matching end", "'$' inside math opened by '$$'"],
+                         self.messages("$$ x = 1 $"))
+        self.assertEqual(["'\\)' without a matching '\\('"], self.messages("x\\)"))
+        self.assertEqual(["'$' without a matching end", "'\\[' inside math opened by '$'",
+                          "'\\]' without a matching '\\['"], self.messages("$x \\[ y \\]"))
+
+    ## Test that inline math inside the text-mode argument of a command in display math is balanced
+    def test_that_math_in_text_arguments_is_balanced(self):
+        self.assertEqual([], self.messages("\\[ f(x)=1 \\text{ if $x>0$} \\]"))
+        self.assertEqual([], self.messages("$$ a \\text{for all $n$} $$"))
+        self.assertEqual([], self.messages("$x \\mbox{and $y$} \\textrm{ or {$z$}}$"))
+
+        self.assertEqual([("'$' without a matching end", 0, 10)], LaTeXValidator.text_errors("$ \\text{a $b} $"))
+
+    ## Test that % in a URL starts no comment
+    def test_that_urls_are_read_as_is(self):
+        self.assertEqual([], self.messages("\\url{http://x.com/a%20b}"))
+        self.assertEqual([], self.messages("\\href{http://x.com/a%20b}{the {linked} text}"))
+
+        self.assertEqual(["'{' without a matching '}'"], self.messages("\\href{http://x.com/a%20b}{text"))
+
+    ## Test that unmatched environments are found, without reporting the environments around them
+    def test_that_unmatched_environments_are_found(self):
+        self.assertEqual(["\\begin{enumerate} without a matching \\end"],
+                         self.messages("\\begin{itemize}\n\\begin{enumerate}\n\\item a\n\\end{itemize}"))
+        self.assertEqual(["\\end{proof} without a matching \\begin"], self.messages("QED. \\end{proof}"))
+        self.assertEqual(["\\begin{verbatim} without a matching \\end"], self.messages("\\begin{verbatim} {"))
+
+    ## Test that errors are reported at their line and column in the EasyTeX source, past blank lines
+    def test_that_errors_have_source_positions(self):
+        input_string = "problem_set:\n    author: Paul\n" + problem.format("Fine $x$", "Fine") + \
+            problem.format("Fine", "First line\n\n            Let $\\frac{a}{b$.")
+
+        errors = self.document_errors(input_string)
+        self.assertEqual([(14, 26)], [(error.line_number, error.column) for error in errors])
+        self.assertIn("in the solution at line 14, column 26", errors[0].error_message)
+
+    ## Test that a document with LaTeX errors is not written or compiled
+    def test_that_broken_documents_are_not_compiled(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        input_file_name = os.path.join(directory, "problem_set.txt")
+        with open(input_file_name, "w") as input_file:
+            input_file.write("problem_set:\n    author: Paul\n" + problem.format("Let $x$", "So {x"))
+
+        builder = EasyTeXBuilder(open_viewer=False, verbose=False, build_directory=directory)
+        self.assertFalse(builder.build(input_file_name))
+        self.assertEqual(failed_status, builder.status)
+        self.assertEqual("Could not typeset input file: found 1 LaTeX error(s).", builder.errors[-1])
+        self.assertFalse(os.path.exists(os.path.join(directory, "problem_set.tex")))
@@ -0,0 +1,92 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.build.multi_pass_compiler import MultiPassCompiler
+from source.errors.build.compile_error import CompileError
+from source.tests.pdf_compiler_tests import script_compiler
+
+# Writes the PDF (unless drafting) and logs each pass, as "draft" or "final", in the file passes
+write_outputs = "echo \"${4:-final}\" >> \"$1/passes\"; test -n \"$4\" || echo '%PDF' > \"$1/problem_set.pdf\"; "
+
+
+# Runs a shell script in place of each pdflatex pass, with the same arguments as script_compiler
+def script_multi_pass_compiler(script):
+    class ScriptMultiPassCompiler(MultiPassCompiler):
+        compiler = script_compiler(write_outputs + script)
+
+    return ScriptMultiPassCompiler
+
+
+class EasyTeXMultiPassCompilerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.tex_file_name = os.path.join(self.directory, "problem_set.tex")
+        self.aux_file_name = os.path.join(self.directory, "problem_set.aux")
+        open(self.tex_file_name, "w").close()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def passes(self):
+        return open(os.path.join(self.directory, "passes")).read().split()
+
+    def compile(self, script, max_passes=4):
+        return script_multi_pass_compiler(script).compile(self.tex_file_name, self.directory, 10,
+                                                          max_passes=max_passes)
+
+    ## Test that a document with an .aux file from an earlier build that stays the same takes one pass
+    def test_that_settled_documents_take_one_pass(self):
+        open(self.aux_file_name, "w").write("relax\n")
+        pdf_file_name, pass_timings, settled = self.compile("echo relax > \"$1/problem_set.aux\"")
+
+        self.assertEqual(os.path.join(self.directory, "problem_set.pdf"), pdf_file_name)
+        self.assertEqual(["final"], self.passes())
+        self.assertEqual(1, len(pass_timings))
+        self.assertTrue(settled)
+
+    ## Test that a first build starts with a draft pass, which is followed by one that writes the PDF
+    def test_that_first_builds_start_with_a_draft(self):
+        pdf_file_name, pass_timings, settled = self.compile("echo relax > \"$1/problem_set.aux\"")
+
+        self.assertEqual(["draft", "final"], self.passes())
+        self.assertTrue(os.path.exists(pdf_file_name))
+        self.assertTrue(settled)
+
+    ## Test that a pass that changes the .aux file is repeated until it stops changing
+    def test_that_changed_aux_files_are_rerun(self):
+        open(self.aux_file_name, "w").write("0\n")
+        pdf_file_name, pass_timings, settled = self.compile(
+            "count=$(wc -l < \"$1/passes\"); test $count -gt 2 && count=2; echo $count > \"$1/problem_set.aux\"")
+
+        self.assertEqual(["final", "final", "final"], self.passes())
+        self.assertEqual(3, len(pass_timings))
+        self.assertTrue(settled)
+
+    ## Test that a log asking for a rerun is rerun, even if the .aux file did not change
+    def test_that_rerun_warnings_are_rerun(self):
+        open(self.aux_file_name, "w").write("relax\n")
+        self.compile("test $(wc -l < \"$1/passes\") -gt 1 || printf 'LaTeX Warning: Label(s) may have changed. "
+                     "Rerun to g\\net cross-references right.\\n' > \"$1/problem_set.log\"; "
+                     "test $(wc -l < \"$1/passes\") -gt 1 && rm -f \"$1/problem_set.log\"; true")
+
+        self.assertEqual(["final", "final"], self.passes())
+
+    ## Test that a document that never settles stops after the most passes allowed
+    def test_that_passes_are_bounded(self):
+        pdf_file_name, pass_timings, settled = self.compile("date +%N >> \"$1/problem_set.aux\"", max_passes=3)
+
+        self.assertEqual(["draft", "final", "final"], self.passes())
+        self.assertTrue(os.path.exists(pdf_file_name))
+        self.assertFalse(settled)
+
+    ## Test that a failed pass stops the build
+    def test_that_failed_passes_are_raised(self):
+        with self.assertRaises(CompileError):
+            self.compile("exit 1")
+        self.assertEqual(["draft"], self.passes())
@@ -0,0 +1,73 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import glob
+import os
+
+from source.parser import parser
+from source.parser.parser import EasyTeXParser, scanner_engine
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+base_path = os.path.dirname(__file__)
+
+problem = "    problem:\n        statement:\n            Question {0}\n        solution:\n            Answer {0}\n"
+keyword_problem = "    problem:\n        statement:\n            problem:\n        solution:\n            section:\n"
+
+
+class EasyTeXParallelTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser(engine=scanner_engine)
+        self.parallel_block_threshold = parser.parallel_block_threshold
+
+    def tearDown(self):
+        parser.parallel_block_threshold = self.parallel_block_threshold
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that small documents are parsed serially into the same IR as a normal parse
+    def test_that_small_documents_match_scanned_documents(self):
+        valid_files = glob.glob(os.path.join(base_path, "test_text_files", "*", "full_*", "full_*.txt"))
+        valid_files += glob.glob(os.path.join(base_path, "test_text_files", "*", "partial_*", "partial_*.txt"))
+
+        for file_path in valid_files:
+            input_string = open(file_path).read()
+            self.assertEqual(self.parser.parse_document(input_string),
+                             self.parser.parse_parallel_document(input_string), file_path)
+
+    ## Test that blocks parsed by worker processes come back in source order, with their spans
+    def test_that_parallel_blocks_keep_source_order(self):
+        parser.parallel_block_threshold = 0
+        input_string = "problem_set:\n    author: Paul\n" + "".join(problem.format(index) for index in range(50))
+
+        parallel_problem_set = self.parser.parse_parallel_document(input_string, 2)
+        scanned_problem_set = self.parser.parse_document(input_string)
+        self.assertEqual(scanned_problem_set, parallel_problem_set)
+        self.assertEqual([parsed_problem.span for parsed_problem in scanned_problem_set.problems],
+                         [parsed_problem.span for parsed_problem in parallel_problem_set.problems])
+
+    ## Test that the first malformed block in the document is the one reported
+    def test_that_the_first_parallel_error_is_raised(self):
+        parser.parallel_block_threshold = 0
+        broken_problem = problem.replace("solution:", "answer:")
+        input_string = "problem_set:\n    author: Paul\n" + problem.format(1) + broken_problem.format(2) + \
+                       broken_problem.format(3)
+
+        with self.assertRaises(ParseDocumentError) as context:
+            self.parser.parse_parallel_document(input_string, 2)
+        self.assertEqual(11, context.exception.line_number)
+
+    ## Test that body lines reading problem: or section: are parsed the same in parallel and serially
+    def test_that_keyword_body_lines_match_serial_parses(self):
+        input_string = "problem_set:\n    author: Paul\n" + "".join(
+            (keyword_problem if index % 2 else problem).format(index) for index in range(10))
+        serial_problem_set = self.parser.parse_parallel_document(input_string, 1)
+
+        parser.parallel_block_threshold = 0
+        parallel_problem_set = self.parser.parse_parallel_document(input_string, 2)
+        self.assertEqual(self.parser.parse_document(input_string), serial_problem_set)
+        self.assertEqual(serial_problem_set, parallel_problem_set)
+        self.assertEqual(10, len(parallel_problem_set.problems))
+        self.assertEqual([parsed_problem.span for parsed_problem in serial_problem_set.problems],
+                         [parsed_problem.span for parsed_problem in parallel_problem_set.problems])
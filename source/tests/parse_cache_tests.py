@@ -0,0 +1,94 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.parser.parser import EasyTeXParser, scanner_engine, pyparsing_engine, parser_version
+from source.parser.parse_cache import ParseCache
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXParseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ParseCache(self.directory)
+        self.parser = EasyTeXParser(engine=scanner_engine, cache=self.cache)
+
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        self.input_string = open(folder_path + "full_problem_set_2.txt").read()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that a second parse of the same text is read from the cache
+    def test_that_unchanged_documents_are_cached(self):
+        first_problem_set = self.parser.parse_document(self.input_string)
+        second_problem_set = self.parser.parse_document(self.input_string)
+
+        self.assertEqual(EasyTeXParser().parse_document(self.input_string), second_problem_set)
+        self.assertEqual(first_problem_set.problems[0].span, second_problem_set.problems[0].span)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    ## Test that an entry evicted by another process after it was read is still a hit
+    def test_that_entries_evicted_after_reading_are_hits(self):
+        self.parser.parse_document(self.input_string)
+        utime = os.utime
+        self.addCleanup(setattr, os, "utime", utime)
+
+        def evict_and_touch(path, times):
+            os.remove(path)
+            utime(path, times)
+
+        os.utime = evict_and_touch
+        self.assertEqual(EasyTeXParser().parse_document(self.input_string),
+                         self.parser.parse_document(self.input_string))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    ## Test that the engine and parser version are part of the key
+    def test_that_keys_depend_on_engine_and_version(self):
+        scanner_key = self.cache.cache_key(self.input_string, scanner_engine, parser_version)
+
+        self.assertNotEqual(scanner_key, self.cache.cache_key(self.input_string, pyparsing_engine, parser_version))
+        self.assertNotEqual(scanner_key, self.cache.cache_key(self.input_string, scanner_engine, parser_version + 1))
+        self.assertEqual(scanner_key, self.cache.cache_key(unicode(self.input_string), scanner_engine,
+                                                           parser_version))
+
+    ## Test that an unreadable entry is parsed again and replaced
+    def test_that_corrupt_entries_are_misses(self):
+        key = self.cache.cache_key(self.input_string, scanner_engine, parser_version)
+        with open(self.cache.entry_path(key), "wb") as entry:
+            entry.write("not a pickle")
+
+        self.assertEqual(EasyTeXParser().parse_document(self.input_string),
+                         self.parser.parse_document(self.input_string))
+        self.assertIsNotNone(self.cache.get(key))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    ## Test that the least recently used entries are removed first
+    def test_that_least_recently_used_entries_are_evicted(self):
+        self.cache.put("first", [1])
+        self.cache.put("second", [2])
+        os.utime(self.cache.entry_path("first"), (0, 0))
+        os.utime(self.cache.entry_path("second"), (1, 1))
+        self.cache.get("first")
+
+        self.cache.max_size = os.path.getsize(self.cache.entry_path("first"))
+        self.cache.evict()
+        self.assertEqual([1], self.cache.get("first"))
+        self.assertIsNone(self.cache.get("second"))
+
+    ## Test that recovery uses the cache, and never caches a document with errors
+    def test_that_recovery_only_caches_documents_without_errors(self):
+        broken_string = self.input_string.replace("solution:", "answer:", 1)
+
+        self.assertEqual(1, len(self.parser.parse_document_with_recovery(broken_string)[1]))
+        self.assertEqual(1, len(self.parser.parse_document_with_recovery(broken_string)[1]))
+        self.parser.parse_document_with_recovery(self.input_string)
+        self.assertEqual([], self.parser.parse_document_with_recovery(self.input_string)[1])
+        self.assertEqual((1, 3), (self.cache.hits, self.cache.misses))
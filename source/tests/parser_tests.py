@@ -29,6 +29,7 @@ from source.ir.problem_sets.problem_set import ProblemSet
 from source.ir.memorandums.memorandum import Memorandum
 
 from source.errors.parser.parse_document_error import ParseDocumentError
+from source.errors.parser.parse_text_error import ParseTextError
 
 base_path = os.path.dirname(__file__)
 
@@ -59,6 +60,39 @@ class EasyTeXParserTests(unittest.TestCase):
 
         self.assertEqual(input_string, parsed_string)
 
+    def test_that_text_with_tabs_can_be_parsed(self):
+        input_string = "One\tTab"
+        parsed_string = self.parser.parse_text(input_string)
+
+        self.assertEqual(input_string.expandtabs(), parsed_string)
+
+    def test_that_unicode_text_can_be_parsed(self):
+        input_string = u"\\textbf{Hello World}"
+        parsed_string = self.parser.parse_text(input_string)
+
+        self.assertEqual(input_string, parsed_string)
+
+    ## Test that every invalid character is reported with its offset
+    def test_that_invalid_characters_are_reported(self):
+        input_string = u"50% of caf\xe9s"
+
+        with self.assertRaises(ParseTextError) as context:
+            self.parser.parse_text(input_string)
+        self.assertEqual([(2, u"%"), (10, u"\xe9")], context.exception.invalid_characters)
+
+    ## Test that offsets are into the text as given, even after a tab, and that tabs are still expanded
+    def test_that_invalid_character_offsets_count_tabs_once(self):
+        with self.assertRaises(ParseTextError) as context:
+            self.parser.parse_text("a\t\x01")
+        self.assertEqual([(2, "\x01")], context.exception.invalid_characters)
+        self.assertIn("'\\x01' at offset 2", context.exception.error_message)
+
+        self.assertEqual("a\tb".expandtabs(), self.parser.parse_text("a\tb"))
+
+    def test_that_empty_text_cannot_be_parsed(self):
+        with self.assertRaises(ParseTextError):
+            self.parser.parse_text("")
+
     # Problem Set Tests
     ## Test a problem set with one problem and all optional fields filled
     def test_that_problem_set_can_have_one_problem(self):
@@ -1178,6 +1212,16 @@ class EasyTeXParserTests(unittest.TestCase):
         input_string = open(folder_path + "invalid_problem_set_4.txt").read()
         self.assertRaises(ParseDocumentError, self.parser.parse_document, input_string)
 
+    ## Test that a problem set with a repeated header field does not parse
+    def test_that_problem_set_header_fields_cannot_repeat(self):
+        folder_path = base_path + "/test_text_files/problem_sets/invalid_problem_set_5/"
+        input_string = open(folder_path + "invalid_problem_set_5.txt").read()
+
+        with self.assertRaises(ParseDocumentError) as context:
+            self.parser.parse_document(input_string)
+        self.assertIn("duplicate header field 'title'", context.exception.error_message)
+        self.assertEqual(6, context.exception.line_number)
+
     ## Test that a memorandum with no author does not parse
     def test_that_memorandum_author_is_required(self):
         folder_path = base_path + "/test_text_files/memorandums/invalid_memorandum_1/"
@@ -1207,3 +1251,13 @@ class EasyTeXParserTests(unittest.TestCase):
         folder_path = base_path + "/test_text_files/memorandums/invalid_memorandum_5/"
         input_string = open(folder_path + "invalid_memorandum_5.txt").read()
         self.assertRaises(ParseDocumentError, self.parser.parse_document, input_string)
+
+    ## Test that a memorandum with a problem set header field does not parse
+    def test_that_memorandum_header_fields_must_be_known(self):
+        folder_path = base_path + "/test_text_files/memorandums/invalid_memorandum_6/"
+        input_string = open(folder_path + "invalid_memorandum_6.txt").read()
+
+        with self.assertRaises(ParseDocumentError) as context:
+            self.parser.parse_document(input_string)
+        self.assertIn("unknown header field 'due_date'", context.exception.error_message)
+        self.assertEqual(4, context.exception.line_number)
@@ -0,0 +1,148 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import signal
+import tempfile
+import time
+
+from source.build.pdf_compiler import PDFCompiler, failed_reason, no_output_reason, not_run_reason, \
+    timed_out_reason, cpu_limit_reason, memory_limit_reason, crashed_reason
+from source.errors.build.compile_error import CompileError
+
+
+# Runs a shell script in place of pdflatex, with the output directory, .tex file, format name (if
+# any), and "draft" (for draft runs) as $1, $2, $3, and $4
+def script_compiler(script):
+    class ScriptCompiler(PDFCompiler):
+        @staticmethod
+        def pdflatex_command(tex_file_name, output_directory, format_name=None, draft=False, pdflatex_path=None):
+            return ["sh", "-c", script, "pdflatex", output_directory, tex_file_name, format_name or "",
+                    "draft" if draft else ""]
+
+    return ScriptCompiler
+
+
+class EasyTeXPDFCompilerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.tex_file_name = os.path.join(self.directory, "problem_set.tex")
+        self.pdf_file_name = os.path.join(self.directory, "problem_set.pdf")
+        open(self.tex_file_name, "w").close()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def compile_error(self, compiler, timeout=10, **limits):
+        try:
+            compiler.compile(self.tex_file_name, self.directory, timeout, **limits)
+        except CompileError as compile_error:
+            return compile_error
+        self.fail("Expected a CompileError")
+
+    ## Test that a successful run returns the PDF it wrote
+    def test_that_successful_runs_return_the_pdf(self):
+        compiler = script_compiler("echo '%PDF' > \"$1/problem_set.pdf\"")
+
+        self.assertEqual(self.pdf_file_name, compiler.compile(self.tex_file_name, self.directory))
+
+    ## Test that a failed run is reported with its exit status and the first error in its log
+    def test_that_failed_runs_report_the_log_error(self):
+        compiler = script_compiler("printf 'This is pdfTeX\\n! Undefined control sequence.\\n! Emergency stop.\\n' "
+                                   "> \"$1/problem_set.log\"; exit 1")
+        compile_error = self.compile_error(compiler)
+
+        self.assertEqual(1, compile_error.status)
+        self.assertEqual(failed_reason, compile_error.reason)
+        self.assertIn("Undefined control sequence.", compile_error.error_message)
+
+    ## Test that a PDF left by an earlier build does not count as a successful run
+    def test_that_old_pdfs_do_not_count(self):
+        open(self.pdf_file_name, "w").close()
+        os.utime(self.pdf_file_name, (0, 0))
+        compile_error = self.compile_error(script_compiler("exit 0"))
+
+        self.assertEqual(0, compile_error.status)
+        self.assertEqual(no_output_reason, compile_error.reason)
+        self.assertIn("did not write problem_set.pdf", compile_error.error_message)
+
+    ## Test that a draft run succeeds without writing a PDF
+    def test_that_draft_runs_need_no_pdf(self):
+        compiler = script_compiler("test \"$4\" = draft && echo '\\relax' > \"$1/problem_set.aux\"")
+
+        self.assertIsNone(compiler.compile(self.tex_file_name, self.directory, draft=True))
+        self.assertFalse(os.path.exists(self.pdf_file_name))
+
+    ## Test that a run that takes too long is killed
+    def test_that_slow_runs_are_killed(self):
+        start_time = time.time()
+        compile_error = self.compile_error(script_compiler("exec sleep 30"), timeout=0.2)
+
+        self.assertTrue(compile_error.timed_out)
+        self.assertEqual(timed_out_reason, compile_error.reason)
+        self.assertLess(time.time() - start_time, 10)
+
+    ## Test that everything a timed-out run started is killed along with it
+    def test_that_slow_runs_are_killed_with_their_children(self):
+        child_file_name = os.path.join(self.directory, "child")
+        self.compile_error(script_compiler("sleep 30 & echo $! > \"$1/child\"; exec sleep 30"), timeout=0.2)
+        child_status_file_name = "/proc/{}/status".format(open(child_file_name).read().strip())
+
+        deadline = time.time() + 5
+        while os.path.exists(child_status_file_name) and "zombie" not in open(child_status_file_name).read() \
+                and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(os.path.exists(child_status_file_name) and
+                         "zombie" not in open(child_status_file_name).read())
+
+    ## Test that pdflatex is never left waiting for input
+    def test_that_runs_are_nonstop(self):
+        command = PDFCompiler.pdflatex_command(self.tex_file_name, self.directory)
+
+        self.assertIn("-interaction=nonstopmode", command)
+        self.assertIn("-halt-on-error", command)
+
+    ## Test that a run that uses too much CPU time is stopped
+    def test_that_cpu_limits_are_enforced(self):
+        compile_error = self.compile_error(script_compiler("while :; do :; done"), cpu_timeout=1)
+
+        self.assertFalse(compile_error.timed_out)
+        self.assertEqual(cpu_limit_reason, compile_error.reason)
+
+    ## Test that a run killed at its hard CPU limit, having ignored SIGXCPU, is still reported as over it
+    def test_that_cpu_limit_kills_are_reported(self):
+        compile_error = self.compile_error(script_compiler("trap '' XCPU; while :; do :; done"), cpu_timeout=1)
+
+        self.assertEqual(-signal.SIGKILL, compile_error.status)
+        self.assertEqual(cpu_limit_reason, compile_error.reason)
+
+    ## Test that a run killed by someone else is reported as crashed, not as over its CPU limit
+    def test_that_other_kills_are_crashes(self):
+        compile_error = self.compile_error(script_compiler("kill -9 $$"), cpu_timeout=1)
+
+        self.assertEqual(-signal.SIGKILL, compile_error.status)
+        self.assertEqual(crashed_reason, compile_error.reason)
+
+    ## Test that runs are limited in address space, and that running out of it is reported
+    def test_that_memory_limits_are_enforced(self):
+        compiler = script_compiler("test \"$(ulimit -v)\" = 262144 && echo '%PDF' > \"$1/problem_set.pdf\"")
+        self.assertEqual(self.pdf_file_name, compiler.compile(self.tex_file_name, self.directory,
+                                                              memory_limit=256*1024*1024))
+
+        compiler = script_compiler("echo 'fatal: memory exhausted (xmalloc of 1048576 bytes).' >&2; exit 1")
+        compile_error = self.compile_error(compiler, memory_limit=256*1024*1024)
+        self.assertEqual(memory_limit_reason, compile_error.reason)
+
+    ## Test that a missing pdflatex is reported rather than raised as an OSError
+    def test_that_missing_pdflatex_is_reported(self):
+        class MissingCompiler(PDFCompiler):
+            @staticmethod
+            def pdflatex_command(tex_file_name, output_directory, format_name=None, draft=False, pdflatex_path=None):
+                return [os.path.join(self.directory, "pdflatex")]
+
+        compile_error = self.compile_error(MissingCompiler)
+        self.assertIsNone(compile_error.status)
+        self.assertEqual(not_run_reason, compile_error.reason)
@@ -0,0 +1,90 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+
+from source.parser.parser import EasyTeXParser
+from source.build.builder import EasyTeXBuilder
+
+from source.ir.memorandums.memorandum import Memorandum
+
+base_path = os.path.dirname(__file__)
+
+problem = "    problem:\n        statement:\n            Question {0}\n        solution:\n            Answer {0}\n"
+broken_problem = "    problem:\n        statement:\n            Question {0}\n        answer:\n            Answer {0}\n"
+
+
+class EasyTeXRecoveryTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that a valid document parses with no errors and matches a normal parse
+    def test_that_valid_documents_recover_without_errors(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+
+        parsed_problem_set, errors = self.parser.parse_document_with_recovery(input_string)
+        self.assertEqual([], errors)
+        self.assertEqual(self.parser.parse_document(input_string), parsed_problem_set)
+
+    ## Test that every malformed problem is reported in one pass, along with the problems that parsed
+    def test_that_every_malformed_problem_is_reported(self):
+        input_string = "problem_set:\n    author: Paul\n" + problem.format(1) + broken_problem.format(2) + \
+                       problem.format(3) + broken_problem.format(4)
+
+        parsed_problem_set, errors = self.parser.parse_document_with_recovery(input_string)
+        self.assertEqual(["Answer 1\n", "Answer 3\n"],
+                         [parsed_problem.solution.text for parsed_problem in parsed_problem_set.problems])
+        self.assertEqual([(11, 9), (21, 9)], [(error.line_number, error.column) for error in errors])
+
+    ## Test that IR errors are reported at the start of their block
+    def test_that_empty_labels_are_reported_at_their_block(self):
+        input_string = "problem_set:\n    author: Paul\n" + problem.format(1) + \
+                       problem.format(2).replace("    problem:\n", "    problem:\n        label: \n")
+
+        parsed_problem_set, errors = self.parser.parse_document_with_recovery(input_string)
+        self.assertEqual(1, len(parsed_problem_set.problems))
+        self.assertEqual([(8, 5)], [(error.line_number, error.column) for error in errors])
+
+    ## Test that blocks are still checked when the headers are malformed
+    def test_that_blocks_are_checked_after_malformed_headers(self):
+        input_string = "problem_set:\n    collaborators: Robert\n" + broken_problem.format(1) + problem.format(2)
+
+        parsed_problem_set, errors = self.parser.parse_document_with_recovery(input_string)
+        self.assertIsNone(parsed_problem_set)
+        self.assertEqual(2, len(errors))
+        self.assertIn("missing required header field 'author'", errors[0].error_message)
+        self.assertEqual(6, errors[1].line_number)
+
+    ## Test that a memorandum's sections recover the same way
+    def test_that_malformed_sections_are_reported(self):
+        folder_path = base_path + "/test_text_files/memorandums/full_memorandum_2/"
+        input_string = open(folder_path + "full_memorandum_2.txt").read()
+        input_string = input_string.replace("        title: Abstract\n", "")
+
+        parsed_memorandum, errors = self.parser.parse_document_with_recovery(input_string)
+        self.assertEqual(1, len(parsed_memorandum.sections))
+        self.assertEqual(1, len(errors))
+        self.assertEqual(Memorandum, type(parsed_memorandum))
+
+    ## Test that builds parse valid documents without recovery, and recover only to report every error
+    def test_that_builds_recover_only_after_a_failed_parse(self):
+        builder = EasyTeXBuilder(open_viewer=False)
+        recovered_texts = list()
+        parse_document_with_recovery = builder.parser.parse_document_with_recovery
+        builder.parser.parse_document_with_recovery = \
+            lambda input_string: recovered_texts.append(input_string) or parse_document_with_recovery(input_string)
+
+        input_string = "problem_set:\n    author: Paul\n" + problem.format(1) + problem.format(2)
+        parsed_problem_set, errors = builder.parse(input_string)
+        self.assertEqual([], errors)
+        self.assertEqual(self.parser.parse_document(input_string), parsed_problem_set)
+        self.assertEqual([], recovered_texts)
+
+        input_string = "problem_set:\n    author: Paul\n" + broken_problem.format(1) + broken_problem.format(2)
+        parsed_problem_set, errors = builder.parse(input_string)
+        self.assertEqual(2, len(errors))
+        self.assertEqual([input_string], recovered_texts)
@@ -0,0 +1,149 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import glob
+from StringIO import StringIO
+
+from source.parser.parser import EasyTeXParser, scanner_engine
+from source.parser.scanner import EasyTeXScanner
+from source.parser.incremental import EasyTeXParseSession
+from source.tests import parser_tests
+
+from source.ir.problem_sets.problem import Problem
+from source.ir.memorandums.section import Section
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+base_path = os.path.dirname(__file__)
+samples_path = os.path.join(base_path, "..", "..", "samples")
+
+
+# Run the full parser test corpus against the scanner engine
+class EasyTeXScannerCorpusTests(parser_tests.EasyTeXParserTests):
+    def setUp(self):
+        self.parser = EasyTeXParser(engine=scanner_engine)
+
+
+class EasyTeXScannerTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser(engine=scanner_engine)
+        self.pyparsing_parser = EasyTeXParser()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    ## Test that both engines build the same IR for every valid test file
+    def test_that_scanner_matches_pyparsing_on_valid_documents(self):
+        valid_files = glob.glob(os.path.join(base_path, "test_text_files", "*", "full_*", "full_*.txt"))
+        valid_files += glob.glob(os.path.join(base_path, "test_text_files", "*", "partial_*", "partial_*.txt"))
+
+        self.assertTrue(valid_files)
+        for valid_file in valid_files:
+            input_string = open(valid_file).read()
+            self.assertEqual(self.pyparsing_parser.parse_document(input_string),
+                             self.parser.parse_document(input_string))
+
+    ## Test that whitespace-only lines inside a solution do not cut the rest of the document off
+    def test_that_scanner_keeps_text_after_whitespace_only_lines(self):
+        input_string = open(os.path.join(samples_path, "problem_set_sample_2.txt")).read()
+        parsed_problem_set = self.parser.parse_document(input_string)
+
+        self.assertEqual(2, len(parsed_problem_set.problems))
+        self.assertIn("By the definition of the directional derivative", parsed_problem_set.problems[1].solution.text)
+
+    ## Test that both engines reject every invalid test file
+    def test_that_scanner_rejects_invalid_documents(self):
+        invalid_files = glob.glob(os.path.join(base_path, "test_text_files", "*", "invalid_*", "invalid_*.txt"))
+
+        self.assertTrue(invalid_files)
+        for invalid_file in invalid_files:
+            input_string = open(invalid_file).read()
+            self.assertRaises(ParseDocumentError, self.parser.parse_document, input_string)
+
+    ## Test that scanner errors point at the offending line and column
+    def test_that_scanner_errors_report_line_and_column(self):
+        input_string = "problem_set:\n    author: Paul Dapolito\n\n    problem:\n        solution:\n"
+
+        with self.assertRaises(ParseDocumentError) as context:
+            self.parser.parse_document(input_string)
+        self.assertIn("line 5, column 9", context.exception.error_message)
+
+    ## Test that lines after the last complete block are not silently dropped
+    def test_that_scanner_rejects_trailing_lines(self):
+        input_string = "problem_set:\n    author: Paul\n    problem:\n        statement:\n            Q\n" \
+                       "        solution:\n            A\n        label: 2\n"
+
+        self.assertRaises(ParseDocumentError, self.parser.parse_document, input_string)
+
+    ## Test that the final newline is optional
+    def test_that_scanner_accepts_missing_final_newline(self):
+        input_string = "problem_set:\n    author: Paul\n    problem:\n        statement:\n            Q\n" \
+                       "        solution:\n            A"
+
+        parsed_problem_set = self.parser.parse_document(input_string)
+        self.assertEqual("A\n", parsed_problem_set.problems[0].solution.text)
+
+    ## Test that unknown engines are rejected
+    def test_that_unknown_engines_are_rejected(self):
+        self.assertRaises(ParseDocumentError, EasyTeXParser, "yacc")
+
+    # Streaming Tests
+    ## Test that streaming a problem set in small chunks yields the headers and then every problem
+    def test_that_problem_sets_can_be_streamed(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+
+        blocks = list(self.parser.iter_problems(StringIO(input_string), chunk_size=7))
+        problem_set = blocks[0]
+        problem_set.problems.extend(blocks[1:])
+
+        self.assertTrue(all(type(block) is Problem for block in blocks[1:]))
+        self.assertEqual(self.parser.parse_document(input_string), problem_set)
+
+    ## Test that streaming a memorandum yields the headers and then every section
+    def test_that_memorandums_can_be_streamed(self):
+        folder_path = base_path + "/test_text_files/memorandums/full_memorandum_2/"
+        input_string = open(folder_path + "full_memorandum_2.txt").read()
+
+        blocks = list(self.parser.iter_sections(StringIO(input_string)))
+        memorandum = blocks[0]
+        memorandum.sections.extend(blocks[1:])
+
+        self.assertTrue(all(type(block) is Section for block in blocks[1:]))
+        self.assertEqual(self.parser.parse_document(input_string), memorandum)
+
+    ## Test that blocks are yielded before the rest of the document has been read
+    def test_that_streamed_blocks_arrive_before_later_errors(self):
+        input_string = "problem_set:\n    author: Paul\n    problem:\n        statement:\n            Q\n" \
+                       "        solution:\n            A\n    problem:\n        solution:\n"
+
+        blocks = self.parser.iter_problems(StringIO(input_string), chunk_size=1)
+        self.assertEqual("Paul", next(blocks).author.name)
+        self.assertEqual("A\n", next(blocks).solution.text)
+        self.assertRaises(ParseDocumentError, next, blocks)
+
+    ## Test that asking for the problems of a memorandum fails
+    def test_that_memorandums_have_no_problems_to_stream(self):
+        folder_path = base_path + "/test_text_files/memorandums/full_memorandum_1/"
+        input_file = open(folder_path + "full_memorandum_1.txt")
+
+        self.assertRaises(ParseDocumentError, list, self.parser.iter_problems(input_file))
+
+    ## Test that body lines that read 'problem:' or 'section:' do not start new blocks
+    def test_that_keyword_body_lines_stay_in_their_blocks(self):
+        problem_set = "problem_set:\n    author: Paul\n    problem:\n        statement:\n            problem:\n" \
+                      "        solution:\n            A\n\n            problem:\n    problem:\n        statement:\n" \
+                      "            Q\n        solution:\n            section:\n"
+        memorandum = "memorandum:\n    author: Paul\n    title: Memo\n    section:\n        title: T\n" \
+                     "        content:\n            section:\n    section:\n        title: U\n        content:\n" \
+                     "            problem:\n"
+
+        for input_string in [problem_set, memorandum]:
+            blocks = EasyTeXScanner().split_blocks(input_string.split("\n"))
+            self.assertEqual([1, 3, 10] if input_string is problem_set else [1, 4, 8],
+                             [first_line_number for first_line_number, lines in blocks])
+
+            parsed_document = EasyTeXParseSession(self.parser).parse_document(input_string)
+            self.assertEqual(self.parser.parse_document(input_string), parsed_document)
+            self.assertEqual(self.pyparsing_parser.parse_document(input_string), parsed_document)
@@ -0,0 +1,96 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import glob
+import os
+import tempfile
+
+from source.parser.parser import EasyTeXParser, scanner_engine
+from source.parser.incremental import EasyTeXParseSession
+
+from source.ir.source_span import SourceSpan
+from source.ir.span_text import SpanText
+
+from source.errors.parser.parse_document_error import ParseDocumentError
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXSpanTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser(engine=scanner_engine)
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def parse_problem_set_2(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        return self.parser.parse_document(open(folder_path + "full_problem_set_2.txt").read())
+
+    ## Test that memory-mapped parsing gives the same IR as parsing the whole string
+    def test_that_mapped_documents_match_scanned_documents(self):
+        valid_files = glob.glob(os.path.join(base_path, "test_text_files", "*", "full_*", "full_*.txt"))
+        valid_files += glob.glob(os.path.join(base_path, "test_text_files", "*", "partial_*", "partial_*.txt"))
+
+        for file_path in valid_files:
+            with open(file_path) as input_file:
+                mapped_document = self.parser.parse_mapped_document(input_file)
+            self.assertEqual(self.parser.parse_document(open(file_path).read()), mapped_document, file_path)
+
+    ## Test that mapped statements, solutions, and content are only read when their text is used
+    def test_that_mapped_bodies_are_read_lazily(self):
+        folder_path = base_path + "/test_text_files/memorandums/full_memorandum_2/"
+        with open(folder_path + "full_memorandum_2.txt") as input_file:
+            mapped_memorandum = self.parser.parse_mapped_document(input_file)
+
+        content = mapped_memorandum.sections[0].content
+        self.assertEqual(SpanText, type(content.source_text))
+        self.assertEqual(open(folder_path + "section_1_content.txt").read(), content.text)
+
+    ## Test that an empty file is reported like an empty string
+    def test_that_empty_mapped_files_cannot_be_parsed(self):
+        with tempfile.TemporaryFile() as input_file:
+            with self.assertRaises(ParseDocumentError):
+                self.parser.parse_mapped_document(input_file)
+
+    ## Test that problems and their fields map back to their lines
+    def test_that_problems_have_source_spans(self):
+        problem = self.parse_problem_set_2().problems[0]
+
+        self.assertEqual(SourceSpan(10, 9, 10, 17), problem.label.span)
+        self.assertEqual(SourceSpan(13, 13, 13, 80), problem.statement.span)
+        self.assertEqual(SourceSpan(16, 13, 28, 134), problem.solution.span)
+        self.assertEqual(SourceSpan(9, 5, 28, 134), problem.span)
+
+    ## Test that each comma-separated header item spans its own part of the line
+    def test_that_header_items_have_source_spans(self):
+        problem_set = self.parse_problem_set_2()
+
+        self.assertEqual(SourceSpan(2, 5, 2, 26), problem_set.author.span)
+        self.assertEqual([SourceSpan(3, 20, 3, 26), SourceSpan(3, 28, 3, 34), SourceSpan(3, 36, 3, 42)],
+                         [collaborator.span for collaborator in problem_set.collaborators])
+        self.assertEqual(SourceSpan(2, 5, problem_set.problems[-1].span.end_line_number,
+                                    problem_set.problems[-1].span.end_column), problem_set.span)
+
+    ## Test that the pyparsing engine gives headers the same spans as the scanner
+    def test_that_pyparsing_headers_have_source_spans(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        problem_set = EasyTeXParser().parse_document(open(folder_path + "full_problem_set_2.txt").read())
+
+        self.assertEqual(self.parse_problem_set_2().author.span, problem_set.author.span)
+
+    ## Test that blocks reused by a parse session move with their text
+    def test_that_reused_blocks_move_their_spans(self):
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        input_string = open(folder_path + "full_problem_set_2.txt").read()
+        session = EasyTeXParseSession()
+        first_span = session.parse_document(input_string).problems[1].statement.span
+
+        # Split the first statement over two lines
+        edited_string = input_string.replace("change $f'$ of", "change $f'$\n            of", 1)
+        edited_problem_set = session.parse_document(edited_string)
+
+        self.assertEqual([0], session.changed_blocks)
+        self.assertEqual(first_span.shifted(1), edited_problem_set.problems[1].statement.span)
+        self.assertEqual(self.parser.parse_document(edited_string).problems[1].statement.span,
+                         edited_problem_set.problems[1].statement.span)
@@ -0,0 +1,136 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.parser.parser import EasyTeXParser
+from source.interpreters.interpreter import EasyTeXInterpreter
+from source.errors.interpreters.interpret_document_error import InterpretDocumentError
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXSplitInterpreterTests(unittest.TestCase):
+    def setUp(self):
+        self.parser = EasyTeXParser()
+        self.interpreter = EasyTeXInterpreter()
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.master_file_name = os.path.join(self.directory, "problem set.tex")
+        self.fragment_path = os.path.join(self.directory, "problem_set_parts")
+
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        self.input_string = open(folder_path + "full_problem_set_2.txt").read()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def read_file(self, file_name):
+        with open(os.path.join(self.directory, file_name)) as input_file:
+            return input_file.read()
+
+    # Returns the problem set with its last problem repeated as a third
+    def longer_input_string(self):
+        last_problem = self.input_string[self.input_string.index("    problem:\n        label: 2"):]
+        return self.input_string + "\n\n" + last_problem.replace("label: 2", "label: 3")
+
+    # Inlines every \input in the master, for comparison with the single-file LaTeX
+    def inline_fragments(self, master):
+        for file_name in sorted(os.listdir(self.fragment_path)):
+            name = "problem_set_parts/" + os.path.splitext(file_name)[0]
+            master = master.replace("    \\input{" + name + "}\n", self.read_file(name + ".tex"))
+        return master
+
+    ## Test that split files put together give the same LaTeX as a single file
+    def test_that_split_files_give_the_same_latex(self):
+        parsed_problem_set = self.parser.parse_document(self.input_string)
+        self.interpreter.interpret_split_document(parsed_problem_set, self.master_file_name)
+
+        self.assertEqual(["problem_1.tex", "problem_2.tex"], sorted(os.listdir(self.fragment_path)))
+        self.assertEqual(self.interpreter.interpret_document(parsed_problem_set),
+                         self.inline_fragments(self.read_file(self.master_file_name)))
+
+    ## Test that only the files of edited problems are written again
+    def test_that_only_changed_files_are_written_again(self):
+        self.interpreter.interpret_split_document(self.parser.parse_document(self.input_string),
+                                                  self.master_file_name)
+
+        self.assertEqual([], self.interpreter.interpret_split_document(self.parser.parse_document(self.input_string),
+                                                                       self.master_file_name))
+
+        before, separator, after = self.input_string.rpartition("QED.")
+        edited_problem_set = self.parser.parse_document(before + "Q.E.D." + after)
+        self.assertEqual([os.path.join(self.fragment_path, "problem_2.tex")],
+                         self.interpreter.interpret_split_document(edited_problem_set, self.master_file_name))
+
+    ## Test that only the chosen problems are pulled into the master file
+    def test_that_only_chosen_problems_are_compiled(self):
+        parsed_problem_set = self.parser.parse_document(self.input_string)
+        self.interpreter.interpret_split_document(parsed_problem_set, self.master_file_name, [2])
+        master = self.read_file(self.master_file_name)
+
+        self.assertNotIn("\\input{problem_set_parts/problem_1}", master)
+        self.assertIn("\\input{problem_set_parts/problem_2}", master)
+        self.assertEqual(["problem_1.tex", "problem_2.tex"], sorted(os.listdir(self.fragment_path)))
+
+    ## Test that only the chosen sections of a memorandum are pulled into the master file
+    def test_that_only_chosen_sections_are_compiled(self):
+        input_string = open(base_path + "/test_text_files/memorandums/full_memorandum_2/"
+                                        "full_memorandum_2.txt").read()
+        self.interpreter.interpret_split_document(self.parser.parse_document(input_string),
+                                                  self.master_file_name, [2])
+        master = self.read_file(self.master_file_name)
+
+        self.assertNotIn("\\input{problem_set_parts/section_1}", master)
+        self.assertIn("\\input{problem_set_parts/section_2}", master)
+
+    ## Test that problems that are no longer in the problem set have their files removed
+    def test_that_removed_problems_have_their_files_removed(self):
+        self.interpreter.interpret_split_document(self.parser.parse_document(self.longer_input_string()),
+                                                  self.master_file_name)
+        self.assertEqual(["problem_1.tex", "problem_2.tex", "problem_3.tex"], sorted(os.listdir(self.fragment_path)))
+
+        self.interpreter.interpret_split_document(self.parser.parse_document(self.input_string),
+                                                  self.master_file_name)
+        self.assertEqual(["problem_1.tex", "problem_2.tex"], sorted(os.listdir(self.fragment_path)))
+
+    ## Test that a problem set's files are removed when its input becomes a memorandum
+    def test_that_problem_files_are_removed_for_a_memorandum(self):
+        self.interpreter.interpret_split_document(self.parser.parse_document(self.input_string),
+                                                  self.master_file_name)
+        input_string = open(base_path + "/test_text_files/memorandums/full_memorandum_2/"
+                                        "full_memorandum_2.txt").read()
+        self.interpreter.interpret_split_document(self.parser.parse_document(input_string), self.master_file_name)
+
+        self.assertFalse([file_name for file_name in os.listdir(self.fragment_path)
+                          if file_name.startswith("problem_")])
+        self.assertIn("section_1.tex", os.listdir(self.fragment_path))
+
+    ## Test that the files split from an input are removed once it is renamed and split again
+    def test_that_renamed_inputs_have_their_old_files_removed(self):
+        source_file_name = os.path.join(self.directory, "problem set.txt")
+        renamed_source_file_name = os.path.join(self.directory, "homework.txt")
+        with open(source_file_name, "w") as source_file:
+            source_file.write(self.input_string)
+        parsed_problem_set = self.parser.parse_document(self.input_string)
+        self.interpreter.interpret_split_document(parsed_problem_set, self.master_file_name,
+                                                  source_file_name=source_file_name)
+
+        os.rename(source_file_name, renamed_source_file_name)
+        self.interpreter.interpret_split_document(parsed_problem_set, os.path.join(self.directory, "homework.tex"),
+                                                  source_file_name=renamed_source_file_name)
+
+        self.assertFalse(os.path.exists(self.fragment_path))
+        self.assertEqual(["problem_1.tex", "problem_2.tex"],
+                         sorted(os.listdir(os.path.join(self.directory, "homework_parts"))))
+
+    ## Test that choosing a problem that does not exist raises an error and writes nothing
+    def test_that_missing_problems_cannot_be_chosen(self):
+        parsed_problem_set = self.parser.parse_document(self.input_string)
+
+        self.assertRaises(InterpretDocumentError, self.interpreter.interpret_split_document, parsed_problem_set,
+                          self.master_file_name, [3])
+        self.assertEqual([], os.listdir(self.directory))
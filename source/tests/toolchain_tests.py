@@ -0,0 +1,94 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from source.build.toolchain import Toolchain, ToolchainCache
+
+# Stands in for pdflatex: prints a version for -v, and counts its runs in the file runs next to it
+pdflatex_script = """#!/bin/sh
+echo >> "$(dirname "$0")/runs"
+echo "pdfTeX 3.14159265-2.6-1.40.21 (TeX Live 2020)"
+echo "kpathsea version 6.3.2"
+"""
+
+
+class EasyTeXToolchainTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.bin_directory = os.path.join(self.directory, "bin")
+        os.mkdir(self.bin_directory)
+        self.pdflatex_file_name = self.write_program("pdflatex", pdflatex_script)
+        self.search_path = os.pathsep.join([os.path.join(self.directory, "missing"), self.bin_directory])
+
+        self.toolchain_cache = ToolchainCache(os.path.join(self.directory, "cache", "toolchain.json"))
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def write_program(self, name, script):
+        program_file_name = os.path.join(self.bin_directory, name)
+        with open(program_file_name, "w") as program_file:
+            program_file.write(script)
+        os.chmod(program_file_name, 0755)
+        return program_file_name
+
+    def run_count(self):
+        runs_file_name = os.path.join(self.bin_directory, "runs")
+        if not os.path.exists(runs_file_name):
+            return 0
+        return len(open(runs_file_name).readlines())
+
+    ## Test that the probe finds pdflatex and its version
+    def test_that_the_toolchain_is_found(self):
+        toolchain = self.toolchain_cache.probe(self.search_path)
+
+        self.assertEqual(self.pdflatex_file_name, toolchain.pdflatex_path)
+        self.assertEqual("pdfTeX 3.14159265-2.6-1.40.21 (TeX Live 2020)", toolchain.pdflatex_version)
+
+    ## Test that a missing pdflatex is reported as no toolchain, without running anything
+    def test_that_missing_pdflatex_is_reported(self):
+        self.assertIsNone(self.toolchain_cache.probe(os.path.join(self.directory, "missing")))
+        self.assertIsNone(Toolchain.find_program("pdflatex", os.path.join(self.directory, "missing")))
+
+    ## Test that files that cannot be run are not taken for programs
+    def test_that_only_programs_are_found(self):
+        os.chmod(self.pdflatex_file_name, 0644)
+
+        self.assertIsNone(Toolchain.find_program("pdflatex", self.search_path))
+
+    ## Test that a warm probe runs no process
+    def test_that_probes_are_cached(self):
+        toolchain = self.toolchain_cache.probe(self.search_path)
+        cached_toolchain = ToolchainCache(self.toolchain_cache.cache_file_name).probe(self.search_path)
+
+        self.assertEqual(1, self.run_count())
+        self.assertEqual(vars(toolchain), vars(cached_toolchain))
+
+    ## Test that the probe is run again when pdflatex is replaced or PATH changes
+    def test_that_probes_are_invalidated(self):
+        self.toolchain_cache.probe(self.search_path)
+
+        os.utime(self.pdflatex_file_name, (0, 0))
+        self.toolchain_cache.probe(self.search_path)
+        self.assertEqual(2, self.run_count())
+
+        self.toolchain_cache.probe(self.bin_directory)
+        self.assertEqual(3, self.run_count())
+
+        self.toolchain_cache.probe(self.search_path)
+        self.assertEqual(3, self.run_count())
+
+    ## Test that an unreadable cache is probed again and replaced
+    def test_that_unreadable_caches_are_replaced(self):
+        os.mkdir(os.path.dirname(self.toolchain_cache.cache_file_name))
+        with open(self.toolchain_cache.cache_file_name, "w") as cache_file:
+            cache_file.write("{\"key\": {\"probed\": \"yesterday\"}")
+
+        self.assertIsNotNone(self.toolchain_cache.probe(self.search_path))
+        self.assertIsNotNone(self.toolchain_cache.probe(self.search_path))
+        self.assertEqual(1, self.run_count())
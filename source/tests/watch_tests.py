@@ -0,0 +1,94 @@
+__author__ = 'Paul Dapolito'
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from source.build.builder import EasyTeXBuilder
+from source.build.file_watcher import FileWatcher
+from source.interpreters.interpreter import html_format
+
+base_path = os.path.dirname(__file__)
+
+
+class EasyTeXWatchTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.input_file_name = os.path.join(self.directory, "problem_set.txt")
+        folder_path = base_path + "/test_text_files/problem_sets/full_problem_set_2/"
+        shutil.copy(folder_path + "full_problem_set_2.txt", self.input_file_name)
+        self.input_string = open(self.input_file_name).read()
+
+    def validate_test(self):
+        self.assertEqual(1, 1)
+
+    def watchers(self):
+        for use_inotify in [True, False]:
+            watcher = FileWatcher(self.input_file_name, poll_interval=0.01, use_inotify=use_inotify)
+            self.addCleanup(watcher.close)
+            yield watcher
+
+    # Writes text to the input file in place, making sure its modification time changes
+    def write_input(self, text):
+        with open(self.input_file_name, "w") as input_file:
+            input_file.write(text)
+        modified = os.path.getmtime(self.input_file_name) + 1
+        os.utime(self.input_file_name, (modified, modified))
+
+    ## Test that a file that does not change is not reported
+    def test_that_unchanged_files_are_not_reported(self):
+        for watcher in self.watchers():
+            self.assertFalse(watcher.wait_for_change(0.05))
+
+    ## Test that writing to the file, or replacing it by renaming, is reported
+    def test_that_changed_files_are_reported(self):
+        for watcher in self.watchers():
+            self.write_input(self.input_string + "\n")
+            self.assertTrue(watcher.wait_for_change(5))
+
+            replacement_file_name = os.path.join(self.directory, "problem_set.txt.new")
+            with open(replacement_file_name, "w") as replacement_file:
+                replacement_file.write(self.input_string)
+            os.rename(replacement_file_name, self.input_file_name)
+            self.assertTrue(watcher.wait_for_change(5))
+
+    ## Test that changes to other files in the same directory are not reported
+    def test_that_other_files_are_not_reported(self):
+        for watcher in self.watchers():
+            open(os.path.join(self.directory, "problem_set.tex"), "w").close()
+            self.assertFalse(watcher.wait_for_change(0.05))
+
+    ## Test that a burst of changes is waited out, and leaves no change behind
+    def test_that_bursts_of_changes_are_debounced(self):
+        for watcher in self.watchers():
+            def write_burst():
+                for index in range(3):
+                    self.write_input(self.input_string + index*"\n")
+                    time.sleep(0.02)
+
+            writer = threading.Thread(target=write_burst)
+            writer.start()
+            watcher.wait_for_changes(debounce_interval=0.2)
+            writer.join()
+
+            self.assertFalse(watcher.wait_for_change(0.05))
+
+    ## Test that a builder rebuilds warm, and reports parse errors without stopping
+    def test_that_builders_rebuild_after_errors(self):
+        builder = EasyTeXBuilder(output_format=html_format, incremental=True)
+        html_file_name = os.path.join(self.directory, "problem_set.html")
+
+        self.assertTrue(builder.build(self.input_file_name))
+        self.assertIn("QED.", open(html_file_name).read())
+
+        self.write_input(self.input_string.replace("statement:", "statement", 1))
+        self.assertFalse(builder.build(self.input_file_name))
+
+        self.write_input(self.input_string.replace("QED.", "Q.E.D."))
+        self.assertTrue(builder.build(self.input_file_name))
+        self.assertIn("Q.E.D.", open(html_file_name).read())